@@ -0,0 +1,503 @@
+"""Local HTTP and WebSocket API for entering results from phones at the boards.
+
+The server runs an asyncio event loop on a background thread, so it never
+blocks the Qt event loop. The engine is only touched on the thread that owns
+it: ``TournamentService`` lives there and publishes a read-only snapshot of
+the current matches to the server whenever the tournament changes, and
+submissions are handed back to that thread through ``invoke``.
+
+Endpoints:
+
+    GET  /                          result entry page for phones
+    GET  /matches                   current matches and the state version
+    POST /matches/<id>/result       {"winner": 1 or 2, "version": optional}
+    GET  /ws                        WebSocket with the same state and submissions
+    GET  /scoreboard                spectator scoreboard (with a ScoreboardFeed)
+    GET  /scoreboard.json           current scoreboard
+    GET  /scoreboard/ws             WebSocket pushing scoreboard deltas
+
+Submitting the winner a match already has is a no-op, so double taps are
+harmless. Changing a winner that was already entered requires the version the
+client last saw, so two phones cannot overwrite each other unknowingly.
+"""
+import asyncio
+import base64
+import concurrent.futures
+import hashlib
+import json
+import struct
+import threading
+
+from refresh import RefreshScheduler
+from tournament import KNOCKOUT
+
+DEFAULT_PORT = 8765
+IDLE_TIMEOUT = 60
+MAX_BODY_SIZE = 16 * 1024
+MAX_WRITE_BUFFER = 256 * 1024
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def call_directly(function):
+    """Run ``function`` right away and return its result as a Future."""
+    future = concurrent.futures.Future()
+    try:
+        future.set_result(function())
+    except Exception as error:
+        future.set_exception(error)
+    return future
+
+
+def current_matches(engine):
+    """The matches results can be entered for, as (row, match) pairs."""
+    if engine.stage == KNOCKOUT:
+        return list(enumerate(engine.final_matches))
+    if engine.board_scheduler is not None:
+        return [(board, match) for board, match in enumerate(engine.board_scheduler.boards) if match is not None]
+    return list(enumerate(engine.matches))
+
+
+def current_results(engine):
+    """Results entered for the current matches, by row."""
+    if engine.stage == KNOCKOUT:
+        return engine.final_match_results
+    if engine.board_scheduler is not None:
+        return engine.board_scheduler.results
+    return engine.match_results
+
+
+def match_entries(engine):
+    """The current matches as JSON-compatible dictionaries."""
+    results = current_results(engine)
+    boards = engine.board_scheduler is not None and engine.stage != KNOCKOUT
+    return [
+        {
+            "id": match.match_id,
+            "board": row + 1 if boards else None,
+            "team_1": engine.registry.names(match.team_1),
+            "team_2": engine.registry.names(match.team_2),
+            "winner": results.get(row),
+        }
+        for row, match in current_matches(engine)
+    ]
+
+
+class TournamentService:
+    """Match listing and result entry for remote clients.
+
+    Must be used on the thread that owns the engine. ``schedule`` works like
+    the one of RefreshScheduler, so a burst of tournament events publishes
+    one snapshot.
+    """
+
+    def __init__(self, engine, schedule=lambda flush: flush()):
+        self.engine = engine
+        self.version = 0
+        # match id -> winner, for every result entered during the tournament
+        self.results = {}
+        self.subscribers = []
+        self.refresh_scheduler = RefreshScheduler(schedule)
+        self.refresh_scheduler.register("state", lambda players: self.publish())
+        engine.add_listener(self.on_tournament_event)
+
+    def close(self):
+        self.engine.remove_listener(self.on_tournament_event)
+        self.subscribers.clear()
+
+    def on_tournament_event(self, event, *args):
+        if event in ("match_result_set", "board_result_set", "final_result_set"):
+            row, result = args
+            match = dict(self.current_matches()).get(row)
+            if match is not None:
+                self.results[match.match_id] = result
+        self.version += 1
+        self.refresh_scheduler.mark_dirty("state")
+
+    def current_matches(self):
+        return current_matches(self.engine)
+
+    def current_results(self):
+        return current_results(self.engine)
+
+    def state(self):
+        engine = self.engine
+        return {
+            "version": self.version,
+            "stage": engine.stage,
+            "round": engine.knockout_round if engine.stage == KNOCKOUT else engine.round_number,
+            "matches": match_entries(engine),
+        }
+
+    def publish(self):
+        state = self.state()
+        for subscriber in list(self.subscribers):
+            subscriber(state)
+
+    def submit(self, match_id, winner, version=None):
+        """Enter the winner of a match and return (HTTP status, response)."""
+        if winner not in (1, 2):
+            return 400, {"error": "The winner must be 1 or 2."}
+        previous = self.results.get(match_id)
+        if previous == winner:
+            return 200, {"status": "unchanged", "version": self.version}
+
+        row = next((row for row, match in self.current_matches() if match.match_id == match_id), None)
+        if row is None:
+            if previous is not None:
+                return 409, {"error": "The result of this match is already final.", "winner": previous, "version": self.version}
+            return 404, {"error": "The match is not being played.", "version": self.version}
+        if previous is not None:
+            # changing an entered winner needs the version the client saw
+            if version is None:
+                return 409, {"error": "Another winner was already entered for this match.", "winner": previous, "version": self.version}
+            if version != self.version:
+                return 409, {"error": "The matches have changed, please reload them.", "version": self.version}
+
+        engine = self.engine
+        if engine.stage == KNOCKOUT:
+            engine.set_final_match_result(row, winner)
+        elif engine.board_scheduler is not None:
+            # the board is free for the next match as soon as its result is
+            # in; results the operator entered for other boards are left alone
+            engine.board_scheduler.set_result(row, winner)
+            engine.board_scheduler.submit_results(boards=[row])
+        else:
+            engine.set_match_result(row, winner)
+        return 200, {"status": "accepted", "version": self.version}
+
+
+class ApiServer:
+    def __init__(self, service, host="0.0.0.0", port=DEFAULT_PORT, invoke=call_directly, scoreboard=None):
+        self.service = service
+        self.scoreboard = scoreboard
+        self.host = host
+        self.port = port
+        self.invoke = invoke
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.error = None
+        self.state = None
+        self.state_body = b"{}"
+        self.websockets = set()
+        self.spectators = set()
+        self.scoreboard_state = None
+        self.connections = 0
+
+    def start(self):
+        """Start serving on a background thread and return once the port is open."""
+        self.thread = threading.Thread(target=self.run, name="api-server", daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+        self.service.subscribers.append(self.publish)
+        self.service.publish()
+        if self.scoreboard is not None:
+            self.scoreboard.subscribers.append(self.publish_delta)
+            self.scoreboard.publish_snapshot()
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self.handle_connection, self.host, self.port, backlog=1024)
+            )
+        except OSError as error:
+            self.error = error
+            self.ready.set()
+            return
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.server.close()
+            self.loop.run_until_complete(self.server.wait_closed())
+            self.loop.close()
+
+    def stop(self):
+        if self.publish in self.service.subscribers:
+            self.service.subscribers.remove(self.publish)
+        if self.scoreboard is not None and self.publish_delta in self.scoreboard.subscribers:
+            self.scoreboard.subscribers.remove(self.publish_delta)
+        if self.loop is not None and self.thread.is_alive():
+            asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop)
+            self.thread.join(5)
+
+    async def shutdown(self):
+        self.server.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.loop.stop()
+
+    def publish(self, state):
+        """Called on the engine's thread with a new snapshot."""
+        self.loop.call_soon_threadsafe(self.set_state, state)
+
+    def set_state(self, state):
+        self.state = state
+        self.state_body = json.dumps(state, separators=(",", ":")).encode("utf-8")
+        self.broadcast(self.websockets, {"type": "state", "state": state})
+
+    def publish_delta(self, delta):
+        """Called on the engine's thread with a scoreboard delta."""
+        self.loop.call_soon_threadsafe(self.send_delta, delta)
+
+    def send_delta(self, delta):
+        self.scoreboard_state = self.scoreboard.apply_delta(self.scoreboard_state, delta)
+        self.broadcast(self.spectators, delta)
+
+    def broadcast(self, clients, message):
+        """Send a message to WebSocket clients, encoding it once for all of them."""
+        frame = websocket_frame(json.dumps(message, separators=(",", ":")).encode("utf-8"))
+        for writer in list(clients):
+            if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                # a client that does not keep up is dropped instead of buffering forever
+                clients.discard(writer)
+                writer.close()
+                continue
+            writer.write(frame)
+
+    async def submit(self, match_id, winner, version):
+        future = self.invoke(lambda: self.service.submit(match_id, winner, version))
+        try:
+            return await asyncio.wrap_future(future)
+        except ValueError as error:
+            # the engine refused the result, e.g. because the match just ended
+            return 409, {"error": str(error), "version": self.service.version}
+        except Exception as error:
+            return 500, {"error": f"The result could not be entered: {error}", "version": self.service.version}
+
+    async def handle_connection(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_SIZE:
+                    self.write_response(writer, 413, {"error": "The request is too large."}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                path = target.split("?", 1)[0]
+
+                if headers.get("upgrade", "").lower() == "websocket":
+                    if path == "/ws":
+                        await self.handle_websocket(reader, writer, headers)
+                        break
+                    if path == "/scoreboard/ws" and self.scoreboard is not None:
+                        await self.handle_spectator(reader, writer, headers)
+                        break
+                try:
+                    status, content_type, payload = await self.route(method, path, body)
+                except Exception as error:
+                    # answer instead of dropping the connection
+                    status, content_type, payload = 500, None, {"error": f"The request failed: {error}"}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self.write_response(writer, status, payload, keep_alive, content_type)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError, asyncio.CancelledError, ValueError):
+            pass
+        finally:
+            self.connections -= 1
+            self.websockets.discard(writer)
+            self.spectators.discard(writer)
+            writer.close()
+
+    async def route(self, method, path, body):
+        """Return (status, content type, payload) for a request."""
+        if path == "/":
+            if method != "GET":
+                return 405, None, {"error": "Method not allowed."}
+            return 200, "text/html; charset=utf-8", RESULT_ENTRY_PAGE.encode("utf-8")
+        if path in ("/matches", "/state"):
+            if method != "GET":
+                return 405, None, {"error": "Method not allowed."}
+            return 200, None, self.state_body
+        if path in ("/scoreboard", "/scoreboard.json") and self.scoreboard is not None:
+            if method != "GET":
+                return 405, None, {"error": "Method not allowed."}
+            if path == "/scoreboard":
+                return 200, "text/html; charset=utf-8", self.scoreboard.page.encode("utf-8")
+            return 200, None, self.scoreboard_state or {}
+        parts = path.strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "matches" and parts[2] == "result":
+            if method != "POST":
+                return 405, None, {"error": "Method not allowed."}
+            try:
+                match_id = int(parts[1])
+                data = json.loads(body or b"{}")
+                winner = data["winner"]
+                version = data.get("version")
+            except (ValueError, KeyError, TypeError, AttributeError):
+                return 400, None, {"error": "Send JSON like {\"winner\": 1}."}
+            status, payload = await self.submit(match_id, winner, version)
+            return status, None, payload
+        return 404, None, {"error": "Not found."}
+
+    def write_response(self, writer, status, payload, keep_alive, content_type=None):
+        if not isinstance(payload, bytes):
+            payload = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+            f"Content-Type: {content_type or 'application/json'}",
+            f"Content-Length: {len(payload)}",
+            "Cache-Control: no-store",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + payload)
+
+    def accept_websocket(self, writer, headers):
+        """Complete the WebSocket handshake, or answer 400 and return False."""
+        key = headers.get("sec-websocket-key")
+        if not key:
+            self.write_response(writer, 400, {"error": "Missing Sec-WebSocket-Key."}, False)
+            return False
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode("latin-1"))
+        return True
+
+    async def handle_spectator(self, reader, writer, headers):
+        """Send the scoreboard, then only its deltas; spectators cannot send anything."""
+        if not self.accept_websocket(writer, headers):
+            return
+        if self.scoreboard_state is not None:
+            writer.write(websocket_frame(json.dumps(self.scoreboard_state, separators=(",", ":")).encode("utf-8")))
+        self.spectators.add(writer)
+        while True:
+            opcode, payload = await read_websocket_frame(reader)
+            if opcode == 0x8:
+                writer.write(websocket_frame(b"", 0x8))
+                break
+            if opcode == 0x9:
+                writer.write(websocket_frame(payload, 0xA))
+
+    async def handle_websocket(self, reader, writer, headers):
+        if not self.accept_websocket(writer, headers):
+            return
+        if self.state is not None:
+            writer.write(websocket_frame(json.dumps({"type": "state", "state": self.state}).encode("utf-8")))
+        self.websockets.add(writer)
+
+        while True:
+            opcode, payload = await read_websocket_frame(reader)
+            if opcode == 0x8:
+                writer.write(websocket_frame(b"", 0x8))
+                break
+            if opcode == 0x9:
+                writer.write(websocket_frame(payload, 0xA))
+                continue
+            if opcode != 0x1:
+                continue
+            message = None
+            try:
+                message = json.loads(payload)
+                if message.get("type") != "submit":
+                    continue
+                status, response = await self.submit(int(message["match_id"]), message["winner"], message.get("version"))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                status, response = 400, {"error": "Send JSON like {\"type\": \"submit\", \"match_id\": 3, \"winner\": 1}."}
+            response = dict(response, type="submit_result", status_code=status, match_id=message.get("match_id") if isinstance(message, dict) else None)
+            writer.write(websocket_frame(json.dumps(response).encode("utf-8")))
+            await writer.drain()
+
+
+def websocket_frame(payload, opcode=0x1):
+    """A single unmasked server frame."""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def read_websocket_frame(reader):
+    """Read one (possibly masked) frame and return (opcode, payload)."""
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    if length > MAX_BODY_SIZE:
+        raise ValueError("WebSocket message too large")
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask is not None:
+        payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+    return opcode, payload
+
+
+RESULT_ENTRY_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Dart Tournament</title>
+<style>
+body { font-family: sans-serif; font-weight: bold; margin: 8px; }
+.match { border: 1px solid #aaa; margin: 8px 0; padding: 8px; }
+button { display: block; width: 100%; margin: 4px 0; padding: 14px; font-size: 16px; background: rgb(104, 205, 254); border: 0; }
+button.won { background: #0f0; }
+#status { color: #a00; }
+</style></head>
+<body>
+<h2 id="title">Dart Tournament</h2><div id="status"></div><div id="matches"></div>
+<script>
+let state = null;
+function render() {
+  document.getElementById("title").textContent = "Round " + state.round;
+  const container = document.getElementById("matches");
+  container.innerHTML = "";
+  for (const match of state.matches) {
+    const div = document.createElement("div");
+    div.className = "match";
+    div.innerHTML = match.board ? "<div>Board " + match.board + "</div>" : "";
+    [1, 2].forEach(team => {
+      const button = document.createElement("button");
+      button.textContent = match["team_" + team].join(" & ");
+      if (match.winner === team) button.className = "won";
+      button.onclick = () => submit(match.id, team);
+      div.appendChild(button);
+    });
+    container.appendChild(div);
+  }
+}
+async function load() {
+  state = await (await fetch("/matches")).json();
+  render();
+}
+async function submit(id, winner) {
+  const response = await fetch("/matches/" + id + "/result", {method: "POST", body: JSON.stringify({winner: winner, version: state.version})});
+  const data = await response.json();
+  document.getElementById("status").textContent = response.ok ? "" : data.error;
+  load();
+}
+load();
+setInterval(load, 3000);
+</script></body></html>
+"""
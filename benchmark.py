@@ -0,0 +1,301 @@
+"""Benchmarks of matchmaking, result processing and table refresh at scale.
+
+Runs headless on the Qt offscreen platform and writes the timings to a JSON
+file, so a run on one commit can be compared with a run on another:
+
+    python benchmark.py --output before.json
+    python benchmark.py --output after.json --compare before.json
+
+Every benchmark is run with the same random seed for every player count, and
+the user interface timings include processing the Qt events the action
+caused, since that is where the tables are refreshed.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# the offscreen platform warns about every window it cannot resize
+os.environ.setdefault("QT_LOGGING_RULES", "default.warning=false")
+
+from PyQt6.QtWidgets import QApplication
+
+import gui
+from career_stats import CareerStats
+from matchmaking import AVOID_REPEATS, RANDOM
+from player import Player
+from stages import FINAL_PLAYERS, FINISHED, GROUP_STAGE, KNOCKOUT
+from tournament import TournamentEngine
+
+PLAYER_COUNTS = [16, 64, 256, 1024]
+DEFAULT_OUTPUT = "benchmark-results.json"
+# rounds timed per repeat in the group-stage benchmarks
+ROUNDS = 5
+
+
+def process_events():
+    QApplication.processEvents()
+
+
+def timed(function, *args):
+    """Run a function and return the elapsed wall time in seconds."""
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+
+def create_engine(num_players, max_losses, matchmaking=RANDOM):
+    return TournamentEngine([Player(f"Player {number}") for number in range(1, num_players + 1)], max_losses, matchmaking)
+
+
+def create_application(engine):
+    window = gui.Application(engine)
+    window.resize(1280, 800)
+    window.show()
+    process_events()
+    return window
+
+
+def close_application(window):
+    window.tournament.remove_listener(window.on_tournament_event)
+    window.close()
+    window.deleteLater()
+    process_events()
+
+
+def enter_random_results(engine):
+    for row in range(len(engine.matches)):
+        engine.set_match_result(row, random.randint(1, 2))
+
+
+def play_round(engine):
+    engine.generate_gruppeplay_matches()
+    enter_random_results(engine)
+    engine.handle_match_results()
+
+
+def play_group_stage(engine):
+    while engine.stage == GROUP_STAGE:
+        play_round(engine)
+        process_events()
+
+
+def bench_generate(num_players, repeats, matchmaking):
+    samples = []
+    for _ in range(repeats):
+        # nobody is eliminated, so every round is as big as the first
+        engine = create_engine(num_players, ROUNDS + 1, matchmaking)
+        for _ in range(ROUNDS):
+            samples.append(timed(engine.generate_gruppeplay_matches))
+            enter_random_results(engine)
+            engine.handle_match_results()
+    return samples
+
+
+def bench_generate_random(num_players, repeats):
+    return bench_generate(num_players, repeats, RANDOM)
+
+
+def bench_generate_avoid_repeats(num_players, repeats):
+    return bench_generate(num_players, repeats, AVOID_REPEATS)
+
+
+def bench_handle_match_results(num_players, repeats):
+    samples = []
+    for _ in range(repeats):
+        engine = create_engine(num_players, 3)
+        for _ in range(ROUNDS):
+            if engine.stage != GROUP_STAGE:
+                break
+            engine.generate_gruppeplay_matches()
+            enter_random_results(engine)
+            samples.append(timed(engine.handle_match_results))
+    return samples
+
+
+def bench_update_player_table(num_players, repeats):
+    engine = create_engine(num_players, 3)
+    window = create_application(engine)
+    play_round(engine)
+    process_events()
+
+    def update():
+        window.update_player_table()
+        process_events()
+
+    samples = []
+    for _ in range(repeats):
+        # every row has changed, as after a round where everybody played
+        for player in engine.players:
+            player.wins += 1
+        samples.append(timed(update))
+    close_application(window)
+    return samples
+
+
+def bench_update_ui(num_players, repeats):
+    engine = create_engine(num_players, 3)
+    window = create_application(engine)
+    engine.generate_gruppeplay_matches()
+    process_events()
+
+    def update():
+        window.update_ui()
+        process_events()
+
+    samples = [timed(update) for _ in range(repeats)]
+    close_application(window)
+    return samples
+
+
+def bench_group_round(num_players, repeats):
+    """A whole round through the window: generate, enter every result, submit."""
+    samples = []
+    for _ in range(repeats):
+        engine = create_engine(num_players, ROUNDS + 1)
+        window = create_application(engine)
+
+        def play():
+            window.generate_gruppeplay_matches()
+            process_events()
+            for row in range(len(engine.matches)):
+                window.set_match_result(row, random.randint(1, 2))
+            process_events()
+            window.handle_match_results()
+            process_events()
+
+        samples.append(timed(play))
+        close_application(window)
+    return samples
+
+
+def bench_knockout_flow(num_players, repeats):
+    """From the end of the group stage to the finished tournament."""
+    samples = []
+    for _ in range(repeats):
+        engine = create_engine(num_players, 2)
+        window = create_application(engine)
+        play_group_stage(engine)
+
+        def play():
+            if engine.stage == FINAL_PLAYERS and engine.extra_game_player_count() > 0:
+                engine.add_selected_players(engine.extra_game_candidates()[:engine.extra_game_player_count()])
+                process_events()
+            window.seed_knockout_players()
+            process_events()
+            engine.start_knockout()
+            process_events()
+            while engine.stage == KNOCKOUT:
+                for row in range(len(engine.final_matches)):
+                    window.set_final_match_result(row, random.randint(1, 2))
+                process_events()
+                window.handle_final_results()
+                process_events()
+
+        samples.append(timed(play))
+        if engine.stage != FINISHED:
+            raise RuntimeError("The knockout benchmark did not finish the tournament.")
+        close_application(window)
+    return samples
+
+
+BENCHMARKS = {
+    "generate_gruppeplay_matches[random]": bench_generate_random,
+    "generate_gruppeplay_matches[avoid_repeats]": bench_generate_avoid_repeats,
+    "handle_match_results": bench_handle_match_results,
+    "update_player_table": bench_update_player_table,
+    "update_ui": bench_update_ui,
+    "group_round_ui": bench_group_round,
+    "knockout_flow": bench_knockout_flow,
+}
+
+
+def summarize(name, num_players, samples):
+    return {
+        "benchmark": name,
+        "players": num_players,
+        "samples": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "max": max(samples),
+    }
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def run(player_counts, names, repeats, seed):
+    results = []
+    for name in names:
+        for num_players in player_counts:
+            random.seed(seed)
+            result = summarize(name, num_players, BENCHMARKS[name](num_players, repeats))
+            results.append(result)
+            print(f"{name:45} {num_players:5} players  median {result['median'] * 1000:9.2f} ms  min {result['min'] * 1000:9.2f} ms", flush=True)
+    return {
+        "commit": git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(report, baseline):
+    """Print the change of every median against an earlier report."""
+    previous = {(result["benchmark"], result["players"]): result for result in baseline["results"]}
+    print(f"\nCompared with {baseline.get('commit') or 'the baseline'}:")
+    for result in report["results"]:
+        old = previous.get((result["benchmark"], result["players"]))
+        if old is None or old["median"] == 0:
+            continue
+        ratio = result["median"] / old["median"]
+        note = "  slower" if ratio > 1.2 else "  faster" if ratio < 1 / 1.2 else ""
+        print(f"{result['benchmark']:45} {result['players']:5} players  {old['median'] * 1000:9.2f} ms -> {result['median'] * 1000:9.2f} ms  x{ratio:.2f}{note}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the tournament engine and user interface.")
+    parser.add_argument("--players", type=int, nargs="+", default=PLAYER_COUNTS)
+    parser.add_argument("--benchmarks", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--compare", default=None, help="an earlier results file to compare with")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    # finished tournaments must not end up in the real career statistics
+    gui.career_stats = CareerStats(":memory:")
+    try:
+        report = run(args.players, args.benchmarks, args.repeats, args.seed)
+    finally:
+        gui.career_stats.close()
+        gui.career_stats = None
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(report, json.load(file))
+    del app
+
+
+if __name__ == "__main__":
+    main()
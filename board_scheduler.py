@@ -0,0 +1,198 @@
+"""Continuous group play on a fixed number of dart boards.
+
+Instead of waiting for a whole round, results are accepted match by match and
+a new match starts as soon as a board and four players are free. Sit-out
+fairness is kept per "round": a round is over once as many matches have
+started as a normal round would have, and the players that did not play in
+it get a sit-out, which gives them priority for the next boards.
+"""
+import time
+
+from tournament import GROUP_STAGE, Match
+
+
+class BoardScheduler:
+    def __init__(self, engine, boards):
+        if boards < 1:
+            raise ValueError("There must be at least one board.")
+        self.engine = engine
+        self.boards = [None] * boards
+        self.results = {}
+        # free player id -> order in which the player became free
+        self.free = {}
+        self.next_order = 0
+        self.played_this_round = set()
+        self.round_matches = 0
+        self.busy_since = [None] * boards
+        self.busy_time = 0.0
+        self.started_at = None
+        engine.board_scheduler = self
+        engine.add_listener(self.on_tournament_event)
+        self.release(player.id for player in engine.players)
+
+    def release(self, player_ids):
+        for player_id in player_ids:
+            self.free[player_id] = self.next_order
+            self.next_order += 1
+
+    def on_tournament_event(self, event, *args):
+        if event == "player_eliminated":
+            self.free.pop(args[0].id, None)
+        elif event == "undone":
+            # a player eliminated by hand waits for a board again
+            playing = {player_id for match in self.boards if match is not None for player_id in match.player_ids()}
+            self.release(player.id for player in args[1] if player.id not in playing and player.id not in self.free)
+
+    def free_boards(self):
+        return [board for board, match in enumerate(self.boards) if match is None]
+
+    def busy_boards(self):
+        return [board for board, match in enumerate(self.boards) if match is not None]
+
+    def free_players(self):
+        """The free players, longest waiting first."""
+        return self.engine.registry.players(sorted(self.free, key=self.free.get))
+
+    def can_start(self):
+        engine = self.engine
+        return (
+            engine.stage == GROUP_STAGE
+            and len(engine.players) > engine.knockout_size
+            and None in self.boards
+            and len(self.free) >= 4
+        )
+
+    def fill_boards(self):
+        """Start matches on every free board that the free players can fill."""
+        if not self.can_start():
+            return []
+        engine = self.engine
+        free_boards = self.free_boards()
+        count = min(len(free_boards), len(self.free) // 4)
+
+        # players that have not played this round first, then the ones that
+        # sat out most often, then the ones that have waited longest
+        internal_times_sat_out = engine.store.internal_times_sat_out
+        played = self.played_this_round
+        waiting = sorted(self.free, key=lambda player_id: (player_id in played, internal_times_sat_out[player_id], self.free[player_id]))
+        matches = engine.pair_players(engine.registry.players(waiting[:4 * count]))
+        assignments = list(zip(free_boards, matches))
+        self.start_matches(assignments)
+        return assignments
+
+    def start_matches(self, assignments):
+        """Put matches on boards, given as (board, Match) pairs."""
+        engine = self.engine
+        engine.history.clear()
+        now = time.monotonic()
+        if self.started_at is None:
+            self.started_at = now
+        engine.last_eliminated_players = []
+        for board, match in assignments:
+            if self.boards[board] is not None:
+                raise ValueError(f"Board {board + 1} is already in use.")
+            self.boards[board] = match
+            self.busy_since[board] = now
+            for player_id in match.player_ids():
+                self.free.pop(player_id, None)
+            self.played_this_round.update(match.player_ids())
+            engine.next_match_id = max(engine.next_match_id, match.match_id + 1)
+            self.round_matches += 1
+            if self.round_matches >= max(1, len(engine.players) // 4):
+                self.close_round()
+        engine.notify("board_matches_started", list(assignments))
+
+    def close_round(self):
+        """Give a sit-out to every player that did not play in this round."""
+        engine = self.engine
+        sat_out = [player.id for player in engine.players if player.id not in self.played_this_round]
+        engine.record_sit_outs(sat_out)
+        engine.round_number += 1
+        # the players on the boards are already playing in the next round
+        self.played_this_round = {player_id for match in self.boards if match is not None for player_id in match.player_ids()}
+        self.round_matches = 0
+        if sat_out:
+            engine.notify("players_sat_out", engine.registry.players(sat_out))
+
+    def set_result(self, board, result):
+        """Record the winning team (1 or 2) of the match on a board."""
+        if self.boards[board] is None:
+            raise ValueError(f"There is no match on board {board + 1}.")
+        self.results[board] = result
+        self.engine.notify("board_result_set", board, result)
+
+    def submit_results(self, fill=True, boards=None):
+        """Apply the results entered so far and start new matches on the freed boards.
+
+        ``boards`` limits the submission to those boards; the results of the
+        other boards stay entered.
+        """
+        boards = sorted(board for board in (self.results if boards is None else boards) if board in self.results and self.boards[board] is not None)
+        if not boards:
+            raise ValueError("Please select a winner for at least one match.")
+        engine = self.engine
+        engine.history.clear()
+        registry = engine.registry
+        now = time.monotonic()
+        winner_ids = []
+        loser_ids = []
+        finished = []
+        for board in boards:
+            match = self.boards[board]
+            winners, losers = match.teams(self.results[board])
+            winner_ids.extend(winners)
+            loser_ids.extend(losers)
+            engine.ratings.record_match(winners, losers)
+            finished.append(match)
+            self.boards[board] = None
+            if self.busy_since[board] is not None:
+                self.busy_time += now - self.busy_since[board]
+            self.busy_since[board] = None
+            del self.results[board]
+
+        eliminated_ids = engine.store.apply_results(winner_ids, loser_ids, engine.max_losses)
+        engine.last_eliminated_players = registry.players(eliminated_ids)
+        engine.processing_results = True
+        try:
+            for player in engine.last_eliminated_players:
+                engine.eliminate_player(player)
+        finally:
+            engine.processing_results = False
+        engine.pairing_history.record_round(finished)
+        self.release(player_id for player_id in winner_ids + loser_ids if player_id in registry.active)
+        engine.notify("board_results_submitted", registry.players(winner_ids + loser_ids), boards)
+
+        if fill:
+            self.fill_boards()
+        engine.check_tournament_end()
+
+    def utilization(self):
+        """Share of the time since the first match that the boards were in use."""
+        if self.started_at is None:
+            return 0.0
+        now = time.monotonic()
+        busy = self.busy_time + sum(now - since for since in self.busy_since if since is not None)
+        elapsed = (now - self.started_at) * len(self.boards)
+        return busy / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self):
+        return {
+            "boards": [None if match is None else [match.match_id, list(match.team_1), list(match.team_2)] for match in self.boards],
+            "results": sorted(self.results.items()),
+            "free": sorted(self.free.items()),
+            "next_order": self.next_order,
+            "played_this_round": sorted(self.played_this_round),
+            "round_matches": self.round_matches,
+        }
+
+    @classmethod
+    def from_dict(cls, engine, data):
+        scheduler = cls(engine, len(data["boards"]))
+        scheduler.boards = [None if match is None else Match(*match) for match in data["boards"]]
+        scheduler.busy_since = [None if match is None else time.monotonic() for match in scheduler.boards]
+        scheduler.results = dict(data["results"])
+        scheduler.free = dict(data["free"])
+        scheduler.next_order = data["next_order"]
+        scheduler.played_this_round = set(data["played_this_round"])
+        scheduler.round_matches = data["round_matches"]
+        return scheduler
@@ -0,0 +1,137 @@
+"""Single-elimination bracket of teams, for knockouts of any size.
+
+The bracket is a complete binary tree stored in a flat list like a heap: the
+final is node 1, the children of node ``n`` are ``2n`` and ``2n + 1``, and the
+teams are the leaves ``size`` to ``2 * size - 1``. Teams are placed in the
+usual seeding order (1 meets the lowest seed, 1 and 2 can only meet in the
+final) and missing teams are byes, which go to the best seeds. Advancing a
+winner only writes its node, so it is O(1) and only that node and its parent
+change.
+"""
+import heapq
+
+MAXIMUM_SIZE = 64
+
+
+def seeding_order(size):
+    """Seed (1-based) of every leaf of a bracket of ``size`` teams, e.g. 1, 4, 2, 3."""
+    order = [1]
+    while len(order) < size:
+        order = [seed for top in order for seed in (top, 2 * len(order) + 1 - top)]
+    return order
+
+
+def seeding_key(player):
+    """Group-stage standing of a player, best first: wins, then losses, then rating."""
+    stats = player.stats
+    return (-stats.wins, stats.losses, -player.tournament.ratings.rating(player.id), player.id)
+
+
+def top_players(players, count):
+    """The ``count`` best players by group-stage standing, best first."""
+    return heapq.nsmallest(count, players, key=seeding_key)
+
+
+class Bracket:
+    def __init__(self, teams):
+        """Build the bracket for teams (tuples of player ids) given best seed first."""
+        if not 2 <= len(teams) <= MAXIMUM_SIZE:
+            raise ValueError(f"A knockout needs between 2 and {MAXIMUM_SIZE} teams.")
+        self.teams = [tuple(team) for team in teams]
+        self.size = 1
+        while self.size < len(self.teams):
+            self.size *= 2
+        self.rounds = self.size.bit_length() - 1
+        # node -> team index (None for a bye or an undecided match)
+        self.slots = [None] * (2 * self.size)
+        self.decided = [False] * (2 * self.size)
+        # team index -> round in which the team was knocked out
+        self.exit_rounds = {}
+        self.team_of_player = {player_id: index for index, team in enumerate(self.teams) for player_id in team}
+        for position, seed in enumerate(seeding_order(self.size)):
+            leaf = self.size + position
+            self.slots[leaf] = seed - 1 if seed <= len(self.teams) else None
+            self.decided[leaf] = True
+        # a team without an opponent goes through to the next round
+        for node in range(self.size - 1, 0, -1):
+            if self.decided[2 * node] and self.decided[2 * node + 1] and None in (self.slots[2 * node], self.slots[2 * node + 1]):
+                self.slots[node] = self.slots[2 * node] if self.slots[2 * node] is not None else self.slots[2 * node + 1]
+                self.decided[node] = True
+
+    def round_of(self, node):
+        """Round (1 = first round, ``rounds`` = final) in which a match node is played."""
+        return self.rounds - (node.bit_length() - 1)
+
+    def round_nodes(self, round_number):
+        """All match nodes of a round."""
+        first = self.size >> round_number
+        return range(first, 2 * first)
+
+    def is_ready(self, node):
+        return (
+            not self.decided[node]
+            and self.decided[2 * node] and self.decided[2 * node + 1]
+        )
+
+    def matches(self, round_number):
+        """The match nodes of a round that are played (not byes)."""
+        return [node for node in self.round_nodes(round_number) if self.is_ready(node)]
+
+    def entrants(self, node):
+        """Team indexes of the two sides of a match node (None while undecided or a bye)."""
+        return self.slots[2 * node], self.slots[2 * node + 1]
+
+    def advance(self, node, result):
+        """Record the winning side (1 or 2) of a match and return (winner, loser)."""
+        if not self.is_ready(node):
+            raise ValueError("This match cannot be played yet.")
+        team_1, team_2 = self.entrants(node)
+        winner, loser = (team_1, team_2) if result == 1 else (team_2, team_1)
+        self.slots[node] = winner
+        self.decided[node] = True
+        self.exit_rounds[loser] = self.round_of(node)
+        return winner, loser
+
+    def retract(self, node):
+        """Undo the result of a match recorded with advance()."""
+        team_1, team_2 = self.entrants(node)
+        self.exit_rounds.pop(team_2 if self.slots[node] == team_1 else team_1, None)
+        self.slots[node] = None
+        self.decided[node] = False
+
+    def champion(self):
+        return self.slots[1] if self.decided[1] else None
+
+    def alive_teams(self):
+        """Team indexes that have not been knocked out."""
+        return [index for index in range(len(self.teams)) if index not in self.exit_rounds]
+
+    def stage_name(self, round_number):
+        teams = self.size >> (round_number - 1)
+        if teams == 2:
+            return "Finals"
+        if teams == 4:
+            return "Semi-Finals"
+        if teams == 8:
+            return "Quarter-Finals"
+        return f"Round of {teams}"
+
+    def exit_stage(self, player_id):
+        """Name of the stage in which a player was knocked out, or None."""
+        team = self.team_of_player.get(player_id)
+        if team is None or team not in self.exit_rounds:
+            return None
+        return self.stage_name(self.exit_rounds[team])
+
+    def to_dict(self):
+        return {
+            "teams": [list(team) for team in self.teams],
+            "results": [[node, 1 if self.slots[node] == self.slots[2 * node] else 2] for node in range(self.size - 1, 0, -1) if self.decided[node] and None not in self.entrants(node)],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        bracket = cls(data["teams"])
+        for node, result in data["results"]:
+            bracket.advance(node, result)
+        return bracket
@@ -0,0 +1,223 @@
+"""Season-long player statistics stored in a local SQLite database.
+
+All database work runs on one background thread with its own connection, so
+saving a tournament or querying a leaderboard never blocks the UI thread; the
+public methods return ``concurrent.futures.Future`` objects. Leaderboards are
+read from a per-season totals table that is kept up to date in the same
+transaction that stores a tournament, so they are an index range scan no
+matter how many tournaments have been played.
+"""
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DATABASE_PATH = os.path.join(os.path.expanduser("~"), ".dart_tournament", "career.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS tournaments (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    season TEXT NOT NULL,
+    player_count INTEGER NOT NULL,
+    max_losses INTEGER NOT NULL,
+    rounds INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    tournament_id INTEGER NOT NULL REFERENCES tournaments(id),
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    times_sat_out INTEGER NOT NULL,
+    finishing_stage TEXT NOT NULL,
+    PRIMARY KEY (tournament_id, player_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS season_totals (
+    season TEXT NOT NULL,
+    player_id INTEGER NOT NULL REFERENCES players(id),
+    tournaments INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    times_sat_out INTEGER NOT NULL,
+    titles INTEGER NOT NULL,
+    PRIMARY KEY (season, player_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ratings (
+    player_id INTEGER PRIMARY KEY REFERENCES players(id),
+    rating REAL NOT NULL,
+    matches INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_player ON results (player_id, tournament_id);
+CREATE INDEX IF NOT EXISTS tournaments_by_season ON tournaments (season, played_at);
+CREATE INDEX IF NOT EXISTS season_leaderboard ON season_totals (season, wins DESC, titles DESC);
+"""
+
+# Finishing stages besides the knockout rounds
+WINNER = "Winner"
+GROUP_STAGE = "Group Stage"
+
+
+def current_season():
+    return time.strftime("%Y")
+
+
+def finishing_stage(tournament, player):
+    """Name of the stage in which the player was knocked out (or Winner)."""
+    if player in tournament.winners:
+        return WINNER
+    if tournament.bracket is None:
+        return GROUP_STAGE
+    return tournament.bracket.exit_stage(player.id) or GROUP_STAGE
+
+
+def tournament_rows(tournament):
+    """Per-player result rows of a finished tournament as plain tuples."""
+    players = tournament.players + tournament.eliminated_players
+    return [
+        (player.name, player.stats.wins, player.stats.losses, player.stats.times_sat_out, finishing_stage(tournament, player))
+        for player in players
+    ]
+
+
+def tournament_ratings(tournament):
+    """(name, rating, rated matches) of every player of a tournament."""
+    ratings = tournament.ratings
+    return [
+        (player.name, ratings.rating(player.id), int(ratings.matches[player.id]))
+        for player in tournament.registry.by_id.values()
+        if player.id < ratings.capacity
+    ]
+
+
+class CareerStats:
+    def __init__(self, path=DATABASE_PATH):
+        self.path = path
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="career-stats")
+        self.connection = None
+
+    def connect(self):
+        """Open the database; only ever called on the worker thread."""
+        if self.connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(self.path)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA foreign_keys=ON")
+            self.connection.executescript(SCHEMA)
+        return self.connection
+
+    def save_tournament(self, tournament, season=None, played_at=None):
+        """Store a finished tournament in the background and return a Future of its id.
+
+        The results are copied on the calling thread, so the tournament can be
+        cleared right after this returns.
+        """
+        rows = tournament_rows(tournament)
+        details = (
+            played_at if played_at is not None else time.time(),
+            season if season is not None else current_season(),
+            len(rows),
+            tournament.max_losses,
+            tournament.round_number,
+        )
+        return self.executor.submit(self.insert_tournament, details, rows, tournament_ratings(tournament))
+
+    def insert_tournament(self, details, rows, ratings=()):
+        connection = self.connect()
+        season = details[1]
+        with connection:
+            connection.executemany("INSERT OR IGNORE INTO players (name) VALUES (?)", [(row[0],) for row in rows])
+            player_ids = {}
+            # stay below SQLite's limit on the number of parameters
+            for start in range(0, len(rows), 500):
+                chunk = [row[0] for row in rows[start:start + 500]]
+                player_ids.update(connection.execute(
+                    f"SELECT name, id FROM players WHERE name IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ))
+            tournament_id = connection.execute(
+                "INSERT INTO tournaments (played_at, season, player_count, max_losses, rounds) VALUES (?, ?, ?, ?, ?)",
+                details,
+            ).lastrowid
+            connection.executemany(
+                "INSERT INTO results (tournament_id, player_id, wins, losses, times_sat_out, finishing_stage) VALUES (?, ?, ?, ?, ?, ?)",
+                [(tournament_id, player_ids[name], wins, losses, sat_out, stage) for name, wins, losses, sat_out, stage in rows],
+            )
+            connection.executemany(
+                """INSERT INTO season_totals (season, player_id, tournaments, wins, losses, times_sat_out, titles)
+                   VALUES (?, ?, 1, ?, ?, ?, ?)
+                   ON CONFLICT (season, player_id) DO UPDATE SET
+                       tournaments = tournaments + 1,
+                       wins = wins + excluded.wins,
+                       losses = losses + excluded.losses,
+                       times_sat_out = times_sat_out + excluded.times_sat_out,
+                       titles = titles + excluded.titles""",
+                [(season, player_ids[name], wins, losses, sat_out, int(stage == WINNER)) for name, wins, losses, sat_out, stage in rows],
+            )
+            connection.executemany(
+                """INSERT INTO ratings (player_id, rating, matches) VALUES (?, ?, ?)
+                   ON CONFLICT (player_id) DO UPDATE SET rating = excluded.rating, matches = excluded.matches""",
+                [(player_ids[name], rating, matches) for name, rating, matches in ratings if name in player_ids],
+            )
+        return tournament_id
+
+    def ratings(self, names):
+        """Future of {name: (rating, rated matches)} of the given players that were rated before."""
+        names = list(names)
+        return self.executor.submit(self.query_ratings, names)
+
+    def query_ratings(self, names):
+        connection = self.connect()
+        ratings = {}
+        # stay below SQLite's limit on the number of parameters
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            rows = connection.execute(
+                f"""SELECT players.name, ratings.rating, ratings.matches
+                    FROM ratings JOIN players ON players.id = ratings.player_id
+                    WHERE players.name IN ({','.join('?' * len(chunk))})""",
+                chunk,
+            )
+            ratings.update((name, (rating, matches)) for name, rating, matches in rows)
+        return ratings
+
+    def leaderboard(self, season=None, limit=50):
+        """Future of the season's top players as (name, tournaments, wins, losses, times sat out, titles)."""
+        season = season if season is not None else current_season()
+        return self.executor.submit(self.query, """
+            SELECT players.name, tournaments, wins, losses, times_sat_out, titles
+            FROM season_totals JOIN players ON players.id = season_totals.player_id
+            WHERE season = ?
+            ORDER BY wins DESC, titles DESC
+            LIMIT ?""", (season, limit))
+
+    def player_history(self, name, limit=100):
+        """Future of a player's latest results as (played at, season, wins, losses, times sat out, stage)."""
+        return self.executor.submit(self.query, """
+            SELECT tournaments.played_at, tournaments.season, results.wins, results.losses,
+                   results.times_sat_out, results.finishing_stage
+            FROM players
+            JOIN results ON results.player_id = players.id
+            JOIN tournaments ON tournaments.id = results.tournament_id
+            WHERE players.name = ?
+            ORDER BY results.tournament_id DESC
+            LIMIT ?""", (name, limit))
+
+    def seasons(self):
+        return self.executor.submit(self.query, "SELECT DISTINCT season FROM tournaments ORDER BY season DESC", ())
+
+    def query(self, sql, parameters):
+        return self.connect().execute(sql, parameters).fetchall()
+
+    def close(self):
+        def close_connection():
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+        self.executor.submit(close_connection).result()
+        self.executor.shutdown()
@@ -0,0 +1,328 @@
+"""Exporting tournaments to CSV, JSON Lines and a self-contained HTML report.
+
+A tournament is exported from its journal: the records are replayed one at a
+time and turned into rows on the way (see tournament_rows()), so only the
+tournament being exported is held in memory and a whole archive of journals
+streams through in one pass. The rows of an operation that can still be
+undone are held back until it no longer can, so undone results are left
+out. Rows are ``(section, values)`` pairs and every writer consumes them as
+a generator.
+"""
+import argparse
+import csv
+import glob
+import html
+import json
+import os
+import time
+from collections import deque
+
+from career_stats import GROUP_STAGE, finishing_stage
+from history import KNOCKOUT_RESULTS, RESULTS
+from journal import JOURNAL_DIRECTORY, replay
+
+ARCHIVE_DIRECTORY = os.path.join(JOURNAL_DIRECTORY, "archive")
+
+# Sections in the order they appear in the report, with their columns
+SECTIONS = {
+    "tournament": [
+        "tournament", "started_at", "finished_at", "players", "max_losses", "matchmaking",
+        "knockout_size", "boards", "rounds", "winners",
+    ],
+    "players": ["tournament", "player_id", "name", "wins", "losses", "times_sat_out", "finishing_stage", "rating"],
+    "matches": ["tournament", "round", "stage", "board", "match_id", "team_1", "team_2", "winner"],
+    "sit_outs": ["tournament", "round", "player"],
+    "eliminations": ["tournament", "round", "player", "losses", "manual"],
+    "bracket": ["tournament", "stage", "node", "team_1", "team_2", "winner"],
+}
+SECTION_TITLES = {
+    "tournament": "Tournament",
+    "players": "Players",
+    "matches": "Matches",
+    "sit_outs": "Sit-outs",
+    "eliminations": "Eliminations",
+    "bracket": "Knockout Bracket",
+}
+TEAM_SEPARATOR = " & "
+
+
+def format_time(timestamp):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp)) if timestamp is not None else ""
+
+
+def journal_records(path):
+    """Yield the records of a journal file, up to a partly written last line."""
+    with open(path, "rb") as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                break
+
+
+def archived_journals(directory=ARCHIVE_DIRECTORY):
+    """Paths of the archived journals, oldest first."""
+    return sorted(glob.glob(os.path.join(directory, "*.jsonl")))
+
+
+def tournament_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def tournament_rows(records, name):
+    """Yield the rows of one tournament while its journal records are replayed."""
+    engine = None
+    started = None
+    finished_at = None
+    # rows produced by the engine events of the record being replayed
+    pending = []
+    # match id -> round of the matches that are being played on the boards
+    board_rounds = {}
+
+    def on_tournament_event(event, *args):
+        if event == "matches_generated":
+            pending.extend(("sit_outs", {"tournament": name, "round": engine.round_number, "player": player.name}) for player in engine.unused_players)
+        elif event == "players_sat_out":
+            pending.extend(("sit_outs", {"tournament": name, "round": engine.round_number, "player": player.name}) for player in args[0])
+        elif event == "player_eliminated":
+            player = args[0]
+            pending.append(("eliminations", {
+                "tournament": name, "round": engine.round_number, "player": player.name,
+                "losses": player.stats.losses, "manual": not engine.processing_results,
+            }))
+
+    def match_row(match, result, round_number, stage, board=None):
+        winners = match.teams(result)[0]
+        return ("matches", {
+            "tournament": name, "round": round_number, "stage": stage, "board": board, "match_id": match.match_id,
+            "team_1": engine.team_names(match.team_1, TEAM_SEPARATOR), "team_2": engine.team_names(match.team_2, TEAM_SEPARATOR),
+            "winner": engine.team_names(winners, TEAM_SEPARATOR),
+        })
+
+    def submitted_rows(operation):
+        """Rows of the matches that a submission is about to apply."""
+        rows = []
+        if operation == RESULTS:
+            for row, match in enumerate(engine.matches):
+                if engine.match_results.get(row) in (1, 2):
+                    rows.append(match_row(match, engine.match_results[row], engine.round_number, GROUP_STAGE))
+        elif operation == KNOCKOUT_RESULTS:
+            stage = engine.knockout_stage_name()
+            for row, match in enumerate(engine.final_matches):
+                if engine.final_match_results.get(row) in (1, 2):
+                    rows.append(match_row(match, engine.final_match_results[row], None, stage))
+        return rows
+
+    # rows of the operations that can still be undone, oldest first; they are
+    # only written once the operation can no longer be undone
+    held = deque()
+    for record in records:
+        event = record["event"]
+        rows = []
+        # the matches are read before they are cleared by replaying the submission
+        if event == "results_submitted":
+            rows = submitted_rows(RESULTS)
+        elif event == "final_results_submitted":
+            rows = submitted_rows(KNOCKOUT_RESULTS)
+        elif event == "redone":
+            rows = submitted_rows(engine.history.redo_stack[-1][0])
+        elif event == "board_results_submitted":
+            scheduler = engine.board_scheduler
+            for board in record.get("boards", sorted(scheduler.results)):
+                match = scheduler.boards[board]
+                if match is not None and board in scheduler.results:
+                    rows.append(match_row(match, scheduler.results[board], board_rounds.pop(match.match_id, None), GROUP_STAGE, board + 1))
+        elif event == "board_matches_started":
+            board_rounds.update((match[1], engine.round_number + 1) for match in record["matches"])
+        elif event == "tournament_finished":
+            finished_at = record["time"]
+
+        undo_stack = engine.history.undo_stack if engine is not None else ()
+        last_operation = undo_stack[-1] if undo_stack else None
+        engine = replay(engine, record)
+        if event == "tournament_started":
+            started = record
+            engine.add_listener(on_tournament_event)
+        rows.extend(pending)
+        pending.clear()
+
+        undo_stack = engine.history.undo_stack
+        if event == "undone":
+            held.pop()
+        elif undo_stack and undo_stack[-1] is not last_operation:
+            held.append(rows)
+            # the oldest operation drops out of a full history
+            while len(held) > len(undo_stack):
+                yield from held.popleft()
+        else:
+            if not undo_stack:
+                while held:
+                    yield from held.popleft()
+            yield from rows
+
+    while held:
+        yield from held.popleft()
+    if engine is None:
+        return
+    yield from final_rows(engine, name, started, finished_at)
+
+
+def final_rows(engine, name, started, finished_at):
+    """The players, the bracket and the summary of the tournament as it ended."""
+    ratings = engine.ratings
+    for player in sorted(engine.registry.by_id.values(), key=lambda player: player.id):
+        yield "players", {
+            "tournament": name, "player_id": player.id, "name": player.name, "wins": player.stats.wins,
+            "losses": player.stats.losses, "times_sat_out": player.stats.times_sat_out,
+            "finishing_stage": finishing_stage(engine, player), "rating": round(ratings.rating(player.id), 1),
+        }
+
+    bracket = engine.bracket
+    if bracket is not None:
+        def side(node):
+            team = bracket.slots[node]
+            if team is not None:
+                return engine.team_names(bracket.teams[team], TEAM_SEPARATOR)
+            return "Bye" if bracket.decided[node] else ""
+
+        for round_number in range(1, bracket.rounds + 1):
+            for node in bracket.round_nodes(round_number):
+                yield "bracket", {
+                    "tournament": name, "stage": bracket.stage_name(round_number), "node": node,
+                    "team_1": side(2 * node), "team_2": side(2 * node + 1),
+                    "winner": side(node) if bracket.decided[node] else "",
+                }
+
+    yield "tournament", {
+        "tournament": name, "started_at": format_time(started["time"]), "finished_at": format_time(finished_at),
+        "players": len(started["players"]), "max_losses": started["max_losses"], "matchmaking": started["matchmaking"],
+        "knockout_size": engine.knockout_size, "boards": started.get("boards", 0), "rounds": engine.round_number,
+        "winners": TEAM_SEPARATOR.join(player.name for player in engine.winners),
+    }
+
+
+def journal_rows(paths):
+    """Yield the rows of every journal in turn."""
+    for path in paths:
+        yield from tournament_rows(journal_records(path), tournament_name(path))
+
+
+def write_jsonl(rows, path):
+    """Write one JSON object per row, with its section."""
+    with open(path, "w", encoding="utf-8") as file:
+        for section, values in rows:
+            file.write(json.dumps({"section": section, **values}, ensure_ascii=False) + "\n")
+    return [path]
+
+
+def write_csv(rows, path):
+    """Write one CSV file per section, named after ``path``, e.g. results-matches.csv."""
+    stem = os.path.splitext(path)[0]
+    files = {}
+    writers = {}
+    try:
+        for section, values in rows:
+            writer = writers.get(section)
+            if writer is None:
+                files[section] = open(f"{stem}-{section}.csv", "w", newline="", encoding="utf-8")
+                writer = writers[section] = csv.DictWriter(files[section], fieldnames=SECTIONS[section])
+                writer.writeheader()
+            writer.writerow(values)
+    finally:
+        for file in files.values():
+            file.close()
+    return [file.name for file in files.values()]
+
+
+HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Dart Tournament Results</title>
+<style>
+body { font-family: sans-serif; margin: 2em; color: #222; }
+h1 { font-size: 1.6em; }
+h2 { margin-top: 2em; border-bottom: 2px solid rgb(104, 205, 254); }
+h3 { font-size: 1.1em; }
+table { border-collapse: collapse; margin-bottom: 1em; }
+th { background-color: rgb(104, 205, 254); text-align: left; }
+th, td { padding: 0.2em 0.8em; }
+tr:nth-child(even) td { background-color: rgb(210, 210, 210); }
+</style>
+</head>
+<body>
+<h1>Dart Tournament Results</h1>
+"""
+HTML_TAIL = "</body>\n</html>\n"
+
+
+def html_table(title, columns, rows):
+    """Yield the lines of an HTML table (the tournament column is left out)."""
+    columns = [column for column in columns if column != "tournament"]
+    yield f"<h3>{html.escape(title)}</h3>\n<table>\n<tr>"
+    yield "".join(f"<th>{html.escape(column.replace('_', ' ').capitalize())}</th>" for column in columns) + "</tr>\n"
+    for values in rows:
+        cells = "".join(f"<td>{html.escape(str(values[column]) if values[column] is not None else '')}</td>" for column in columns)
+        yield f"<tr>{cells}</tr>\n"
+    yield "</table>\n"
+
+
+def html_tournament(name, sections):
+    yield f"<h2>{html.escape(name)}</h2>\n"
+    for section, columns in SECTIONS.items():
+        if sections.get(section):
+            yield from html_table(SECTION_TITLES[section], columns, sections[section])
+
+
+def write_html(rows, path):
+    """Write a report with one heading per tournament and a table per section.
+
+    The tables of a tournament are written once all its rows are read, so
+    only one tournament is held in memory at a time.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(HTML_HEAD)
+        name = None
+        sections = {}
+        for section, values in rows:
+            if values["tournament"] != name:
+                if name is not None:
+                    file.writelines(html_tournament(name, sections))
+                name = values["tournament"]
+                sections = {}
+            sections.setdefault(section, []).append(values)
+        if name is not None:
+            file.writelines(html_tournament(name, sections))
+        file.write(HTML_TAIL)
+    return [path]
+
+
+WRITERS = {".csv": write_csv, ".jsonl": write_jsonl, ".html": write_html, ".htm": write_html}
+
+
+def export(rows, path):
+    """Write the rows in the format given by the extension of ``path``; returns the written paths."""
+    writer = WRITERS.get(os.path.splitext(path)[1].lower())
+    if writer is None:
+        raise ValueError(f"Unknown export format, use one of {', '.join(WRITERS)}.")
+    return writer(rows, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export journaled tournaments to CSV, JSON Lines or an HTML report.")
+    parser.add_argument("journals", nargs="*", help="journal files (default: every archived tournament)")
+    parser.add_argument("--output", required=True, help="output file; the format follows from .csv, .jsonl or .html")
+    args = parser.parse_args()
+
+    journals = args.journals or archived_journals()
+    if not journals:
+        parser.error("There are no journals to export.")
+    try:
+        for path in export(journal_rows(journals), args.output):
+            print(path)
+    except ValueError as error:
+        parser.error(str(error))
+
+
+if __name__ == "__main__":
+    main()
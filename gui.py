@@ -0,0 +1,1463 @@
+"""The Qt user interface: the start page, the tournament window and its dialogs.
+
+DartTournament.py imports this module when the application starts, so the
+rest of the program can be imported without Qt.
+"""
+import time
+
+from PyQt6.QtWidgets import (
+    QApplication, QTableWidget, QTableWidgetItem, QVBoxLayout, QHBoxLayout,
+    QPushButton, QDialogButtonBox, QLabel, QWidget, QDialog, QGridLayout, QLineEdit, 
+    QSpinBox, QFormLayout, QMessageBox, QCheckBox, QComboBox, QTableView, QFileDialog,
+    QListView, QStyledItemDelegate, QStyleOptionViewItem, QStyleOptionButton, QStyle, QFrame, QScrollArea,
+    
+)
+from PyQt6.QtGui import QPainter, QPixmap, QPalette, QColor, QShortcut, QKeySequence
+from PyQt6.QtCore import Qt, QTimer, QObject, pyqtSignal, QRect, QSize, QEvent
+import socket
+from stages import GROUP_STAGE, FINAL_PLAYERS, KNOCKOUT, FINISHED, KNOCKOUT_SIZES  # Import the tournament stages
+from matchmaking import RANDOM, AVOID_REPEATS, BALANCED  # Import the matchmaking modes
+from table_models import PlayerTableModel, RosterModel, PlayerChecklistModel, PLAYER_COLUMNS, RATED_PLAYER_COLUMNS, ELIMINATED_COLUMNS, UNUSED_COLUMNS, WAITING_COLUMNS  # Import the table models
+from refresh import RefreshScheduler  # Import the refresh scheduler
+from instrumentation import Instrumentation  # Import the instrumentation
+
+# The engine (with NumPy), the journal, the local server and the career
+# database are imported where they are first used, so the start page shows
+# without waiting for them.
+
+class CachedBackground:
+    """Background image that is read from disk once and scaled once per widget size."""
+    def __init__(self, path):
+        self.path = path
+        self.pixmap = None
+        self.loaded = False
+        self.scaled_pixmap = None
+        self.scaled_size = None
+
+    def source(self):
+        """Return the image, or None if it is missing (the disk is only tried once)."""
+        if not self.loaded:
+            self.loaded = True
+            pixmap = QPixmap(self.path)
+            self.pixmap = None if pixmap.isNull() else pixmap
+        return self.pixmap
+
+    def invalidate(self):
+        """Drop the scaled copy, e.g. when the widget is resized."""
+        self.scaled_pixmap = None
+        self.scaled_size = None
+
+    def draw(self, painter, rect):
+        source = self.source()
+        if source is None:
+            return
+        if self.scaled_pixmap is None or self.scaled_size != rect.size():
+            self.scaled_pixmap = source.scaled(rect.size(), Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            self.scaled_size = rect.size()
+        painter.drawPixmap(rect.topLeft(), self.scaled_pixmap)
+
+# The dartboard is shared by every window, so it is only loaded once
+dartboard_background = CachedBackground("dartboard.png")  # Path to your dartboard image
+
+class FutureCallback(QObject):
+    """Delivers a finished background Future to a callback on the UI thread."""
+    finished = pyqtSignal(object)
+
+    def __init__(self, future, callback, parent=None):
+        super().__init__(parent)
+        self.callback = callback
+        self.finished.connect(self.deliver)
+        # the signal is emitted on the worker thread and delivered through the event loop
+        future.add_done_callback(self.finished.emit)
+
+    def deliver(self, future):
+        self.callback(future)
+        self.deleteLater()
+
+
+class MainThreadInvoker(QObject):
+    """Runs functions from other threads on the UI thread and returns their result as a Future."""
+    requested = pyqtSignal(object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.requested.connect(self.run)
+
+    def invoke(self, function):
+        import concurrent.futures
+        future = concurrent.futures.Future()
+        self.requested.emit(function, future)
+        return future
+
+    def run(self, function, future):
+        try:
+            future.set_result(function())
+        except Exception as error:
+            future.set_exception(error)
+
+
+career_stats = None
+
+
+def get_career_stats():
+    """The career statistics database, opened on first use."""
+    global career_stats
+    if career_stats is None:
+        from career_stats import CareerStats
+        career_stats = CareerStats()
+    return career_stats
+
+
+# Set by main() when the user actions are measured (--profile)
+instrumentation = None
+
+# The Application methods that are measured, the refreshes are measured as well
+INSTRUMENTED_ACTIONS = [
+    "generate_gruppeplay_matches", "handle_match_results", "remove_losses", "eliminate_players",
+    "add_selected_players", "seed_knockout_players", "handle_final_results", "undo", "redo", "update_ui", "paintEvent",
+]
+
+
+def enable_instrumentation():
+    global instrumentation
+    if instrumentation is None:
+        instrumentation = Instrumentation(counters={"widgets": lambda: len(QApplication.allWidgets()), "items": count_table_items})
+    return instrumentation
+
+
+def count_table_items():
+    """Number of cells in all QTableWidgets, including the ones waiting to be deleted."""
+    return sum(widget.rowCount() * widget.columnCount() for widget in QApplication.allWidgets() if isinstance(widget, QTableWidget))
+
+
+class InstrumentationOverlay(QLabel):
+    """Debug overlay with the action timings, shown and hidden with Ctrl+Shift+D."""
+    def __init__(self, instrumentation, parent):
+        super().__init__(parent)
+        self.instrumentation = instrumentation
+        self.export_path = None
+        self.shown_calls = None
+        self.setStyleSheet("background-color: rgb(30, 30, 30); color: white; font-family: monospace; font-size: 11px; padding: 6px;")
+        # painting the overlay must not repaint (and measure) the window below it
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.timer = QTimer(self)
+        self.timer.setInterval(500)
+        self.timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def toggle(self):
+        if self.isVisible():
+            self.timer.stop()
+            self.hide()
+            return
+        self.shown_calls = None
+        self.refresh()
+        self.show()
+        self.raise_()
+        self.timer.start()
+
+    def refresh(self):
+        summary = self.instrumentation.summary()
+        calls = sum(row[1] for row in summary)
+        if calls == self.shown_calls:
+            return
+        self.shown_calls = calls
+        counter_names = " ".join(f"{name:>7}" for name in self.instrumentation.counters)
+        lines = [f"{'Action':<34}{'Calls':>6}{'Total ms':>10}{'Max ms':>9}"]
+        for name, count, total, longest in summary[:12]:
+            lines.append(f"{name:<34}{count:>6}{total * 1000:>10.1f}{longest * 1000:>9.1f}")
+        lines.append("")
+        lines.append(f"{'Last actions':<34}{'ms':>9} {counter_names}")
+        for name, started_at, duration, created, depth in self.instrumentation.recent(12):
+            created_text = " ".join(f"{count:>+7}" for count in created)
+            lines.append(f"{'  ' * depth + name:<34}{duration * 1000:>9.1f} {created_text}")
+        if self.export_path is not None:
+            lines.append("")
+            lines.append(f"Exported to {self.export_path}")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.raise_()
+
+
+class RosterDelegate(QStyledItemDelegate):
+    """Paints a roster row as the player name with a ✖ button and handles its clicks.
+
+    Rows are only painted while they are visible, so the roster costs the same
+    no matter how many players it holds.
+    """
+    BUTTON_SIZE = 20
+    ROW_HEIGHT = 34
+
+    def __init__(self, remove_callback, parent=None):
+        super().__init__(parent)
+        self.remove_callback = remove_callback
+
+    def button_rect(self, rect):
+        size = self.BUTTON_SIZE
+        return QRect(rect.right() - size - 8, rect.center().y() - size // 2 + 1, size, size)
+
+    def paint(self, painter, option, index):
+        text_option = QStyleOptionViewItem(option)
+        text_option.rect = option.rect.adjusted(8, 0, -self.BUTTON_SIZE - 16, 0)
+        super().paint(painter, text_option, index)
+
+        button = QStyleOptionButton()
+        button.rect = self.button_rect(option.rect)
+        button.text = "✖"
+        button.state = QStyle.StateFlag.State_Enabled
+        widget = option.widget
+        style = widget.style() if widget is not None else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, widget)
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        return QSize(size.width() + self.BUTTON_SIZE + 16, self.ROW_HEIGHT)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and self.button_rect(option.rect).contains(event.position().toPoint()):
+            self.remove_callback(index.data())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+class BracketView(QWidget):
+    """The knockout bracket: one column per round and one box per match.
+
+    Picking a winner or advancing a round only updates the boxes of the
+    matches that changed, see update_nodes().
+    """
+    WINNER_STYLE = "background-color: rgb(0, 255, 0); color: black;"
+    LOSER_STYLE = "background-color: rgb(255, 0, 0); color: black;"
+
+    def __init__(self, tournament, result_callback, parent=None):
+        super().__init__(parent)
+        self.tournament = tournament
+        self.result_callback = result_callback
+        # match node -> (team 1 button, team 2 button)
+        self.buttons = {}
+        bracket = tournament.bracket
+        grid = QGridLayout(self)
+        for round_number in range(1, bracket.rounds + 1):
+            column = round_number - 1
+            header = QLabel(bracket.stage_name(round_number))
+            header.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            grid.addWidget(header, 0, column)
+            # a match spans the rows of the two matches it follows on from
+            span = 1 << column
+            for index, node in enumerate(bracket.round_nodes(round_number)):
+                box = QFrame()
+                box.setFrameShape(QFrame.Shape.StyledPanel)
+                box_layout = QVBoxLayout(box)
+                box_layout.setContentsMargins(2, 2, 2, 2)
+                box_layout.setSpacing(0)
+                buttons = []
+                for side in (1, 2):
+                    button = QPushButton()
+                    button.setMinimumWidth(180)
+                    button.clicked.connect(lambda checked=False, node=node, side=side: self.result_callback(node, side))
+                    box_layout.addWidget(button)
+                    buttons.append(button)
+                self.buttons[node] = tuple(buttons)
+                grid.addWidget(box, 1 + index * span, column, span, 1, Qt.AlignmentFlag.AlignVCenter)
+        self.update_nodes(self.buttons)
+
+    def side_text(self, node, child):
+        bracket = self.tournament.bracket
+        team = bracket.slots[child]
+        if team is not None:
+            return self.tournament.team_names(bracket.teams[team])
+        return "Bye" if bracket.decided[child] else "TBD"
+
+    def update_nodes(self, nodes):
+        """Bring the boxes of the given match nodes up to date."""
+        bracket = self.tournament.bracket
+        rows = {node: row for row, node in enumerate(self.tournament.final_match_nodes)}
+        for node in nodes:
+            buttons = self.buttons.get(node)
+            if buttons is None:
+                continue
+            played = bracket.decided[node] and None not in bracket.entrants(node)
+            result = None
+            if played:
+                result = 1 if bracket.slots[node] == bracket.slots[2 * node] else 2
+            elif node in rows:
+                result = self.tournament.final_match_results.get(rows[node])
+            for side, button in enumerate(buttons, start=1):
+                button.setText(self.side_text(node, 2 * node + side - 1))
+                button.setEnabled(node in rows)
+                if result is None:
+                    button.setStyleSheet("")
+                else:
+                    button.setStyleSheet(self.WINNER_STYLE if side == result else self.LOSER_STYLE)
+
+
+class StartPage(QWidget):
+    def __init__(self, player_names=None):
+        super().__init__()
+        self.player_names = player_names if player_names else []
+        self.roster_model = RosterModel()
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle("Dart Tournament")
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        # Form layout for player names and max losses
+        form_layout = QFormLayout()
+        self.player_name_input = QLineEdit()
+        self.player_name_input.returnPressed.connect(self.add_player)  # Connect Enter key to add_player
+        self.max_losses = QSpinBox()
+        self.max_losses.setMinimum(1)
+        self.max_losses.setValue(3)
+        form_layout.addRow("Player Name:", self.player_name_input)
+        form_layout.addRow("Max Losses Before Elimination:", self.max_losses)
+        self.matchmaking = QComboBox()
+        self.matchmaking.addItem("Random", RANDOM)
+        self.matchmaking.addItem("Avoid Repeated Partners and Opponents", AVOID_REPEATS)
+        self.matchmaking.addItem("Balanced by Rating", BALANCED)
+        form_layout.addRow("Matchmaking:", self.matchmaking)
+        self.boards = QSpinBox()
+        self.boards.setMinimum(0)
+        self.boards.setSpecialValueText("Play whole rounds")
+        self.boards.setToolTip("With a number of boards, new matches start as soon as a board is free.")
+        form_layout.addRow("Boards:", self.boards)
+        self.knockout_size = QComboBox()
+        for size in KNOCKOUT_SIZES:
+            self.knockout_size.addItem(f"{size} players", size)
+        self.knockout_size.setCurrentIndex(KNOCKOUT_SIZES.index(8))
+        form_layout.addRow("Knockout Stage:", self.knockout_size)
+        layout.addLayout(form_layout)
+
+        # List view to display player names
+        self.player_list = QListView()
+        self.player_list.setModel(self.roster_model)
+        self.player_list.setItemDelegate(RosterDelegate(self.remove_player, self.player_list))
+        self.player_list.setUniformItemSizes(True)
+        layout.addWidget(self.player_list)
+
+        # Button to add player name to the list
+        add_player_button = QPushButton("Add Player")
+        add_player_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        add_player_button.clicked.connect(self.add_player)
+        layout.addWidget(add_player_button)
+
+        # Buttons to add many players at once from a file or the clipboard
+        import_layout = QHBoxLayout()
+        import_button = QPushButton("Import Players")
+        import_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        import_button.clicked.connect(self.import_players)
+        import_layout.addWidget(import_button)
+        paste_button = QPushButton("Paste Players")
+        paste_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        paste_button.clicked.connect(self.paste_players)
+        import_layout.addWidget(paste_button)
+        self.normalise_names = QCheckBox("Ignore case and extra spaces")
+        import_layout.addWidget(self.normalise_names)
+        layout.addLayout(import_layout)
+
+        # Button to start the tournament
+        start_button = QPushButton("Start Tournament")
+        start_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        start_button.clicked.connect(self.start_tournament)
+        layout.addWidget(start_button)
+
+        # Button to show the career leaderboard
+        leaderboard_button = QPushButton("Career Leaderboard")
+        leaderboard_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        leaderboard_button.clicked.connect(self.show_leaderboard)
+        layout.addWidget(leaderboard_button)
+
+        # Button to add 17 players for testing
+        #test_button = QPushButton("Add 17 Players for Testing")
+        #test_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        #test_button.clicked.connect(self.add_test_players)
+        #layout.addWidget(test_button)
+
+        self.setLayout(layout)
+
+        # Pre-enter player names if provided
+        self.add_players(self.player_names)
+
+    def add_player(self, player_name=None):
+        if player_name is None:
+            player_name = self.player_name_input.text().strip()
+        if player_name:
+            if player_name in self.roster_model:
+                QMessageBox.warning(self, "Duplicate Player", f"The player '{player_name}' is already in the list.")
+                return
+            self.roster_model.add_names([player_name])
+            self.player_name_input.clear()
+
+    def add_players(self, names, duplicates=None):
+        """Add many names in one batch, skipping duplicates, and return the number added."""
+        from roster_import import unique_names
+        names = unique_names(names, self.roster_model.names, self.normalise_names.isChecked(), duplicates)
+        return self.roster_model.add_names(names)
+
+    def import_players(self):
+        """Add the names in a CSV or text file, one player per line."""
+        import csv
+        from roster_import import read_file
+        path, _ = QFileDialog.getOpenFileName(self, "Import Players", "", "Player lists (*.csv *.txt);;All files (*)")
+        if path:
+            try:
+                self.report_import(read_file(path))
+            except (OSError, UnicodeDecodeError, csv.Error) as error:
+                QMessageBox.warning(self, "Import Failed", f"The players could not be imported: {error}")
+
+    def paste_players(self):
+        """Add the names in the clipboard, one player per line."""
+        from roster_import import read_text
+        self.report_import(read_text(QApplication.clipboard().text()))
+
+    def report_import(self, names):
+        duplicates = []
+        added = self.add_players(names, duplicates)
+        message = f"Added {added} players."
+        if duplicates:
+            message += f" Skipped {len(duplicates)} duplicates."
+        QMessageBox.information(self, "Import Players", message)
+
+    def remove_player(self, player_name):
+        self.roster_model.remove_name(player_name)
+
+    def start_tournament(self):
+        player_names = list(self.roster_model.names)
+        from player import Player
+        max_losses = self.max_losses.value()
+        knockout_size = self.checked_knockout_size(len(player_names))
+        if knockout_size is None:
+            return
+        players = [Player(name) for name in player_names]
+        self.switch_to_matchmaking(players, max_losses, self.matchmaking.currentData(), self.boards.value(), knockout_size)
+
+    def checked_knockout_size(self, player_count):
+        """The chosen knockout size, or None after a warning when there are too few players for it."""
+        knockout_size = self.knockout_size.currentData()
+        if knockout_size >= player_count:
+            QMessageBox.warning(self, "Too Few Players", f"A knockout stage of {knockout_size} players needs more than {knockout_size} players in the tournament.")
+            return None
+        return knockout_size
+
+    def show_leaderboard(self):
+        LeaderboardDialog(self).exec()
+
+    def add_test_players(self):
+        from player import Player
+        max_losses = self.max_losses.value()
+        knockout_size = self.checked_knockout_size(19)
+        if knockout_size is None:
+            return
+        players = [Player(f"Player{i + 1}") for i in range(19)]
+        self.switch_to_matchmaking(players, max_losses, self.matchmaking.currentData(), knockout_size=knockout_size)
+
+    def switch_to_matchmaking(self, players, max_losses, matchmaking=RANDOM, boards=0, knockout_size=8):
+        from board_scheduler import BoardScheduler
+        from journal import Journal
+        from tournament import TournamentEngine
+        tournament = TournamentEngine(players, max_losses, matchmaking, knockout_size)
+        if boards:
+            BoardScheduler(tournament, boards)
+        journal = Journal()
+        journal.start(tournament)
+        self.matchmaking_app = Application(tournament, journal)
+        self.matchmaking_app.load_career_ratings()
+        self.matchmaking_app.show()
+        self.close()
+
+    def offer_recovery(self):
+        """Offer to resume a tournament that was not finished, e.g. after a crash."""
+        from journal import Journal
+        journal = Journal()
+        if not journal.has_unfinished_tournament():
+            return
+        reply = QMessageBox.question(self, 'Resume Tournament', 'An unfinished tournament was found. Do you want to resume it?', QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.No:
+            journal.archive()
+            return
+        try:
+            tournament = journal.recover()
+        except (OSError, ValueError, KeyError) as error:
+            QMessageBox.warning(self, "Resume Failed", f"The tournament could not be resumed: {error}")
+            journal.archive()
+            return
+        self.matchmaking_app = Application(tournament, journal)
+        self.matchmaking_app.show()
+        self.close()
+
+class Application(QWidget):
+    def __init__(self, tournament, journal=None):
+        super().__init__()
+        self.tournament = tournament
+        self.journal = journal
+        self.api_server = None
+        self.tournament.add_listener(self.on_tournament_event)
+        player_columns = RATED_PLAYER_COLUMNS if self.tournament.matchmaking == BALANCED else PLAYER_COLUMNS
+        self.player_model = PlayerTableModel(player_columns, self.tournament.players)
+        self.eliminated_model = PlayerTableModel(ELIMINATED_COLUMNS, self.tournament.eliminated_players)
+        self.board_scheduler = self.tournament.board_scheduler
+        if self.board_scheduler is not None:
+            self.unused_model = PlayerTableModel(WAITING_COLUMNS, self.board_scheduler.free_players())
+        else:
+            self.unused_model = PlayerTableModel(UNUSED_COLUMNS, self.tournament.unused_players)
+
+        # All changes from one user action are refreshed once on the next event-loop turn
+        self.refresh_scheduler = RefreshScheduler(lambda flush: QTimer.singleShot(0, flush))
+        self.refresh_scheduler.register("players", self.refresh_player_rows)
+        self.refresh_scheduler.register("eliminated", self.refresh_eliminated_rows)
+        self.refresh_scheduler.register("unused", lambda players: self.update_unused_table())
+        self.refresh_scheduler.register("matches", lambda players: self.update_match_table())
+        self.refresh_scheduler.register("bracket", self.refresh_bracket)
+        self.refresh_scheduler.register("layout", lambda players: self.update_ui(), supersedes=("matches", "bracket"))
+        self.refresh_scheduler.register("history", lambda players: self.update_history_buttons())
+        self.undo_button = None
+        self.redo_button = None
+        QShortcut(QKeySequence.StandardKey.Undo, self, self.undo)
+        QShortcut(QKeySequence.StandardKey.Redo, self, self.redo)
+        self.instrumentation = instrumentation
+        if self.instrumentation is not None:
+            self.instrument()
+        self.init_ui()
+
+    def instrument(self):
+        """Measure the main user actions and the refreshes they cause."""
+        self.instrumentation.instrument(self, INSTRUMENTED_ACTIONS)
+        refreshers = self.refresh_scheduler.refreshers
+        for flag, refresher in refreshers.items():
+            refreshers[flag] = self.instrumentation.wrap(f"refresh {flag}", refresher)
+        self.instrumentation_overlay = InstrumentationOverlay(self.instrumentation, self)
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.instrumentation_overlay.toggle)
+
+    def export_instrumentation(self):
+        try:
+            self.instrumentation_overlay.export_path = self.instrumentation.export()
+        except OSError as error:
+            QMessageBox.warning(self, "Instrumentation", f"The timings could not be exported: {error}")
+
+    def init_ui(self):
+        self.setWindowTitle("Dart Tournament")
+        self.main_layout = QHBoxLayout()
+        self.setLayout(self.main_layout)
+        self.status_label = QLabel("Status: Waiting for matches to be generated.")
+        self.main_layout.addWidget(self.status_label)
+        self.update_ui()
+
+    def clear_layout(self, layout):
+        if layout is self.main_layout:
+            # the history buttons of the page are deleted with it
+            self.undo_button = None
+            self.redo_button = None
+        if layout is not None:
+            while layout.count():
+                child = layout.takeAt(0)
+                if child.widget() is not None:
+                    child.widget().deleteLater()
+                elif child.layout() is not None:
+                    self.clear_layout(child.layout())
+
+    def update_ui(self):
+        self.clear_layout(self.main_layout)
+        stage = self.tournament.stage
+        if stage == FINISHED:
+            self.end_tournament()
+        elif stage == KNOCKOUT:
+            self.show_final_matches()
+        elif stage == FINAL_PLAYERS:
+            self.show_final_players()
+        else:
+            self.show_matchmaking_ui()
+
+    def on_tournament_event(self, event, *args):
+        """Mark the widgets affected by a change in the tournament for refreshing."""
+        mark_dirty = self.refresh_scheduler.mark_dirty
+        if event == "matches_generated":
+            mark_dirty("matches")
+            mark_dirty("unused")
+            mark_dirty("players", self.tournament.unused_players)
+        elif event == "match_result_set":
+            self.color_match_result(self.match_table, *args)
+        elif event == "results_submitted":
+            mark_dirty("players", args[0])
+            mark_dirty("matches")
+            mark_dirty("unused")
+        elif event == "player_eliminated":
+            mark_dirty("players", args)
+            mark_dirty("eliminated", args)
+            if self.board_scheduler is not None:
+                mark_dirty("unused")
+        elif event == "player_updated":
+            mark_dirty("players", args)
+        elif event == "final_result_set":
+            mark_dirty("bracket", [self.tournament.final_match_nodes[args[0]]])
+        elif event == "final_results_submitted":
+            # the finished matches and the matches their winners move on to
+            nodes = self.tournament.final_match_nodes
+            mark_dirty("bracket", nodes + [node // 2 for node in nodes if node > 1])
+        elif event == "board_matches_started":
+            mark_dirty("matches")
+            mark_dirty("unused")
+        elif event == "board_result_set":
+            mark_dirty("matches")
+        elif event == "board_results_submitted":
+            mark_dirty("players", args[0])
+            mark_dirty("matches")
+            mark_dirty("unused")
+        elif event == "players_sat_out":
+            mark_dirty("players", args[0])
+        elif event == "ratings_loaded":
+            mark_dirty("players", self.tournament.registry.players(args[0]))
+        elif event == "players_revived":
+            mark_dirty("players", args[0])
+            mark_dirty("eliminated", args[0])
+            mark_dirty("layout")
+        elif event == "undone":
+            changed, revived = args
+            mark_dirty("players", changed + revived)
+            mark_dirty("eliminated", revived)
+            mark_dirty("unused")
+            mark_dirty("layout")
+        elif event == "knockout_advanced":
+            mark_dirty("bracket", self.tournament.final_match_nodes)
+            if self.instrumentation is not None:
+                self.instrumentation.mark(event)
+        elif event == "stage_changed":
+            mark_dirty("layout")
+            if self.instrumentation is not None:
+                self.instrumentation.mark(f"{event} {args[0]}")
+            if args[0] == FINISHED:
+                self.save_career_stats()
+                if self.instrumentation is not None:
+                    # after the final screen has been drawn, so that it is included
+                    QTimer.singleShot(0, self.export_instrumentation)
+        mark_dirty("history")
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+
+        # Skip painting when the dartboard image is missing
+        if dartboard_background.source() is None:
+            return
+
+        # Create a painter to draw the dartboard
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setOpacity(1.0)  # Make it semi-transparent
+        dartboard_background.draw(painter, self.rect())  # Fill the entire widget
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        dartboard_background.invalidate()
+
+    def show_matchmaking_ui(self):
+        # Player Tables Layout (Left Side)
+        player_tables_layout = QVBoxLayout()
+        player_tables_layout.setContentsMargins(0, 0, 0, 0)
+        player_tables_layout.setSpacing(0)
+
+        # Player Table
+        self.player_table = QTableView()
+        self.player_table.setModel(self.player_model)
+        self.player_table.setColumnWidth(0, 200)  # Adjust column width for Player Name
+        self.player_table.setColumnWidth(1, 80)   # Adjust column width for Losses
+        self.player_table.setColumnWidth(2, 80)   # Adjust column width for Wins
+        self.player_table.setColumnWidth(3, 140)  # Adjust column width for Times Sat Out
+        if self.player_model.columnCount() > 4:
+            self.player_table.setColumnWidth(4, 80)  # Adjust column width for Rating
+        self.update_player_table()
+        player_tables_layout.addWidget(self.player_table)
+
+        # Set alternating row colors
+        self.player_table.setAlternatingRowColors(True)
+        palette = self.player_table.palette()
+        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(210, 210, 210))  # Light grey color
+        self.player_table.setPalette(palette)
+
+        # Set header color to light blue
+        self.player_table.horizontalHeader().setStyleSheet("QHeaderView::section { background-color: rgb(104, 205, 254); }")
+
+        self.main_layout.addLayout(player_tables_layout, stretch=1)
+
+        # Matches and Other Tables Layout (Right Side)
+        right_side_layout = QVBoxLayout()
+        right_side_layout.setContentsMargins(0, 0, 0, 0)
+        right_side_layout.setSpacing(0)
+
+        
+
+        # Matches Table
+        self.match_table = QTableWidget(0, 2)
+        self.match_table.setHorizontalHeaderLabels(["Team 1", "Team 2"])
+        self.match_table.setColumnWidth(0, 300)  # Adjust column width for Team 1
+        self.match_table.setColumnWidth(1, 300)  # Adjust column width for Team 2
+        self.match_table.cellClicked.connect(self.handle_cell_click)
+        right_side_layout.addWidget(self.match_table, stretch=2)
+
+        # Set alternating row colors
+        self.match_table.setAlternatingRowColors(True)
+        palette = self.match_table.palette()
+        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(210, 210, 210))  # Light grey color
+        self.match_table.setPalette(palette)
+
+        # Set header color to light blue
+        self.match_table.horizontalHeader().setStyleSheet("QHeaderView::section { background-color: rgb(104, 205, 254); }")
+
+        # Players that Sit Out Table
+        self.unused_table = QTableView()
+        self.unused_table.setModel(self.unused_model)
+        self.unused_table.setColumnWidth(0, 200)  # Adjust column width for Players that Sit Out
+        right_side_layout.addWidget(self.unused_table, stretch=1)
+
+        # Set alternating row colors
+        self.unused_table.setAlternatingRowColors(True)
+        palette = self.unused_table.palette()
+        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(210, 210, 210))  # Light grey color
+        self.unused_table.setPalette(palette)
+
+        # Set header color to light blue
+        self.unused_table.horizontalHeader().setStyleSheet("QHeaderView::section { background-color: rgb(104, 205, 254); }")
+
+        # Eliminated Players Table
+        self.eliminated_table = QTableView()
+        self.eliminated_table.setModel(self.eliminated_model)
+        self.eliminated_table.setColumnWidth(0, 200)  # Adjust column width for Eliminated Players
+        right_side_layout.addWidget(self.eliminated_table, stretch=3)
+
+        # Set alternating row colors
+        self.eliminated_table.setAlternatingRowColors(True)
+        palette = self.eliminated_table.palette()
+        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(210, 210, 210))  # Light grey color
+        self.eliminated_table.setPalette(palette)
+
+        # Set header color to light blue
+        self.eliminated_table.horizontalHeader().setStyleSheet("QHeaderView::section { background-color: rgb(104, 205, 254); }")
+
+        self.main_layout.addLayout(right_side_layout, stretch=2)
+
+        # Buttons Layout
+        buttons_layout = QVBoxLayout()
+        buttons_layout.setContentsMargins(0, 0, 0, 0)
+        buttons_layout.setSpacing(0)
+
+        # Generate Matches Button
+        self.generate_matches_button = QPushButton("Generate Matches")
+        self.generate_matches_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        self.generate_matches_button.clicked.connect(self.generate_gruppeplay_matches)
+        buttons_layout.addWidget(self.generate_matches_button)
+
+        # Submit results button
+        self.submit_results_button = QPushButton("Submit Results")
+        self.submit_results_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        self.submit_results_button.setEnabled(False)
+        self.submit_results_button.clicked.connect(self.handle_match_results)
+        buttons_layout.addWidget(self.submit_results_button)
+
+        # Phone Result Entry Button
+        phone_entry_button = QPushButton("Phone Result Entry")
+        phone_entry_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        phone_entry_button.clicked.connect(self.start_api_server)
+        buttons_layout.addWidget(phone_entry_button)
+
+        # Spectator Scoreboard Button
+        scoreboard_button = QPushButton("Spectator Scoreboard")
+        scoreboard_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        scoreboard_button.clicked.connect(self.show_scoreboard_address)
+        buttons_layout.addWidget(scoreboard_button)
+
+        # Edit Losses Button
+        edit_losses_button = QPushButton("Edit Losses")
+        edit_losses_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        edit_losses_button.clicked.connect(self.edit_losses_for_players)
+        buttons_layout.addWidget(edit_losses_button)
+
+        # Eliminate Player Button
+        eliminate_player_button = QPushButton("Eliminate Player")
+        eliminate_player_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        eliminate_player_button.clicked.connect(self.eliminate_a_selected_player)
+        buttons_layout.addWidget(eliminate_player_button)
+
+        # Undo and Redo Buttons
+        self.add_history_buttons(buttons_layout)
+
+        # Restart Tournament Button
+        reset_tournament_button = QPushButton("Restart Tournament")
+        reset_tournament_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        reset_tournament_button.clicked.connect(self.restart_tournament)
+        buttons_layout.addWidget(reset_tournament_button)
+
+        # End Tournament Button
+        end_tournament_button = QPushButton("End Tournament")
+        end_tournament_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        end_tournament_button.clicked.connect(self.reset_tournament)
+        buttons_layout.addWidget(end_tournament_button)
+
+        self.main_layout.addLayout(buttons_layout)
+
+        self.setLayout(self.main_layout)
+
+        # Show a round that is already in progress, e.g. after resuming a tournament
+        self.update_match_table()
+        self.update_unused_table()
+        results = self.board_scheduler.results if self.board_scheduler is not None else self.tournament.match_results
+        for row, result in results.items():
+            self.color_match_result(self.match_table, row, result)
+
+    def show_final_players(self):
+        final_layout = QVBoxLayout()
+        final_layout.setContentsMargins(0, 0, 0, 0)
+        final_layout.setSpacing(0)
+
+        # Remaining Players Table
+        players = self.tournament.players
+        remaining_players_table = QTableWidget(len(players), 1)
+        remaining_players_table.setHorizontalHeaderLabels(["Remaining Players"])
+        remaining_players_table.setColumnWidth(0, 200)  # Adjust column width for Remaining Players
+        for row, player in enumerate(players):
+            remaining_players_table.setItem(row, 0, QTableWidgetItem(player.name))
+
+        # Set alternating row colors
+        remaining_players_table.setAlternatingRowColors(True)
+        palette = remaining_players_table.palette()
+        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(210, 210, 210))  # Light grey color
+        remaining_players_table.setPalette(palette)
+
+        # Set header color to light blue
+        remaining_players_table.horizontalHeader().setStyleSheet("QHeaderView::section { background-color: rgb(104, 205, 254); }")
+
+        final_layout.addWidget(remaining_players_table)
+
+        if self.tournament.extra_game_player_count() > 0:
+            # Last Eliminated Players Table
+            candidates = self.tournament.extra_game_candidates()
+            last_eliminated_table = QTableWidget(len(candidates), 1)
+            last_eliminated_table.setHorizontalHeaderLabels(["Last Eliminated Players"])
+            last_eliminated_table.setColumnWidth(0, 220)  # Adjust column width for Last Eliminated Players
+            for row, player in enumerate(candidates):
+                last_eliminated_table.setItem(row, 0, QTableWidgetItem(player.name))
+            
+            # Set alternating row colors
+            last_eliminated_table.setAlternatingRowColors(True)
+            palette = last_eliminated_table.palette()
+            palette.setColor(QPalette.ColorRole.AlternateBase, QColor(210, 210, 210))  # Light grey color
+            last_eliminated_table.setPalette(palette)
+
+            # Set header color to light blue
+            last_eliminated_table.horizontalHeader().setStyleSheet("QHeaderView::section { background-color: rgb(104, 205, 254); }")
+            
+            final_layout.addWidget(last_eliminated_table)
+
+            # Add a button to start the extra game
+            start_extra_game_button = QPushButton("Start Extra Game")
+            start_extra_game_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+            start_extra_game_button.clicked.connect(self.handle_missing_players)
+            final_layout.addWidget(start_extra_game_button)
+
+        if self.tournament.can_start_knockout_with_byes():
+            # Or give the best seeds a bye instead of playing the extra game
+            byes_button = QPushButton("Proceed with Byes")
+            byes_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+            byes_button.clicked.connect(self.seed_knockout_players)
+            final_layout.addWidget(byes_button)
+
+        if self.tournament.missing_player_count() == 0:
+            # Add a button to proceed to the final matches
+            proceed_button = QPushButton("Proceed to Final Matches")
+            proceed_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+            proceed_button.clicked.connect(self.seed_knockout_players)
+            final_layout.addWidget(proceed_button)
+
+        self.add_history_buttons(final_layout)
+        self.main_layout.addLayout(final_layout)
+
+    def update_player_table(self):
+        self.player_model.sync(self.tournament.players)
+
+    def update_eliminated_table(self):
+        self.eliminated_model.sync(self.tournament.eliminated_players)
+
+    def refresh_player_rows(self, players):
+        """Bring the rows of the changed players up to date in the player table."""
+        registry = self.tournament.registry
+        for player in players:
+            if not registry.is_active(player):
+                self.player_model.remove_player(player)
+        self.player_model.append_players([player for player in players if registry.is_active(player)])
+        self.player_model.refresh_players(players)
+
+    def refresh_eliminated_rows(self, players):
+        """Bring the rows of the changed players up to date in the eliminated table."""
+        registry = self.tournament.registry
+        for player in players:
+            if not registry.is_eliminated(player):
+                self.eliminated_model.remove_player(player)
+        self.eliminated_model.append_players([player for player in players if registry.is_eliminated(player)])
+
+    def update_match_table(self):
+        if self.tournament.stage != GROUP_STAGE:
+            return
+        if self.board_scheduler is not None:
+            self.update_board_table()
+            return
+        matches = self.tournament.matches
+        self.generate_matches_button.setEnabled(not matches)
+        self.submit_results_button.setEnabled(bool(matches))
+        self.match_table.setRowCount(len(matches))
+        for row, match in enumerate(matches):
+            team_1_names = self.tournament.team_names(match.team_1)
+            team_2_names = self.tournament.team_names(match.team_2)
+            self.match_table.setItem(row, 0, QTableWidgetItem(team_1_names))
+            self.match_table.setItem(row, 1, QTableWidgetItem(team_2_names))
+
+        for row in range(self.match_table.rowCount()):
+            for column in range(self.match_table.columnCount()):
+                item = self.match_table.item(row, column)
+                if item is not None:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+
+    def update_board_table(self):
+        """Show one row per board, with the match that is played on it."""
+        scheduler = self.board_scheduler
+        self.generate_matches_button.setEnabled(scheduler.can_start())
+        self.submit_results_button.setEnabled(bool(scheduler.results))
+        self.match_table.setRowCount(len(scheduler.boards))
+        self.match_table.setVerticalHeaderLabels([f"Board {board + 1}" for board in range(len(scheduler.boards))])
+        for row, match in enumerate(scheduler.boards):
+            for column in range(2):
+                text = "" if match is None else self.tournament.team_names(match.team_1 if column == 0 else match.team_2)
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                self.match_table.setItem(row, column, item)
+            if row in scheduler.results:
+                self.color_match_result(self.match_table, row, scheduler.results[row])
+
+    def update_unused_table(self):
+        if self.board_scheduler is not None:
+            self.unused_model.sync(self.board_scheduler.free_players())
+            return
+        self.unused_model.set_players(self.tournament.unused_players)
+
+    def set_table_items_transparent(self, table):
+        pass  # Remove the transparency setting logic
+
+    def generate_gruppeplay_matches(self):
+        """Generate random 2v2 matches."""
+        if self.board_scheduler is not None:
+            self.board_scheduler.fill_boards()
+            return
+        self.tournament.generate_gruppeplay_matches()
+
+    def handle_cell_click(self, row, column):
+        if column == 0:
+            self.set_match_result(row, 1)
+        elif column == 1:
+            self.set_match_result(row, 2)
+
+    def set_match_result(self, row, result):
+        if self.board_scheduler is not None:
+            if self.board_scheduler.boards[row] is not None:
+                self.board_scheduler.set_result(row, result)
+            return
+        self.tournament.set_match_result(row, result)
+
+    def color_match_result(self, table, row, result):
+        """Color the winning team green and the losing team red."""
+        for col in range(2):
+            item = table.item(row, col)
+            if item is None:
+                continue
+            if col == result - 1:
+                item.setBackground(Qt.GlobalColor.green)
+            else:
+                item.setBackground(Qt.GlobalColor.red)
+
+    def handle_match_results(self):
+        """Handle submission of match results."""
+        if self.board_scheduler is not None:
+            # finished boards are submitted while the other boards keep playing
+            if self.board_scheduler.results:
+                self.board_scheduler.submit_results()
+            return
+        if not self.tournament.all_results_entered():
+            QMessageBox.warning(self, "Incomplete Results", "Please select a winner for all matches.")
+            return
+
+        self.tournament.handle_match_results()
+
+    def check_tournament_end(self):
+        """Check if the tournament should end and handle the extra game if needed."""
+        self.tournament.check_tournament_end()
+
+    def handle_missing_players(self):
+        """Handle the extra game to fill the remaining spots."""
+        self.clear_layout(self.main_layout)
+    
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        layout.addWidget(QLabel(f"Select {self.tournament.extra_game_player_count()} players from the last eliminated players to fill the spots:"))
+    
+        self.checkboxes = []
+        for player in self.tournament.extra_game_candidates():
+            checkbox = QCheckBox(player.name)
+            self.checkboxes.append((checkbox, player))
+            layout.addWidget(checkbox)
+
+        submit_button = QPushButton("Submit Selection")
+        submit_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        submit_button.clicked.connect(self.check_selection_and_add_players)
+        layout.addWidget(submit_button)
+
+        self.main_layout.addLayout(layout)
+
+    def check_selection_and_add_players(self):
+        selected_players = [player for checkbox, player in self.checkboxes if checkbox.isChecked()]
+        required_selection_count = self.tournament.extra_game_player_count()
+
+        if len(selected_players) != required_selection_count:
+            QMessageBox.warning(self, "Selection Error", f"Please select exactly {required_selection_count} players.")
+        else:
+            self.add_selected_players()
+
+    def add_selected_players(self):
+        """Add the selected players back to the tournament."""
+        selected_players = [player for checkbox, player in self.checkboxes if checkbox.isChecked()]
+        self.tournament.add_selected_players(selected_players)
+
+    def seed_knockout_players(self):
+        """Seed the final players by their group-stage standing."""
+        self.tournament.seed_knockout_players()
+        self.clear_layout(self.main_layout)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        layout.addWidget(QLabel(f"The final {len(self.tournament.players)} players have been seeded:"))
+        for seed, player in enumerate(self.tournament.players, start=1):
+            layout.addWidget(QLabel(f"{seed}. {player.name}"))
+        seed_button = QPushButton("Proceed to Final Matches")
+        seed_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        seed_button.clicked.connect(self.tournament.start_knockout)
+        layout.addWidget(seed_button)
+        self.main_layout.addLayout(layout)
+
+    def show_final_matches(self):
+        """Display the knockout bracket with the matches of the current stage."""
+        stage_name = self.tournament.knockout_stage_name()
+
+        # Clear the layout and display the bracket
+        self.clear_layout(self.main_layout)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        self.knockout_label = QLabel(f"Knockout Stage - {stage_name}")
+        self.knockout_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.knockout_label)
+
+        self.bracket_view = BracketView(self.tournament, self.handle_bracket_click)
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(self.bracket_view)
+        layout.addWidget(scroll_area)
+
+        # Buttons
+        submit_results_button = QPushButton("Submit Final Results")
+        submit_results_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        submit_results_button.clicked.connect(self.handle_final_results)
+        layout.addWidget(submit_results_button)
+        self.add_history_buttons(layout)
+
+        self.main_layout.addLayout(layout)
+
+    def refresh_bracket(self, nodes):
+        """Bring the changed matches of the bracket up to date."""
+        if self.tournament.stage != KNOCKOUT:
+            return
+        self.knockout_label.setText(f"Knockout Stage - {self.tournament.knockout_stage_name()}")
+        self.bracket_view.update_nodes(nodes)
+
+    def handle_final_results(self):
+        """Handle the results of the final matches."""
+        # Check if all matches have a selected winner
+        if len(self.tournament.final_match_results) != len(self.tournament.final_matches):
+            QMessageBox.warning(self, "Incomplete Results", "Please select a winner for all matches.")
+            return
+
+        self.tournament.handle_final_results()
+
+    def set_final_match_result(self, row, result):
+        """Set the result of the final match."""
+        self.tournament.set_final_match_result(row, result)
+
+    def handle_bracket_click(self, node, side):
+        """Select the winning team of a match of the current stage."""
+        if node in self.tournament.final_match_nodes:
+            self.set_final_match_result(self.tournament.final_match_nodes.index(node), side)
+
+    def add_history_buttons(self, layout):
+        """Add the Undo and Redo buttons to a layout of the current page."""
+        history_layout = QHBoxLayout()
+        history_layout.setContentsMargins(0, 0, 0, 0)
+        history_layout.setSpacing(0)
+        self.undo_button = QPushButton("Undo")
+        self.undo_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        self.undo_button.clicked.connect(self.undo)
+        history_layout.addWidget(self.undo_button)
+        self.redo_button = QPushButton("Redo")
+        self.redo_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        self.redo_button.clicked.connect(self.redo)
+        history_layout.addWidget(self.redo_button)
+        layout.addLayout(history_layout)
+        self.update_history_buttons()
+
+    def update_history_buttons(self):
+        history = self.tournament.history
+        if self.undo_button is not None:
+            self.undo_button.setEnabled(history.can_undo())
+            self.redo_button.setEnabled(history.can_redo())
+
+    def undo(self):
+        """Undo the last round submission, elimination or loss edit."""
+        if self.tournament.history.can_undo():
+            self.tournament.undo()
+
+    def redo(self):
+        """Redo the last undone change."""
+        if self.tournament.history.can_redo():
+            self.tournament.redo()
+
+    def edit_losses_for_players(self):
+        """Edit the losses for selected players."""
+        headline = QLabel("Select the players to remove 1 loss from:")
+        layout = QVBoxLayout()
+        layout.addWidget(headline)
+
+        dialog = PlayerSelectionDialog(self.tournament.players, "Select Players to Remove a Loss From", self)
+        if not dialog.exec():
+            return
+        self.remove_losses(self.tournament.registry.players(dialog.get_selected_player_ids()))
+
+    def remove_losses(self, players):
+        self.tournament.remove_losses(players)
+
+    def eliminate_a_selected_player(self):
+        """Eliminate a selected player from the tournament."""
+        headline = QLabel("Select the player to eliminate:")
+        layout = QVBoxLayout()
+        layout.addWidget(headline)
+
+        dialog = PlayerSelectionDialog(self.tournament.players, "Select Players to Eliminate", self)
+        if not dialog.exec():
+            return
+        self.eliminate_players(self.tournament.registry.players(dialog.get_selected_player_ids()))
+
+    def eliminate_players(self, players):
+        for player in players:
+            self.tournament.eliminate_player(player)
+
+    def restart_tournament(self):
+        """Restart the tournament with the same players."""
+        reply = QMessageBox.question(self, 'Restart Tournament', 'Are you sure you want to restart the tournament?', QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.No:
+            return
+
+        player_names = self.tournament.all_player_names()
+        player_names.sort()
+
+        # Clear all player data
+        self.close_journal()
+        self.stop_api_server()
+        self.tournament.clear()
+
+        # Close the current window and show the start page with pre-entered player names
+        self.close()
+        self.start_page = StartPage(player_names)
+        self.start_page.show()
+
+    def reset_tournament(self):
+        """Reset the tournament from scratch and delete all player data."""
+        reply = QMessageBox.question(self, 'End The Tournament', 'Are you sure you want to restart the tournament?', QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.No:
+            return
+
+        # Clear all player data
+        self.close_journal()
+        self.stop_api_server()
+        self.tournament.clear()
+
+        # Close the current window and show the start page
+        self.close()
+        self.start_page = StartPage()
+        self.start_page.show()
+
+    def start_api_server(self):
+        """Let phones at the boards list the matches and enter winners over the local network."""
+        if self.ensure_api_server():
+            QMessageBox.information(self, "Phone Result Entry", f"Open http://{local_address()}:{self.api_server.port}/ on a phone in the same network.")
+
+    def show_scoreboard_address(self):
+        """Let spectator screens follow the tournament over the local network."""
+        if self.ensure_api_server():
+            QMessageBox.information(self, "Spectator Scoreboard", f"Open http://{local_address()}:{self.api_server.port}/scoreboard on the spectator screens.")
+
+    def ensure_api_server(self):
+        if self.api_server is not None:
+            return True
+        from api_server import ApiServer, TournamentService, DEFAULT_PORT
+        from scoreboard import ScoreboardFeed
+        schedule = lambda flush: QTimer.singleShot(0, flush)
+        service = TournamentService(self.tournament, schedule)
+        scoreboard = ScoreboardFeed(self.tournament, schedule)
+        self.main_thread_invoker = MainThreadInvoker(self)
+        server = ApiServer(service, port=DEFAULT_PORT, invoke=self.main_thread_invoker.invoke, scoreboard=scoreboard)
+        try:
+            server.start()
+        except OSError as error:
+            service.close()
+            scoreboard.close()
+            QMessageBox.warning(self, "Local Server", f"The server could not be started: {error}")
+            return False
+        self.api_server = server
+        return True
+
+    def stop_api_server(self):
+        if self.api_server is not None:
+            self.api_server.stop()
+            self.api_server.service.close()
+            self.api_server.scoreboard.close()
+            self.api_server = None
+
+    def export_results(self):
+        """Export the finished tournament from its archived journal."""
+        from export import export, journal_rows
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Results", "tournament-results.html",
+            "HTML report (*.html);;JSON Lines (*.jsonl);;CSV files, one per section (*.csv)",
+        )
+        if not path:
+            return
+        try:
+            paths = export(journal_rows([self.journal.archive_path]), path)
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, "Export Failed", f"The results could not be exported: {error}")
+            return
+        QMessageBox.information(self, "Export Results", "Exported to:\n" + "\n".join(paths))
+
+    def close_journal(self):
+        """Archive the journal of a tournament that is abandoned or over."""
+        if self.journal is not None:
+            self.journal.archive()
+            self.journal = None
+
+    def save_career_stats(self):
+        """Store the finished tournament in the career statistics without blocking the UI."""
+        FutureCallback(get_career_stats().save_tournament(self.tournament), self.career_stats_saved, self)
+
+    def load_career_ratings(self):
+        """Carry the players' ratings over from earlier events without blocking the UI."""
+        names = [player.name for player in self.tournament.players]
+        FutureCallback(get_career_stats().ratings(names), self.career_ratings_loaded, self)
+
+    def career_ratings_loaded(self, future):
+        if future.exception() is not None:
+            # the players simply start with the default rating
+            return
+        registry = self.tournament.registry
+        ratings = {registry.find(name).id: rating for name, rating in future.result().items() if registry.find(name) is not None}
+        if ratings:
+            self.tournament.load_ratings(ratings)
+
+    def career_stats_saved(self, future):
+        error = future.exception()
+        if error is not None:
+            QMessageBox.warning(self, "Career Statistics", f"The results could not be saved: {error}")
+
+    def end_tournament(self):
+        """Display the winner and the stats of every player."""
+        self.clear_layout(self.main_layout)
+        layout = QVBoxLayout()
+
+        winners = self.tournament.winners
+        if len(winners) == 2:
+            winner_1 = winners[0] 
+            winner_2 = winners[1] 
+            layout.addWidget(QLabel(f"The tournament winner is: {winner_1.name} And {winner_2.name}"))
+        else:
+            layout.addWidget(QLabel("The tournament ended with no winner."))
+
+        # Table with the player stats
+        players = self.tournament.players
+        player_table = QTableWidget(len(players), 4)
+        player_table.setHorizontalHeaderLabels(["Player Name", "Losses", "Wins", "Times Sat Out"])
+        player_table.setColumnWidth(0, 200)
+        player_table.setColumnWidth(1, 80)
+        player_table.setColumnWidth(2, 80)
+        player_table.setColumnWidth(3, 140)
+        for row, player in enumerate(players):
+            player_table.setItem(row, 0, QTableWidgetItem(player.name))
+            player_table.setItem(row, 1, QTableWidgetItem(str(player.stats.losses)))
+            player_table.setItem(row, 2, QTableWidgetItem(str(player.stats.wins)))
+            player_table.setItem(row, 3, QTableWidgetItem(str(player.stats.times_sat_out)))
+        
+        # Set alternating row colors
+        player_table.setAlternatingRowColors(True)
+        palette = player_table.palette()
+        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(210, 210, 210))  # Light grey color
+        player_table.setPalette(palette)
+
+        # Set header color to light blue
+        player_table.horizontalHeader().setStyleSheet("QHeaderView::section { background-color: rgb(104, 205, 254); }")
+
+
+        layout.addWidget(player_table)
+
+        export_button = QPushButton("Export Results")
+        export_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        export_button.clicked.connect(self.export_results)
+        export_button.setEnabled(self.journal is not None and self.journal.archive_path is not None)
+        layout.addWidget(export_button)
+
+        # Got to many errors with the restart button so I commented it out (Players already in the table)
+        restart_button = QPushButton("Restart Tournament")
+        restart_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        restart_button.clicked.connect(self.restart_tournament)
+        layout.addWidget(restart_button)
+
+        reset_button = QPushButton("Go Back to Start Page")
+        reset_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        reset_button.clicked.connect(self.reset_tournament)
+        layout.addWidget(reset_button)
+
+        leaderboard_button = QPushButton("Career Leaderboard")
+        leaderboard_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        leaderboard_button.clicked.connect(lambda: LeaderboardDialog(self).exec())
+        layout.addWidget(leaderboard_button)
+
+        exit_button = QPushButton("Exit")
+        exit_button.setStyleSheet("background-color: rgb(104, 205, 254); color: black;")
+        exit_button.clicked.connect(self.exit_tournament)
+        layout.addWidget(exit_button)
+
+        self.main_layout.addLayout(layout)
+
+    def exit_tournament(self):
+        """Exit the tournament."""
+        self.stop_api_server()
+        QApplication.quit()
+
+def local_address():
+    """The address other devices in the local network can reach this computer at."""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+            # connecting a UDP socket sends nothing, it only picks the outgoing interface
+            probe.connect(("10.255.255.255", 1))
+            return probe.getsockname()[0]
+    except OSError:
+        return "127.0.0.1"
+
+
+class PlayerSelectionDialog(QDialog):
+    """Searchable, checkable list of players that returns the ids of the checked players."""
+
+    def __init__(self, players, title="Select Players", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(360, 480)
+        self.model = PlayerChecklistModel(players, self)
+
+        layout = QVBoxLayout()
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search players...")
+        self.search_input.textChanged.connect(self.model.set_search)
+        layout.addWidget(self.search_input)
+
+        self.player_list = QListView()
+        self.player_list.setModel(self.model)
+        self.player_list.setUniformItemSizes(True)
+        layout.addWidget(self.player_list)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+        self.setLayout(layout)
+
+    def get_selected_player_ids(self):
+        """Return the ids of the checked players, including ones hidden by the search."""
+        return self.model.checked_ids()
+
+
+class LeaderboardDialog(QDialog):
+    """Season leaderboard and per-player history, loaded in the background."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        from career_stats import current_season
+        self.setWindowTitle("Career Leaderboard")
+        self.resize(700, 600)
+        layout = QVBoxLayout()
+
+        form_layout = QFormLayout()
+        self.season = QComboBox()
+        self.season.addItem(current_season())
+        self.season.currentTextChanged.connect(self.load_leaderboard)
+        form_layout.addRow("Season:", self.season)
+        layout.addLayout(form_layout)
+
+        self.leaderboard_table = QTableWidget(0, 6)
+        self.leaderboard_table.setHorizontalHeaderLabels(["Player Name", "Tournaments", "Wins", "Losses", "Times Sat Out", "Titles"])
+        self.leaderboard_table.setColumnWidth(0, 200)
+        self.leaderboard_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.leaderboard_table.cellClicked.connect(self.load_history)
+        layout.addWidget(self.leaderboard_table)
+
+        self.history_label = QLabel("Click a player to see their tournaments.")
+        layout.addWidget(self.history_label)
+        self.history_table = QTableWidget(0, 5)
+        self.history_table.setHorizontalHeaderLabels(["Date", "Wins", "Losses", "Times Sat Out", "Finished In"])
+        self.history_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.history_table)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        self.setLayout(layout)
+
+        FutureCallback(get_career_stats().seasons(), self.show_seasons, self)
+        self.load_leaderboard(self.season.currentText())
+
+    def show_seasons(self, future):
+        if future.exception() is not None:
+            return
+        self.season.blockSignals(True)
+        for (season,) in future.result():
+            if self.season.findText(season) == -1:
+                self.season.addItem(season)
+        self.season.blockSignals(False)
+
+    def load_leaderboard(self, season):
+        FutureCallback(get_career_stats().leaderboard(season), self.show_leaderboard, self)
+
+    def show_leaderboard(self, future):
+        if future.exception() is not None:
+            QMessageBox.warning(self, "Career Leaderboard", f"The leaderboard could not be loaded: {future.exception()}")
+            return
+        self.fill_table(self.leaderboard_table, future.result())
+
+    def load_history(self, row, column):
+        name = self.leaderboard_table.item(row, 0).text()
+        self.history_label.setText(f"Tournaments of {name}:")
+        FutureCallback(get_career_stats().player_history(name), self.show_history, self)
+
+    def show_history(self, future):
+        if future.exception() is not None:
+            return
+        rows = [(time.strftime("%Y-%m-%d", time.localtime(played_at)),) + tuple(rest[1:]) for played_at, *rest in future.result()]
+        self.fill_table(self.history_table, rows)
+
+    def fill_table(self, table, rows):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                table.setItem(row, column, QTableWidgetItem(str(value)))
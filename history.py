@@ -0,0 +1,207 @@
+"""Undo and redo of round submissions, manual eliminations and loss edits.
+
+Before an undoable operation changes the tournament, History records the
+inverse delta of the change: the store rows and ratings of the players it
+touches, where the players it eliminates stood in the players list, and the
+round or knockout state and the stage it replaces. Undoing applies the delta,
+so it costs time in proportion to the change instead of replaying the
+tournament, and redoing runs the operation again. The deltas are plain
+JSON-compatible data, so they are part of the saved state.
+
+Operations that are not undoable (generating a round, the extra game, seeding
+and starting the knockout, board play, the end of the tournament) clear the
+history, because the deltas before them no longer apply to the state after.
+"""
+from collections import deque
+
+from player_store import COLUMNS
+
+DEPTH = 20
+
+# Undoable operations
+RESULTS = "results"
+KNOCKOUT_RESULTS = "knockout_results"
+ELIMINATION = "elimination"
+LOSS_EDIT = "loss_edit"
+
+
+def matches_data(matches):
+    return [[match.match_id, list(match.team_1), list(match.team_2)] for match in matches]
+
+
+class History:
+    def __init__(self, engine, depth=DEPTH):
+        self.engine = engine
+        self.undo_stack = deque(maxlen=depth)
+        # (operation, player ids) of the undone operations, last undone last
+        self.redo_stack = []
+        # the delta of the operation that is being recorded
+        self.current = None
+        # True while an undo or redo changes the tournament
+        self.busy = False
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        # an operation that ends in a barrier (e.g. the final) is not undoable
+        self.current = None
+
+    def discard_redo(self):
+        """Forget the undone operations once the state they would be redone on changes."""
+        if not self.busy:
+            self.redo_stack.clear()
+
+    def begin(self, operation, player_ids, target_ids=()):
+        """Start recording an operation that changes the given players.
+
+        ``target_ids`` are the players the operation is redone on (e.g. the
+        manually eliminated player).
+        """
+        engine = self.engine
+        player_ids = sorted(set(player_ids))
+        ratings = engine.ratings
+        ratings.ensure_capacity(engine.registry.next_id)
+        self.current = {
+            "operation": operation,
+            "targets": list(target_ids),
+            "players": player_ids,
+            "store": {column: getattr(engine.store, column)[player_ids].tolist() for column in COLUMNS},
+            "ratings": [[ratings.ratings[player_id], ratings.matches[player_id]] for player_id in player_ids],
+            "stage": engine.stage,
+            # [player id, index in the players list, sit-out rotation entry] of
+            # every eliminated player
+            "eliminated": [],
+            "eliminated_count": len(engine.eliminated_players),
+            "last_eliminated": [player.id for player in engine.last_eliminated_players],
+        }
+        if operation == RESULTS:
+            self.current.update({
+                "matches": matches_data(engine.matches),
+                "match_results": [list(item) for item in sorted(engine.match_results.items())],
+                "unused_players": [player.id for player in engine.unused_players],
+            })
+        elif operation == KNOCKOUT_RESULTS:
+            self.current.update({
+                "active": [player.id for player in engine.players],
+                "final_matches": matches_data(engine.final_matches),
+                "final_match_results": [list(item) for item in sorted(engine.final_match_results.items())],
+                "nodes": list(engine.final_match_nodes),
+                "knockout_round": engine.knockout_round,
+                "next_match_id": engine.next_match_id,
+            })
+
+    def eliminated(self, player_id, index):
+        """Note that the operation being recorded eliminated the player at ``index``."""
+        if self.current is not None:
+            rotation_entry = self.engine.sit_out_rotation.entries.get(player_id)
+            self.current["eliminated"].append([player_id, index, list(rotation_entry) if rotation_entry is not None else None])
+
+    def commit(self):
+        """Finish recording the current operation."""
+        delta, self.current = self.current, None
+        if delta is not None:
+            self.undo_stack.append(delta)
+            self.discard_redo()
+
+    def undo(self):
+        """Revert the last operation; returns (changed players, revived players)."""
+        if not self.undo_stack:
+            raise ValueError("There is nothing to undo.")
+        engine = self.engine
+        delta = self.undo_stack.pop()
+        self.busy = True
+        try:
+            revived = self.revert(delta)
+        finally:
+            self.busy = False
+        self.redo_stack.append([delta["operation"], delta["targets"]])
+        changed = engine.registry.players(delta["players"])
+        engine.notify("undone", changed, revived)
+        return changed, revived
+
+    def redo(self):
+        """Run the last undone operation again."""
+        if not self.redo_stack:
+            raise ValueError("There is nothing to redo.")
+        engine = self.engine
+        operation, target_ids = self.redo_stack.pop()
+        self.busy = True
+        try:
+            if operation == RESULTS:
+                engine.handle_match_results()
+            elif operation == KNOCKOUT_RESULTS:
+                engine.handle_final_results()
+            elif operation == ELIMINATION:
+                engine.eliminate_player(engine.registry.get(target_ids[0]))
+            elif operation == LOSS_EDIT:
+                engine.remove_losses(engine.registry.players(target_ids))
+        finally:
+            self.busy = False
+        engine.notify("redone", operation)
+
+    def revert(self, delta):
+        """Apply the inverse delta of an operation and return the revived players."""
+        # imported here as the tournament module imports this one
+        from tournament import Match
+        engine = self.engine
+        registry = engine.registry
+        player_ids = delta["players"]
+        for column, values in delta["store"].items():
+            getattr(engine.store, column)[player_ids] = values
+        ratings = engine.ratings
+        for player_id, (rating, matches) in zip(player_ids, delta["ratings"]):
+            ratings.ratings[player_id] = rating
+            ratings.matches[player_id] = matches
+
+        # back into the players list in the reverse order of the eliminations
+        revived = []
+        for player_id, index, rotation_entry in reversed(delta["eliminated"]):
+            player = registry.get(player_id)
+            engine.players.insert(index, player)
+            registry.mark_active(player)
+            if rotation_entry is not None:
+                engine.sit_out_rotation.restore(player_id, *rotation_entry)
+            else:
+                engine.sit_out_rotation.add(player_id)
+            revived.append(player)
+        del engine.eliminated_players[delta["eliminated_count"]:]
+        engine.last_eliminated_players = registry.players(delta["last_eliminated"])
+
+        operation = delta["operation"]
+        if operation == RESULTS:
+            engine.matches = [Match(*match) for match in delta["matches"]]
+            engine.match_results = dict(delta["match_results"])
+            engine.unused_players = registry.players(delta["unused_players"])
+            for match in engine.matches:
+                engine.pairing_history.record_match(match.team_1, match.team_2, -1)
+        elif operation == KNOCKOUT_RESULTS:
+            for node in reversed(delta["nodes"]):
+                engine.bracket.retract(node)
+            engine.players = registry.players(delta["active"])
+            for player in engine.players:
+                if registry.is_eliminated(player):
+                    registry.mark_active(player)
+                    revived.append(player)
+            engine.knockout_round = delta["knockout_round"]
+            engine.next_match_id = delta["next_match_id"]
+            engine.final_matches = [Match(*match) for match in delta["final_matches"]]
+            engine.final_match_results = dict(delta["final_match_results"])
+            engine.final_match_nodes = list(delta["nodes"])
+
+        if engine.stage != delta["stage"]:
+            engine.set_stage(delta["stage"])
+        return revived
+
+    def to_dict(self):
+        return {"undo": list(self.undo_stack), "redo": [list(entry) for entry in self.redo_stack]}
+
+    def load_dict(self, data):
+        self.undo_stack.clear()
+        self.undo_stack.extend(data["undo"])
+        self.redo_stack = [list(entry) for entry in data["redo"]]
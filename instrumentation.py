@@ -0,0 +1,105 @@
+"""Opt-in timing of the main user actions.
+
+Instrumentation wraps functions and records, for every call, the wall time
+and how much some counters (e.g. the number of widgets) grew while it ran.
+The last ``capacity`` calls are kept in a ring buffer next to running totals
+per action, so a freeze reported by an operator can be looked at afterwards.
+It is switched on with the DART_TOURNAMENT_PROFILE environment variable or
+the --profile flag; otherwise nothing is wrapped and nothing is measured.
+"""
+import collections
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+
+ENVIRONMENT_VARIABLE = "DART_TOURNAMENT_PROFILE"
+PROFILE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".dart_tournament", "profiles")
+DEFAULT_CAPACITY = 1000
+
+
+def enabled(argv=()):
+    return "--profile" in argv or os.environ.get(ENVIRONMENT_VARIABLE, "") not in ("", "0")
+
+
+class Instrumentation:
+    def __init__(self, capacity=DEFAULT_CAPACITY, counters=None):
+        # counter name -> function returning the current count
+        self.counters = dict(counters or {})
+        self.records = collections.deque(maxlen=capacity)
+        # action name -> [calls, total seconds, longest call in seconds]
+        self.totals = {}
+        self.depth = 0
+        self.started_at = time.time()
+
+    def counts(self):
+        return [counter() for counter in self.counters.values()]
+
+    @contextmanager
+    def measure(self, name):
+        """Record the time and counter growth of the code in the with block."""
+        before = self.counts()
+        depth = self.depth
+        self.depth += 1
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            self.depth = depth
+            created = [after - count for after, count in zip(self.counts(), before)]
+            self.record(name, started_at, duration, created, depth)
+
+    def wrap(self, name, function):
+        @functools.wraps(function)
+        def measured(*args, **kwargs):
+            with self.measure(name):
+                return function(*args, **kwargs)
+        return measured
+
+    def instrument(self, owner, names):
+        """Replace methods of an object with measured ones, named after the method."""
+        for name in names:
+            setattr(owner, name, self.wrap(name, getattr(owner, name)))
+
+    def mark(self, name):
+        """Record an event without a duration, e.g. a stage change."""
+        self.record(name, time.time(), 0.0, [0] * len(self.counters), self.depth)
+
+    def record(self, name, started_at, duration, created, depth):
+        self.records.append((name, started_at, duration, created, depth))
+        totals = self.totals.setdefault(name, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += duration
+        totals[2] = max(totals[2], duration)
+
+    def recent(self, count=10):
+        """The last calls, newest first."""
+        return [self.records[-index] for index in range(1, min(count, len(self.records)) + 1)]
+
+    def summary(self):
+        """(name, calls, total, longest) per action, most time first."""
+        return sorted(((name, *totals) for name, totals in self.totals.items()), key=lambda row: -row[2])
+
+    def to_dict(self):
+        counter_names = list(self.counters)
+        return {
+            "started_at": self.started_at,
+            "counters": counter_names,
+            "totals": [{"action": name, "calls": calls, "total": total, "longest": longest} for name, calls, total, longest in self.summary()],
+            "records": [
+                {"action": name, "started_at": started_at, "duration": duration, "depth": depth, **dict(zip(counter_names, created))}
+                for name, started_at, duration, created, depth in self.records
+            ],
+        }
+
+    def export(self, path=None):
+        """Write the recorded calls to a JSON file and return its path."""
+        if path is None:
+            os.makedirs(PROFILE_DIRECTORY, exist_ok=True)
+            path = os.path.join(PROFILE_DIRECTORY, time.strftime("profile-%Y%m%d-%H%M%S.json"))
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=1)
+        return path
@@ -0,0 +1,265 @@
+"""Append-only journal of tournament events for crash recovery.
+
+Every change to a TournamentEngine is appended as one JSON line to the
+current journal file. Every ``snapshot_interval`` events the complete state is
+written to a snapshot together with the journal offset it covers, so recovery
+loads the latest snapshot and only replays the events after it.
+"""
+import json
+import os
+import time
+
+from board_scheduler import BoardScheduler
+from player import Player
+from tournament import FINAL_PLAYER_COUNT, FINISHED, KNOCKOUT, Match, TournamentEngine
+
+JOURNAL_DIRECTORY = os.path.join(os.path.expanduser("~"), ".dart_tournament")
+SNAPSHOT_INTERVAL = 100
+# Records that are written after the engine has finished the operation. Other
+# records are written from the middle of an operation (e.g. results_submitted
+# comes before the eliminations and the stage change), so a snapshot taken
+# there would miss the rest of the operation that replaying the record does.
+SNAPSHOT_EVENTS = {
+    "round_generated", "match_result_set", "final_result_set", "board_result_set", "losses_removed",
+    "players_revived", "players_seeded", "knockout_started", "ratings_loaded", "undone", "redone",
+}
+
+
+class Journal:
+    def __init__(self, directory=JOURNAL_DIRECTORY, snapshot_interval=SNAPSHOT_INTERVAL, sync=True):
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval
+        self.sync = sync
+        self.journal_path = os.path.join(directory, "current.jsonl")
+        self.snapshot_path = os.path.join(directory, "current.snapshot.json")
+        self.archive_directory = os.path.join(directory, "archive")
+        # path of the archived journal once the tournament is over
+        self.archive_path = None
+        self.engine = None
+        self.file = None
+        self.sequence = 0
+        self.events_since_snapshot = 0
+
+    def has_unfinished_tournament(self):
+        return os.path.exists(self.journal_path)
+
+    def start(self, engine):
+        """Start a new journal for ``engine``, replacing any current journal."""
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.snapshot_path):
+            os.remove(self.snapshot_path)
+        self.file = open(self.journal_path, "wb")
+        self.sequence = 0
+        self.engine = engine
+        self.append({
+            "event": "tournament_started",
+            "players": [[player.id, player.name] for player in engine.players],
+            "max_losses": engine.max_losses,
+            "matchmaking": engine.matchmaking,
+            "knockout_size": engine.knockout_size,
+            "boards": len(engine.board_scheduler.boards) if engine.board_scheduler is not None else 0,
+            "sit_out_rotation": engine.sit_out_rotation.to_dict(),
+            "time": time.time(),
+        })
+        self.write_snapshot()
+        engine.add_listener(self.on_tournament_event)
+
+    def recover(self):
+        """Rebuild the tournament from the latest snapshot and the journal tail."""
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as file:
+                snapshot = json.load(file)
+
+        engine = None
+        offset = 0
+        self.sequence = 0
+        if snapshot is not None:
+            engine = TournamentEngine.from_dict(snapshot["state"])
+            if snapshot.get("board_scheduler") is not None:
+                BoardScheduler.from_dict(engine, snapshot["board_scheduler"])
+            offset = snapshot["offset"]
+            self.sequence = snapshot["sequence"]
+
+        with open(self.journal_path, "rb") as file:
+            file.seek(offset)
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # a partly written last line from the crash
+                    break
+                offset += len(line)
+                engine = replay(engine, record)
+                self.sequence = record["sequence"]
+
+        if engine is None:
+            raise ValueError("The journal does not contain a tournament.")
+
+        # continue the journal after the last complete event
+        self.file = open(self.journal_path, "r+b")
+        self.file.seek(offset)
+        self.file.truncate()
+        self.engine = engine
+        self.events_since_snapshot = 0
+        engine.add_listener(self.on_tournament_event)
+        return engine
+
+    def on_tournament_event(self, event, *args):
+        """Translate engine events into journal records."""
+        engine = self.engine
+        if engine.history.busy:
+            # the changes of an undo or a redo are replayed by its own record
+            return
+        if event == "matches_generated":
+            player_ids = [player_id for match in engine.matches for player_id in match.player_ids()]
+            self.append({
+                "event": "round_generated",
+                "matches": [[match.match_id, list(match.team_1), list(match.team_2)] for match in engine.matches],
+                "unused_players": [player.id for player in engine.unused_players],
+                "seeds": engine.store.seed[player_ids].tolist(),
+            })
+        elif event == "match_result_set":
+            self.append({"event": "match_result_set", "row": args[0], "result": args[1]})
+        elif event == "results_submitted":
+            self.append({"event": "results_submitted"})
+        elif event == "losses_removed":
+            self.append({"event": "losses_removed", "players": [player.id for player in args[0]]})
+        elif event == "player_eliminated" and not engine.processing_results:
+            # eliminations caused by results are replayed with the results
+            self.append({"event": "player_eliminated", "player": args[0].id})
+        elif event == "players_revived":
+            self.append({"event": "players_revived", "players": [player.id for player in args[0]]})
+        elif event == "players_seeded":
+            self.append({"event": "players_seeded", "players": [player.id for player in engine.players]})
+        elif event == "stage_changed" and args[0] == KNOCKOUT:
+            self.append({"event": "knockout_started"})
+        elif event == "final_result_set":
+            self.append({"event": "final_result_set", "row": args[0], "result": args[1]})
+        elif event == "final_results_submitted":
+            self.append({"event": "final_results_submitted"})
+        elif event == "board_matches_started":
+            player_ids = [player_id for board, match in args[0] for player_id in match.player_ids()]
+            self.append({
+                "event": "board_matches_started",
+                "matches": [[board, match.match_id, list(match.team_1), list(match.team_2)] for board, match in args[0]],
+                "seeds": engine.store.seed[player_ids].tolist(),
+            })
+        elif event == "board_result_set":
+            self.append({"event": "board_result_set", "board": args[0], "result": args[1]})
+        elif event == "board_results_submitted":
+            self.append({"event": "board_results_submitted", "boards": args[1]})
+        elif event == "ratings_loaded":
+            self.append({"event": "ratings_loaded", "ratings": [[player_id, rating, matches] for player_id, (rating, matches) in sorted(args[0].items())]})
+        elif event == "undone":
+            self.append({"event": "undone"})
+        elif event == "redone":
+            self.append({"event": "redone"})
+        elif event == "stage_changed" and args[0] == FINISHED:
+            self.append({"event": "tournament_finished", "time": time.time()})
+            self.archive()
+
+    def append(self, record):
+        self.sequence += 1
+        record["sequence"] = self.sequence
+        self.file.write(json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n")
+        self.file.flush()
+        if self.sync:
+            os.fsync(self.file.fileno())
+        self.events_since_snapshot += 1
+        if self.events_since_snapshot >= self.snapshot_interval and record["event"] in SNAPSHOT_EVENTS:
+            self.write_snapshot()
+
+    def write_snapshot(self):
+        """Write the complete state atomically, together with the journal offset it covers."""
+        data = {"sequence": self.sequence, "offset": self.file.tell(), "state": self.engine.to_dict()}
+        if self.engine.board_scheduler is not None:
+            data["board_scheduler"] = self.engine.board_scheduler.to_dict()
+        temporary_path = self.snapshot_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+            file.flush()
+            if self.sync:
+                os.fsync(file.fileno())
+        os.replace(temporary_path, self.snapshot_path)
+        self.events_since_snapshot = 0
+
+    def close(self):
+        if self.engine is not None:
+            self.engine.remove_listener(self.on_tournament_event)
+            self.engine = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def archive(self):
+        """Close the journal and move it to the archive of finished or abandoned tournaments."""
+        self.close()
+        if not os.path.exists(self.journal_path):
+            return None
+        os.makedirs(self.archive_directory, exist_ok=True)
+        archive_path = os.path.join(self.archive_directory, time.strftime("tournament-%Y%m%d-%H%M%S.jsonl"))
+        suffix = 1
+        while os.path.exists(archive_path):
+            archive_path = os.path.join(self.archive_directory, time.strftime(f"tournament-%Y%m%d-%H%M%S-{suffix}.jsonl"))
+            suffix += 1
+        os.replace(self.journal_path, archive_path)
+        if os.path.exists(self.snapshot_path):
+            os.remove(self.snapshot_path)
+        self.archive_path = archive_path
+        return archive_path
+
+
+def replay(engine, record):
+    """Apply one journal record to ``engine`` and return the (possibly new) engine."""
+    event = record["event"]
+    if event == "tournament_started":
+        players = [Player(name, player_id=player_id) for player_id, name in record["players"]]
+        engine = TournamentEngine(players, record["max_losses"], record["matchmaking"], record.get("knockout_size", FINAL_PLAYER_COUNT))
+        if "sit_out_rotation" in record:
+            engine.sit_out_rotation.load_dict(record["sit_out_rotation"])
+        if record.get("boards"):
+            BoardScheduler(engine, record["boards"])
+        return engine
+
+    registry = engine.registry
+    if event == "round_generated":
+        matches = [Match(*match) for match in record["matches"]]
+        player_ids = [player_id for match in matches for player_id in match.player_ids()]
+        engine.store.seed[player_ids] = record["seeds"]
+        engine.start_round(matches, registry.players(record["unused_players"]))
+    elif event == "match_result_set":
+        engine.set_match_result(record["row"], record["result"])
+    elif event == "results_submitted":
+        engine.handle_match_results()
+    elif event == "losses_removed":
+        engine.remove_losses(registry.players(record["players"]))
+    elif event == "player_eliminated":
+        engine.eliminate_player(registry.get(record["player"]))
+    elif event == "players_revived":
+        engine.add_selected_players(registry.players(record["players"]))
+    elif event == "players_seeded":
+        engine.set_seeded_players(registry.players(record["players"]))
+    elif event == "knockout_started":
+        engine.start_knockout()
+    elif event == "final_result_set":
+        engine.set_final_match_result(record["row"], record["result"])
+    elif event == "final_results_submitted":
+        engine.handle_final_results()
+    elif event == "board_matches_started":
+        assignments = [(match[0], Match(*match[1:])) for match in record["matches"]]
+        player_ids = [player_id for board, match in assignments for player_id in match.player_ids()]
+        engine.store.seed[player_ids] = record["seeds"]
+        engine.board_scheduler.start_matches(assignments)
+    elif event == "board_result_set":
+        engine.board_scheduler.set_result(record["board"], record["result"])
+    elif event == "board_results_submitted":
+        # the matches started afterwards have records of their own
+        engine.board_scheduler.submit_results(fill=False, boards=record.get("boards"))
+    elif event == "ratings_loaded":
+        engine.load_ratings({player_id: (rating, matches) for player_id, rating, matches in record["ratings"]})
+    elif event == "undone":
+        engine.undo()
+    elif event == "redone":
+        engine.redo()
+    return engine
@@ -0,0 +1,175 @@
+import base64
+import random
+import time
+from array import array
+
+# Matchmaking modes
+RANDOM = "random"
+AVOID_REPEATS = "avoid_repeats"
+BALANCED = "balanced"
+
+# A repeated teammate counts twice as much as a repeated opponent
+TEAMMATE_WEIGHT = 2
+TIME_BUDGET = 0.03
+
+
+class PairingHistory:
+    """How often every pair of players has been teammates or opponents.
+
+    The counts are kept in two flat square ``array`` matrices indexed by
+    player id, so a lookup is a single index operation.
+    """
+
+    def __init__(self, size=0):
+        self.capacity = 0
+        self.teammates = array("H")
+        self.opponents = array("H")
+        self.ensure_capacity(size)
+
+    def ensure_capacity(self, size):
+        """Make room for player ids below ``size``."""
+        if size > self.capacity:
+            self.resize(max(size, 2 * self.capacity))
+
+    def resize(self, capacity):
+        old_capacity = self.capacity
+        teammates = array("H", bytes(2 * capacity * capacity))
+        opponents = array("H", bytes(2 * capacity * capacity))
+        for row in range(old_capacity):
+            old_start = row * old_capacity
+            new_start = row * capacity
+            teammates[new_start:new_start + old_capacity] = self.teammates[old_start:old_start + old_capacity]
+            opponents[new_start:new_start + old_capacity] = self.opponents[old_start:old_start + old_capacity]
+        self.capacity = capacity
+        self.teammates = teammates
+        self.opponents = opponents
+
+    def to_dict(self):
+        """Return the counts as JSON-compatible data."""
+        return {
+            "capacity": self.capacity,
+            "teammates": base64.b64encode(self.teammates.tobytes()).decode("ascii"),
+            "opponents": base64.b64encode(self.opponents.tobytes()).decode("ascii"),
+        }
+
+    def load_dict(self, data):
+        self.capacity = data["capacity"]
+        self.teammates = array("H", base64.b64decode(data["teammates"]))
+        self.opponents = array("H", base64.b64decode(data["opponents"]))
+
+    def teammate_count(self, player_id_1, player_id_2):
+        return self.teammates[player_id_1 * self.capacity + player_id_2]
+
+    def opponent_count(self, player_id_1, player_id_2):
+        return self.opponents[player_id_1 * self.capacity + player_id_2]
+
+    def record_match(self, team_1, team_2, amount=1):
+        """Add (or with a negative amount, remove) one match of player ids to the counts."""
+        self.ensure_capacity(max(max(team_1), max(team_2)) + 1)
+        capacity = self.capacity
+        for team in (team_1, team_2):
+            for a in team:
+                for b in team:
+                    if a != b:
+                        self.teammates[a * capacity + b] += amount
+        for a in team_1:
+            for b in team_2:
+                self.opponents[a * capacity + b] += amount
+                self.opponents[b * capacity + a] += amount
+
+    def record_round(self, matches):
+        for match in matches:
+            self.record_match(match.team_1, match.team_2)
+
+    def repeat_count(self, matches):
+        """Number of teammate and opponent pairs in ``matches`` that met before."""
+        repeats = 0
+        for match in matches:
+            for team in (match.team_1, match.team_2):
+                repeats += self.teammate_count(team[0], team[1]) > 0
+            for a in match.team_1:
+                for b in match.team_2:
+                    repeats += self.opponent_count(a, b) > 0
+        return repeats
+
+
+def build_matches(player_ids, history, time_budget=TIME_BUDGET, rng=random):
+    """Group ``player_ids`` (a multiple of 4) into 2v2 teams with few repeats.
+
+    Teams are built greedily from a shuffled order, then paired greedily into
+    matches, and finally improved with random player swaps between matches
+    until the time budget runs out or no repeated pairing is left. Returns a
+    list of ``(team_1, team_2)`` tuples of player ids.
+    """
+    deadline = time.perf_counter() + time_budget
+    slots = list(player_ids)
+    if slots:
+        history.ensure_capacity(max(slots) + 1)
+    capacity = history.capacity
+    teammates = history.teammates
+    opponents = history.opponents
+    rng.shuffle(slots)
+
+    # greedy teams: every player takes the partner they have played with least
+    teams = []
+    while slots:
+        a = slots.pop()
+        row = a * capacity
+        best_index, best_cost = 0, None
+        for i, b in enumerate(slots):
+            cost = teammates[row + b]
+            if best_cost is None or cost < best_cost:
+                best_index, best_cost = i, cost
+                if cost == 0:
+                    break
+        slots[best_index], slots[-1] = slots[-1], slots[best_index]
+        teams.append((a, slots.pop()))
+
+    # greedy matches: every team takes the opponents it has met least
+    groups = []
+    while teams:
+        a, b = teams.pop()
+        row_a, row_b = a * capacity, b * capacity
+        best_index, best_cost = 0, None
+        for i, (c, d) in enumerate(teams):
+            cost = opponents[row_a + c] + opponents[row_a + d] + opponents[row_b + c] + opponents[row_b + d]
+            if best_cost is None or cost < best_cost:
+                best_index, best_cost = i, cost
+                if cost == 0:
+                    break
+        teams[best_index], teams[-1] = teams[-1], teams[best_index]
+        c, d = teams.pop()
+        groups.append([a, b, c, d])
+
+    def group_cost(group):
+        a, b, c, d = group
+        row_a, row_b = a * capacity, b * capacity
+        return (TEAMMATE_WEIGHT * (teammates[row_a + b] + teammates[c * capacity + d])
+                + opponents[row_a + c] + opponents[row_a + d] + opponents[row_b + c] + opponents[row_b + d])
+
+    # local search: swap players between matches while it lowers the repeats
+    costs = [group_cost(group) for group in groups]
+    total = sum(costs)
+    iterations = 0
+    while total > 0 and len(groups) > 1:
+        iterations += 1
+        if iterations % 64 == 0 and time.perf_counter() > deadline:
+            break
+        m1 = rng.randrange(len(groups))
+        if costs[m1] == 0:
+            continue
+        m2 = rng.randrange(len(groups) - 1)
+        if m2 >= m1:
+            m2 += 1
+        group_1, group_2 = groups[m1], groups[m2]
+        i, j = rng.randrange(4), rng.randrange(4)
+        group_1[i], group_2[j] = group_2[j], group_1[i]
+        cost_1, cost_2 = group_cost(group_1), group_cost(group_2)
+        delta = cost_1 + cost_2 - costs[m1] - costs[m2]
+        if delta <= 0:
+            costs[m1], costs[m2] = cost_1, cost_2
+            total += delta
+        else:
+            group_1[i], group_2[j] = group_2[j], group_1[i]
+
+    return [((a, b), (c, d)) for a, b, c, d in groups]
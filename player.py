@@ -1,16 +1,41 @@
 from stats import Stats
+from player_store import PlayerStore, column_property
 import random
 
 class Player:
-    def __init__(self, name, app):
+    __slots__ = ("id", "name", "tournament", "row_store", "row", "stats")
+
+    losses = column_property("losses")
+    wins = column_property("wins")
+    times_sat_out = column_property("times_sat_out")
+    internal_times_sat_out = column_property("internal_times_sat_out")
+    seed = column_property("seed")
+
+    def __init__(self, name, tournament=None, player_id=None):
+        self.id = player_id
         self.name = name
-        self.losses = 0
-        self.wins = 0
-        self.times_sat_out = 0
-        self.internal_times_sat_out = 0
-        self.app = app
-        self.stats = Stats()
-        self.seed = 0
+        self.tournament = tournament
+        # The shared store once the player joins a tournament. Before that a
+        # store of its own is only created if the player's state is used.
+        self.row_store = None
+        self.row = 0
+        self.stats = Stats(self)
+
+    @property
+    def store(self):
+        if self.row_store is None:
+            self.row_store = PlayerStore(capacity=1)
+        return self.row_store
+
+    def attach(self, store, row):
+        """Move the player's state into a row of a shared store."""
+        if self.row_store is not None:
+            store.copy_row(self.row_store, self.row, row)
+        else:
+            store.ensure_capacity(row + 1)
+            store.reset_row(row)
+        self.row_store = store
+        self.row = row
 
     def reset_seed(self):
         self.seed = 0
@@ -19,13 +44,11 @@ class Player:
         self.seed = random.randint(1, 1000000)
 
     def add_loss(self):
-        self.stats.add_loss()
         self.losses += 1
-        if self.losses >= self.app.max_losses:
+        if self.losses >= self.tournament.max_losses:
             self.eliminate()
 
     def add_win(self):
-        self.stats.add_win()
         self.wins += 1
 
     def add_win_stats(self):
@@ -35,7 +58,10 @@ class Player:
         self.stats.add_loss()
         
     def sit_out(self):
-        self.stats.sit_out()
+        if self.tournament is not None:
+            # the tournament also moves the player on in its sit-out rotation
+            self.tournament.record_sit_outs([self.id])
+            return
         self.times_sat_out += 1
         self.internal_times_sat_out -= 1
 
@@ -43,10 +69,5 @@ class Player:
         self.stats.reset()
 
     def eliminate(self):
-        self.stats.eliminate_player()
-        self.app.eliminated_players.append(self)
-        self.app.players.remove(self)
-        self.app.update_eliminated_table()
-        self.app.update_player_table()
-        self.app.check_tournament_end()
+        self.tournament.eliminate_player(self)
 
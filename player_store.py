@@ -0,0 +1,88 @@
+import numpy as np
+
+# Counter columns of the store. Knockout results only count towards the stats,
+# group-play losses also count towards elimination.
+COLUMNS = ("wins", "losses", "knockout_wins", "knockout_losses", "times_sat_out", "internal_times_sat_out", "seed")
+
+
+class PlayerStore:
+    """Player state stored column-wise in NumPy arrays, one row per player id.
+
+    Player and Stats objects are small handles that read and write their row,
+    so every counter has a single source of truth and a whole round of
+    results can be applied with a few array operations.
+    """
+
+    def __init__(self, capacity=16):
+        self.capacity = 0
+        for column in COLUMNS:
+            setattr(self, column, np.zeros(0, dtype=np.int32))
+        self.eliminated = np.zeros(0, dtype=bool)
+        self.ensure_capacity(capacity)
+
+    def ensure_capacity(self, size):
+        """Make room for player ids below ``size``."""
+        if size <= self.capacity:
+            return
+        capacity = max(size, 2 * self.capacity)
+        for column in COLUMNS + ("eliminated",):
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, column, new)
+        self.capacity = capacity
+
+    def copy_row(self, source, source_id, player_id):
+        """Copy one player's row from another store."""
+        self.ensure_capacity(player_id + 1)
+        for column in COLUMNS + ("eliminated",):
+            getattr(self, column)[player_id] = getattr(source, column)[source_id]
+
+    def reset_row(self, player_id):
+        for column in COLUMNS + ("eliminated",):
+            getattr(self, column)[player_id] = 0
+
+    def to_dict(self, size):
+        """Return the first ``size`` rows as JSON-compatible lists."""
+        data = {column: getattr(self, column)[:size].tolist() for column in COLUMNS}
+        data["eliminated"] = self.eliminated[:size].tolist()
+        return data
+
+    def load_dict(self, data):
+        for column, values in data.items():
+            self.ensure_capacity(len(values))
+            getattr(self, column)[:len(values)] = values
+
+    def apply_results(self, winner_ids, loser_ids, max_losses):
+        """Apply a whole round of results and return the ids that reached ``max_losses``."""
+        winner_ids = np.asarray(winner_ids, dtype=np.intp)
+        loser_ids = np.asarray(loser_ids, dtype=np.intp)
+        # ids are unique within a round, so plain fancy-index increments are safe
+        self.wins[winner_ids] += 1
+        self.losses[loser_ids] += 1
+        reached = loser_ids[(self.losses[loser_ids] >= max_losses) & ~self.eliminated[loser_ids]]
+        return reached.tolist()
+
+    def apply_knockout_results(self, winner_ids, loser_ids):
+        self.knockout_wins[np.asarray(winner_ids, dtype=np.intp)] += 1
+        self.knockout_losses[np.asarray(loser_ids, dtype=np.intp)] += 1
+
+    def sit_out(self, player_ids):
+        player_ids = np.asarray(player_ids, dtype=np.intp)
+        self.times_sat_out[player_ids] += 1
+        self.internal_times_sat_out[player_ids] -= 1
+
+    def randomize_seeds(self, player_ids, rng=np.random):
+        player_ids = np.asarray(player_ids, dtype=np.intp)
+        self.seed[player_ids] = rng.randint(1, 1000001, size=len(player_ids))
+
+
+def column_property(column):
+    """Property reading and writing one column of the player's store row."""
+    def getter(self):
+        return int(getattr(self.store, column)[self.row])
+
+    def setter(self, value):
+        getattr(self.store, column)[self.row] = value
+
+    return property(getter, setter)
@@ -0,0 +1,154 @@
+"""Doubles skill ratings and rating-balanced matchmaking.
+
+Ratings is an Elo rating per player where a team is rated as the mean of its
+players. Every player also counts the matches rated so far; new players move
+with a large K factor that shrinks towards K_MINIMUM as they play, similar to
+the rating deviation in Glicko. A match is rated in O(team size), and the
+ratings are stored in the career statistics so they carry over to the next
+event.
+"""
+import math
+import random
+import time
+from array import array
+
+DEFAULT_RATING = 1500.0
+# Rating difference at which the stronger team is expected to win 10 of 11 matches
+SCALE = 400.0
+K_MAXIMUM = 64.0
+K_MINIMUM = 16.0
+# Matches after which the K factor is halfway between the maximum and the minimum
+SETTLING_MATCHES = 10
+# Random noise in the order used to group players of similar strength, so the
+# same four players do not meet every round
+GROUPING_NOISE = 60.0
+# A match is even enough when its predicted win probability is this close to 50%
+EVEN_ENOUGH = 0.01
+TIME_BUDGET = 0.03
+
+
+class Ratings:
+    """Rating and rated match count of every player id, in flat ``array`` columns."""
+
+    def __init__(self, size=0):
+        self.capacity = 0
+        self.ratings = array("d")
+        self.matches = array("I")
+        self.ensure_capacity(size)
+
+    def ensure_capacity(self, size):
+        """Make room for player ids below ``size``."""
+        if size > self.capacity:
+            capacity = max(size, 2 * self.capacity)
+            self.ratings.extend([DEFAULT_RATING] * (capacity - self.capacity))
+            self.matches.extend([0] * (capacity - self.capacity))
+            self.capacity = capacity
+
+    def rating(self, player_id):
+        return self.ratings[player_id] if player_id < self.capacity else DEFAULT_RATING
+
+    def team_rating(self, team):
+        return sum(self.rating(player_id) for player_id in team) / len(team)
+
+    def win_probability(self, team_1, team_2):
+        """Predicted probability that ``team_1`` beats ``team_2``."""
+        return expected_score(self.team_rating(team_1), self.team_rating(team_2))
+
+    def k_factor(self, player_id):
+        matches = self.matches[player_id]
+        return K_MINIMUM + (K_MAXIMUM - K_MINIMUM) * SETTLING_MATCHES / (SETTLING_MATCHES + matches)
+
+    def record_match(self, winners, losers):
+        """Rate one match between teams of player ids."""
+        self.ensure_capacity(max(max(winners), max(losers)) + 1)
+        # the share of the win the winners were not expected to get
+        surprise = 1.0 - self.win_probability(winners, losers)
+        changes = [(player_id, self.k_factor(player_id) * surprise) for player_id in winners]
+        changes += [(player_id, -self.k_factor(player_id) * surprise) for player_id in losers]
+        for player_id, change in changes:
+            self.ratings[player_id] += change
+            self.matches[player_id] += 1
+
+    def carry_over(self, ratings):
+        """Start players from earlier events, given as {player id: (rating, matches)}.
+
+        Players that were already rated in this event keep their rating.
+        Returns the ratings that were applied.
+        """
+        applied = {}
+        for player_id, (rating, matches) in ratings.items():
+            self.ensure_capacity(player_id + 1)
+            if self.matches[player_id] == 0:
+                self.ratings[player_id] = rating
+                self.matches[player_id] = matches
+                applied[player_id] = (rating, matches)
+        return applied
+
+    def to_dict(self, size):
+        """Return the first ``size`` ratings as JSON-compatible data."""
+        self.ensure_capacity(size)
+        return {"ratings": self.ratings[:size].tolist(), "matches": self.matches[:size].tolist()}
+
+    def load_dict(self, data):
+        self.ensure_capacity(len(data["ratings"]))
+        for player_id, (rating, matches) in enumerate(zip(data["ratings"], data["matches"])):
+            self.ratings[player_id] = rating
+            self.matches[player_id] = matches
+
+
+def expected_score(rating_1, rating_2):
+    return 1.0 / (1.0 + math.pow(10.0, (rating_2 - rating_1) / SCALE))
+
+
+def best_split(group, ratings):
+    """Split four players into the two teams closest to an even match.
+
+    Returns ``(imbalance, team_1, team_2)`` where the imbalance is how far the
+    predicted win probability is from 50%.
+    """
+    a, b, c, d = group
+    best = None
+    for team_1, team_2 in (((a, b), (c, d)), ((a, c), (b, d)), ((a, d), (b, c))):
+        imbalance = abs(ratings.win_probability(team_1, team_2) - 0.5)
+        if best is None or imbalance < best[0]:
+            best = (imbalance, team_1, team_2)
+    return best
+
+
+def build_balanced_matches(player_ids, ratings, time_budget=TIME_BUDGET, rng=random):
+    """Group ``player_ids`` (a multiple of 4) into 2v2 matches close to 50% each.
+
+    Players are ordered by rating with some random noise and cut into groups
+    of four, and every group is split into its most even teams. Random swaps
+    of players between groups then lower the largest imbalances until the
+    time budget runs out. Returns a list of ``(team_1, team_2)`` tuples.
+    """
+    deadline = time.perf_counter() + time_budget
+    order = sorted(player_ids, key=lambda player_id: ratings.rating(player_id) + rng.gauss(0.0, GROUPING_NOISE))
+    groups = [order[i:i + 4] for i in range(0, len(order) - 3, 4)]
+    splits = [best_split(group, ratings) for group in groups]
+
+    # local search: swap players between groups while it lowers the imbalance
+    uneven = sum(split[0] > EVEN_ENOUGH for split in splits)
+    iterations = 0
+    while uneven and len(groups) > 1:
+        iterations += 1
+        if iterations % 64 == 0 and time.perf_counter() > deadline:
+            break
+        m1 = rng.randrange(len(groups))
+        if splits[m1][0] <= EVEN_ENOUGH:
+            continue
+        m2 = rng.randrange(len(groups) - 1)
+        if m2 >= m1:
+            m2 += 1
+        group_1, group_2 = groups[m1], groups[m2]
+        i, j = rng.randrange(4), rng.randrange(4)
+        group_1[i], group_2[j] = group_2[j], group_1[i]
+        split_1, split_2 = best_split(group_1, ratings), best_split(group_2, ratings)
+        if max(split_1[0], split_2[0]) <= max(splits[m1][0], splits[m2][0]):
+            uneven += (split_1[0] > EVEN_ENOUGH) + (split_2[0] > EVEN_ENOUGH) - (splits[m1][0] > EVEN_ENOUGH) - (splits[m2][0] > EVEN_ENOUGH)
+            splits[m1], splits[m2] = split_1, split_2
+        else:
+            group_1[i], group_2[j] = group_2[j], group_1[i]
+
+    return [(team_1, team_2) for imbalance, team_1, team_2 in splits]
@@ -0,0 +1,64 @@
+class RefreshScheduler:
+    """Coalesces refresh requests into one refresh per event-loop turn.
+
+    Parts of the user interface are registered under a flag together with the
+    function that refreshes them. Marking a flag dirty only records it (and
+    the players it concerns); the first mark schedules a flush on the next
+    event-loop turn through ``schedule``, which then runs every dirty refresh
+    once, in registration order.
+    """
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self.refreshers = {}
+        self.superseded_by = {}
+        self.dirty = {}
+        self.pending = False
+        self.requested = 0
+        self.performed = 0
+        self.flushes = 0
+
+    def register(self, flag, refresher, supersedes=()):
+        """Register ``refresher(players)`` for ``flag``.
+
+        A flag that supersedes others makes their refresh unnecessary, e.g.
+        rebuilding the whole layout also rebuilds the match table.
+        """
+        self.refreshers[flag] = refresher
+        for other in supersedes:
+            self.superseded_by.setdefault(other, []).append(flag)
+
+    def mark_dirty(self, flag, players=()):
+        self.requested += 1
+        self.dirty.setdefault(flag, {}).update(dict.fromkeys(players))
+        if not self.pending:
+            self.pending = True
+            self.schedule(self.flush)
+
+    def flush(self):
+        """Run every dirty refresh once."""
+        self.pending = False
+        dirty, self.dirty = self.dirty, {}
+        if not dirty:
+            return
+        self.flushes += 1
+        for flag, refresher in self.refreshers.items():
+            if flag not in dirty:
+                continue
+            if any(other in dirty for other in self.superseded_by.get(flag, ())):
+                continue
+            refresher(list(dirty[flag]))
+            self.performed += 1
+
+    @property
+    def avoided(self):
+        """Number of refresh requests that did not cost a refresh of their own."""
+        return self.requested - self.performed
+
+    def statistics(self):
+        return {
+            "requested": self.requested,
+            "performed": self.performed,
+            "avoided": self.avoided,
+            "flushes": self.flushes,
+        }
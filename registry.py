@@ -0,0 +1,80 @@
+from player_store import PlayerStore
+
+
+class PlayerRegistry:
+    """Every player of a tournament, indexed by id and by name.
+
+    Players get a stable id when they are registered, and their state moves
+    into that row of the registry's PlayerStore. Membership of the active and
+    eliminated players is kept in sets of ids, so every lookup is a
+    dictionary or set operation instead of a list scan.
+    """
+
+    def __init__(self, players=()):
+        self.store = PlayerStore()
+        self.by_id = {}
+        self.by_name = {}
+        self.active = set()
+        self.eliminated = set()
+        self.next_id = 0
+        for player in players:
+            self.add(player)
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def add(self, player, eliminated=False):
+        """Register a player and give it an id if it does not have one yet."""
+        if player.name in self.by_name:
+            raise ValueError(f"The player '{player.name}' is already registered.")
+        if player.id is None:
+            player.id = self.next_id
+        elif player.id in self.by_id:
+            raise ValueError(f"The player id {player.id} is already registered.")
+        self.next_id = max(self.next_id, player.id + 1)
+        player.attach(self.store, player.id)
+        self.by_id[player.id] = player
+        self.by_name[player.name] = player
+        if eliminated:
+            self.mark_eliminated(player)
+        else:
+            self.mark_active(player)
+        return player
+
+    def get(self, player_id):
+        return self.by_id[player_id]
+
+    def find(self, name):
+        """Return the player with the given name, or None."""
+        return self.by_name.get(name)
+
+    def players(self, player_ids):
+        return [self.by_id[player_id] for player_id in player_ids]
+
+    def names(self, player_ids):
+        return [self.by_id[player_id].name for player_id in player_ids]
+
+    def is_active(self, player):
+        return player.id in self.active
+
+    def is_eliminated(self, player):
+        return player.id in self.eliminated
+
+    def mark_eliminated(self, player):
+        self.active.discard(player.id)
+        self.eliminated.add(player.id)
+        self.store.eliminated[player.id] = True
+
+    def mark_active(self, player):
+        self.eliminated.discard(player.id)
+        self.active.add(player.id)
+        self.store.eliminated[player.id] = False
+
+    def clear(self):
+        self.by_id.clear()
+        self.by_name.clear()
+        self.active.clear()
+        self.eliminated.clear()
@@ -0,0 +1,62 @@
+"""Reading player names in bulk from CSV or plain text.
+
+Everything is a generator, so a file is parsed line by line while the names
+are being added and never held in memory twice.
+"""
+import csv
+import io
+
+HEADER_NAMES = {"name", "names", "player", "players", "player name"}
+
+
+def normalise(name):
+    """Collapse whitespace and ignore case, so "anna  Berg" matches "Anna Berg"."""
+    return " ".join(name.split()).casefold()
+
+
+def read_names(lines):
+    """Yield the player names in an iterable of CSV or plain-text lines.
+
+    The first column of every row is the name. Empty rows, rows starting with
+    '#' and a leading header row are skipped.
+    """
+    for row_number, row in enumerate(csv.reader(lines, skipinitialspace=True)):
+        if not row:
+            continue
+        name = row[0].strip()
+        if not name or name.startswith("#"):
+            continue
+        if row_number == 0 and name.casefold() in HEADER_NAMES:
+            continue
+        yield name
+
+
+def read_file(path):
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        yield from read_names(file)
+
+
+def read_text(text):
+    """Yield the names in pasted text."""
+    return read_names(io.StringIO(text, newline=None))
+
+
+def unique_names(names, existing=(), normalised=False, duplicates=None):
+    """Yield the names that are neither duplicates of each other nor of ``existing``.
+
+    With ``normalised`` names are compared (and returned) with collapsed
+    whitespace, and case is ignored in the comparison. Skipped names are
+    appended to ``duplicates`` if it is given.
+    """
+    key = normalise if normalised else (lambda name: name)
+    seen = {key(name) for name in existing}
+    for name in names:
+        if normalised:
+            name = " ".join(name.split())
+        name_key = key(name)
+        if name_key in seen:
+            if duplicates is not None:
+                duplicates.append(name)
+            continue
+        seen.add(name_key)
+        yield name
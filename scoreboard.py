@@ -0,0 +1,192 @@
+"""Read-only scoreboard for spectator screens, pushed as deltas.
+
+ScoreboardFeed listens to the engine and collects what changed during one
+event-loop turn: the players whose numbers changed, new matches, entered
+results and stage changes. It then publishes a single small delta. A full
+snapshot is only built when the feed starts; the server keeps it up to date
+by applying the deltas, so new spectators get the current scoreboard
+without asking the engine.
+"""
+from api_server import current_matches, match_entries
+from refresh import RefreshScheduler
+from tournament import KNOCKOUT
+
+
+class ScoreboardFeed:
+    def __init__(self, engine, schedule=lambda flush: flush()):
+        self.engine = engine
+        self.subscribers = []
+        self.sequence = 0
+        self.results = []
+        self.matches_changed = False
+        self.stage_changed = False
+        self.refresh_scheduler = RefreshScheduler(schedule)
+        self.refresh_scheduler.register("delta", self.publish_delta)
+        engine.add_listener(self.on_tournament_event)
+
+    def close(self):
+        self.engine.remove_listener(self.on_tournament_event)
+        self.subscribers.clear()
+
+    def on_tournament_event(self, event, *args):
+        engine = self.engine
+        players = ()
+        if event in ("match_result_set", "board_result_set", "final_result_set"):
+            row, result = args
+            match = dict(current_matches(engine)).get(row)
+            if match is not None:
+                self.results.append([match.match_id, result])
+        elif event == "matches_generated":
+            self.matches_changed = True
+            players = engine.unused_players
+        elif event in ("results_submitted", "board_results_submitted"):
+            self.matches_changed = True
+            players = args[0]
+        elif event == "board_matches_started":
+            self.matches_changed = True
+        elif event in ("player_eliminated", "player_updated"):
+            players = args
+        elif event in ("players_revived", "losses_removed", "players_sat_out"):
+            players = args[0]
+        elif event == "final_results_submitted":
+            # the finished knockout matches are still the current ones here
+            players = engine.registry.players(player_id for row, match in current_matches(engine) for player_id in match.player_ids())
+            self.matches_changed = True
+        elif event in ("stage_changed", "knockout_advanced"):
+            self.stage_changed = True
+            self.matches_changed = True
+        elif event == "undone":
+            # the undone round is current again, possibly in an earlier stage
+            players = args[0] + args[1]
+            self.stage_changed = True
+            self.matches_changed = True
+        else:
+            return
+        self.refresh_scheduler.mark_dirty("delta", players)
+
+    def player_row(self, player):
+        stats = player.stats
+        return [player.name, stats.wins, stats.losses, stats.times_sat_out, self.engine.registry.is_eliminated(player)]
+
+    def round_number(self):
+        engine = self.engine
+        return engine.knockout_round if engine.stage == KNOCKOUT else engine.round_number
+
+    def snapshot(self):
+        engine = self.engine
+        return {
+            "type": "snapshot",
+            "sequence": self.sequence,
+            "stage": engine.stage,
+            "round": self.round_number(),
+            "players": {str(player.id): self.player_row(player) for player in engine.registry.by_id.values()},
+            "matches": match_entries(engine),
+        }
+
+    def publish_snapshot(self):
+        self.publish(self.snapshot())
+
+    def publish_delta(self, players):
+        """Publish everything that changed since the last delta."""
+        self.sequence += 1
+        delta = {"type": "delta", "sequence": self.sequence}
+        if players:
+            delta["players"] = {str(player.id): self.player_row(player) for player in players}
+        if self.matches_changed or self.stage_changed:
+            delta["matches"] = match_entries(self.engine)
+            delta["round"] = self.round_number()
+        elif self.results:
+            delta["results"] = self.results
+        if self.stage_changed:
+            delta["stage"] = self.engine.stage
+        self.results = []
+        self.matches_changed = False
+        self.stage_changed = False
+        self.publish(delta)
+
+    def publish(self, message):
+        for subscriber in list(self.subscribers):
+            subscriber(message)
+
+    @staticmethod
+    def apply_delta(state, delta):
+        """Apply a delta (or snapshot) to a scoreboard and return it."""
+        if state is None or delta["type"] == "snapshot":
+            return dict(delta, players=dict(delta["players"]))
+        state["sequence"] = delta["sequence"]
+        state["players"].update(delta.get("players", {}))
+        for key in ("stage", "round"):
+            if key in delta:
+                state[key] = delta[key]
+        if "matches" in delta:
+            state["matches"] = [dict(match) for match in delta["matches"]]
+        winners = dict(delta.get("results", ()))
+        if winners:
+            for match in state["matches"]:
+                if match["id"] in winners:
+                    match["winner"] = winners[match["id"]]
+        return state
+
+    page = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Dart Tournament Scoreboard</title>
+<style>
+body { font-family: sans-serif; font-weight: bold; margin: 16px; display: flex; gap: 24px; }
+table { border-collapse: collapse; }
+th { background: rgb(104, 205, 254); padding: 4px 12px; }
+td { padding: 4px 12px; }
+tr:nth-child(even) td { background: rgb(210, 210, 210); }
+tr.eliminated td { color: #999; text-decoration: line-through; }
+.match { border: 1px solid #aaa; margin: 6px 0; padding: 6px; }
+.won { background: #0f0; }
+</style></head>
+<body>
+<div><h2 id="title">Standings</h2><table><thead><tr><th>Player</th><th>Wins</th><th>Losses</th><th>Sat Out</th></tr></thead><tbody id="players"></tbody></table></div>
+<div><h2 id="round">Matches</h2><div id="matches"></div></div>
+<script>
+let state = null;
+function apply(message) {
+  if (message.type === "snapshot" || state === null) { state = message; return true; }
+  if (message.sequence !== state.sequence + 1) return false;
+  state.sequence = message.sequence;
+  Object.assign(state.players, message.players || {});
+  if (message.stage !== undefined) state.stage = message.stage;
+  if (message.round !== undefined) state.round = message.round;
+  if (message.matches !== undefined) state.matches = message.matches;
+  for (const [id, winner] of message.results || []) {
+    for (const match of state.matches) if (match.id === id) match.winner = winner;
+  }
+  return true;
+}
+function render() {
+  const rows = Object.values(state.players).sort((a, b) => (a[4] - b[4]) || (a[2] - b[2]) || (b[1] - a[1]) || a[0].localeCompare(b[0]));
+  document.getElementById("players").innerHTML = rows.map(p =>
+    "<tr" + (p[4] ? " class='eliminated'" : "") + "><td></td><td>" + p[1] + "</td><td>" + p[2] + "</td><td>" + p[3] + "</td></tr>").join("");
+  const cells = document.querySelectorAll("#players tr td:first-child");
+  rows.forEach((p, i) => cells[i].textContent = p[0]);
+  document.getElementById("round").textContent = (state.stage === "knockout" ? "Knockout Round " : "Round ") + state.round;
+  const container = document.getElementById("matches");
+  container.innerHTML = "";
+  for (const match of state.matches) {
+    const div = document.createElement("div");
+    div.className = "match";
+    [1, 2].forEach(team => {
+      const span = document.createElement("div");
+      span.textContent = (match.board && team === 1 ? "Board " + match.board + ": " : "") + match["team_" + team].join(" & ");
+      if (match.winner === team) span.className = "won";
+      div.appendChild(span);
+    });
+    container.appendChild(div);
+  }
+}
+function connect() {
+  state = null;
+  const socket = new WebSocket((location.protocol === "https:" ? "wss://" : "ws://") + location.host + "/scoreboard/ws");
+  socket.onmessage = event => {
+    if (apply(JSON.parse(event.data))) render(); else socket.close();
+  };
+  socket.onclose = () => setTimeout(connect, 2000);
+}
+connect();
+</script></body></html>
+"""
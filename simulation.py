@@ -0,0 +1,228 @@
+"""Monte Carlo simulation of the group-play elimination format.
+
+Every tournament in a batch is one row of NumPy arrays, so a round is played
+for thousands of tournaments at once instead of looping over Player objects.
+The rules follow TournamentEngine: players with the fewest sit-outs sit out
+when the field is not divisible by 4, everybody else is shuffled into random
+2v2 matches, losers are eliminated at ``max_losses`` and the group stage stops
+at 8 players (filling missing spots from the last eliminated players). The
+final 8 are seeded randomly into the knockout stage.
+"""
+import argparse
+
+import numpy as np
+
+from tournament import FINAL_PLAYER_COUNT
+
+
+class SimulationReport:
+    """Aggregated results of many simulated tournaments."""
+
+    def __init__(self, num_players, max_losses):
+        self.num_players = num_players
+        self.max_losses = max_losses
+        self.runs = 0
+        self.rounds = []
+        self.extra_games = 0
+        self.sit_out_counts = np.zeros(0, dtype=np.int64)
+        self.win_counts = np.zeros(0, dtype=np.int64)
+        self.win_spreads = []
+        self.win_stds = []
+
+    def add_batch(self, rounds, sit_outs, wins, extra_games):
+        self.runs += len(rounds)
+        self.rounds.append(rounds)
+        self.extra_games += int(extra_games)
+        self.sit_out_counts = add_histograms(self.sit_out_counts, np.bincount(sit_outs.ravel()))
+        self.win_counts = add_histograms(self.win_counts, np.bincount(wins.ravel()))
+        self.win_spreads.append(wins.max(axis=1) - wins.min(axis=1))
+        self.win_stds.append(wins.std(axis=1))
+
+    def merge(self, other):
+        """Add the runs of another report with the same settings."""
+        if (other.num_players, other.max_losses) != (self.num_players, self.max_losses):
+            raise ValueError("Only reports with the same players and max losses can be merged.")
+        self.runs += other.runs
+        self.rounds.extend(other.rounds)
+        self.extra_games += other.extra_games
+        self.sit_out_counts = add_histograms(self.sit_out_counts, other.sit_out_counts)
+        self.win_counts = add_histograms(self.win_counts, other.win_counts)
+        self.win_spreads.extend(other.win_spreads)
+        self.win_stds.extend(other.win_stds)
+        return self
+
+    def summary(self):
+        """Return the report as a dictionary of plain Python values."""
+        rounds = np.concatenate(self.rounds)
+        spreads = np.concatenate(self.win_spreads)
+        stds = np.concatenate(self.win_stds)
+        return {
+            "players": self.num_players,
+            "max_losses": self.max_losses,
+            "runs": self.runs,
+            "rounds_mean": float(rounds.mean()),
+            "rounds_std": float(rounds.std()),
+            "rounds_min": int(rounds.min()),
+            "rounds_p50": float(np.percentile(rounds, 50)),
+            "rounds_p90": float(np.percentile(rounds, 90)),
+            "rounds_max": int(rounds.max()),
+            "extra_game_rate": self.extra_games / self.runs,
+            "sit_outs_mean": histogram_mean(self.sit_out_counts),
+            "sit_outs_max": int(len(self.sit_out_counts) - 1),
+            "sit_outs_distribution": histogram_fractions(self.sit_out_counts),
+            "wins_mean": histogram_mean(self.win_counts),
+            "wins_std_mean": float(stds.mean()),
+            "wins_spread_mean": float(spreads.mean()),
+            "wins_spread_max": int(spreads.max()),
+            "wins_distribution": histogram_fractions(self.win_counts),
+        }
+
+    def __str__(self):
+        summary = self.summary()
+        sit_outs = ", ".join(f"{count}: {fraction:.1%}" for count, fraction in summary["sit_outs_distribution"].items())
+        return (
+            f"{summary['players']} players, max losses {summary['max_losses']} ({summary['runs']} runs)\n"
+            f"  rounds: mean {summary['rounds_mean']:.2f} (std {summary['rounds_std']:.2f}), "
+            f"min {summary['rounds_min']}, median {summary['rounds_p50']:.0f}, "
+            f"p90 {summary['rounds_p90']:.0f}, max {summary['rounds_max']}\n"
+            f"  extra game needed: {summary['extra_game_rate']:.1%}\n"
+            f"  sit-outs per player: mean {summary['sit_outs_mean']:.2f}, max {summary['sit_outs_max']} ({sit_outs})\n"
+            f"  wins per player: mean {summary['wins_mean']:.2f}, std {summary['wins_std_mean']:.2f}, "
+            f"spread mean {summary['wins_spread_mean']:.2f}, spread max {summary['wins_spread_max']}"
+        )
+
+
+def add_histograms(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    a = a.copy()
+    a[:len(b)] += b
+    return a
+
+
+def histogram_mean(counts):
+    return float((np.arange(len(counts)) * counts).sum() / counts.sum())
+
+
+def histogram_fractions(counts):
+    total = counts.sum()
+    return {value: float(count / total) for value, count in enumerate(counts) if count}
+
+
+def ranks(keys):
+    """Rank of every entry within its row (0 = smallest key)."""
+    order = np.argsort(keys, axis=1)
+    result = np.empty_like(order)
+    rows = np.arange(keys.shape[0])[:, None]
+    result[rows, order] = np.arange(keys.shape[1])
+    return result
+
+
+def play_matches(rng, playing):
+    """Shuffle the playing players of every row into 2v2 matches.
+
+    Returns boolean (won, lost) arrays shaped like ``playing``.
+    """
+    num_rows, num_players = playing.shape
+    keys = rng.random(playing.shape, dtype=np.float32)
+    keys[~playing] = np.inf
+    position = ranks(keys)
+
+    team_1_wins = rng.random((num_rows, num_players // 4 + 1)) < 0.5
+    rows = np.arange(num_rows)[:, None]
+    in_team_2 = position % 4 >= 2
+    lost = playing & (in_team_2 == team_1_wins[rows, position // 4])
+    won = playing & ~lost
+    return won, lost
+
+
+def simulate_batch(rng, num_players, max_losses, batch_size):
+    """Simulate ``batch_size`` tournaments and return per-run arrays."""
+    shape = (batch_size, num_players)
+    losses = np.zeros(shape, dtype=np.int16)
+    wins = np.zeros(shape, dtype=np.int16)
+    sit_outs = np.zeros(shape, dtype=np.int16)
+    active = np.ones(shape, dtype=bool)
+    rounds = np.zeros(batch_size, dtype=np.int32)
+    extra_games = 0
+    running = np.flatnonzero(active.sum(axis=1) > FINAL_PLAYER_COUNT)
+
+    # Group stage: only the tournaments that are still running are touched
+    while len(running):
+        current = active[running]
+        excess = current.sum(axis=1) % 4
+
+        # the players with the fewest sit-outs sit the round out (random tiebreak)
+        sitting = np.zeros_like(current)
+        uneven = np.flatnonzero(excess)
+        if len(uneven):
+            keys = sit_outs[running[uneven]] + rng.random((len(uneven), num_players), dtype=np.float32)
+            keys[~current[uneven]] = np.inf
+            sitting[uneven] = current[uneven] & (ranks(keys) < excess[uneven, None])
+            sit_outs[running] += sitting
+
+        won, lost = play_matches(rng, current & ~sitting)
+        wins[running] += won
+        round_losses = losses[running] + lost
+        losses[running] = round_losses
+        rounds[running] += 1
+
+        eliminated = current & (round_losses >= max_losses)
+        current &= ~eliminated
+        remaining = current.sum(axis=1)
+
+        # extra game: fill the missing spots from the players eliminated this round
+        missing = FINAL_PLAYER_COUNT - remaining
+        short = missing > 0
+        if short.any():
+            extra_games += int(short.sum())
+            keys = rng.random(current.shape, dtype=np.float32)
+            keys[~eliminated] = np.inf
+            current |= eliminated & (ranks(keys) < np.maximum(missing, 0)[:, None])
+
+        active[running] = current
+        running = running[remaining > FINAL_PLAYER_COUNT]
+
+    # Knockout stage: the final 8 are seeded randomly into teams of 2
+    keys = rng.random(shape, dtype=np.float32)
+    keys[~active] = np.inf
+    seed = ranks(keys)
+    finalists = active & (seed < FINAL_PLAYER_COUNT)
+    won, lost = play_matches(rng, finalists)
+    wins += won
+    won, lost = play_matches(rng, won)
+    wins += won
+
+    return rounds, sit_outs, wins, extra_games
+
+
+def simulate(num_players, max_losses, runs, seed=None, batch_size=10000, rng=None):
+    """Simulate ``runs`` tournaments and return a SimulationReport."""
+    if num_players <= FINAL_PLAYER_COUNT:
+        raise ValueError(f"At least {FINAL_PLAYER_COUNT + 1} players are needed for the group stage.")
+    if rng is None:
+        rng = np.random.default_rng(seed)
+    report = SimulationReport(num_players, max_losses)
+    remaining = runs
+    while remaining > 0:
+        batch = min(batch_size, remaining)
+        report.add_batch(*simulate_batch(rng, num_players, max_losses, batch))
+        remaining -= batch
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate dart tournaments to choose max losses.")
+    parser.add_argument("--players", type=int, nargs="+", default=[60, 100, 200])
+    parser.add_argument("--max-losses", type=int, nargs="+", default=[2, 3, 4])
+    parser.add_argument("--runs", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    for num_players in args.players:
+        for max_losses in args.max_losses:
+            print(simulate(num_players, max_losses, args.runs, seed=args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Whole-tournament rotation of the players that sit out.
+
+When the active players are not a multiple of 4, ``len(players) % 4`` of them
+sit the round out. SitOutRotation keeps the active player ids in one queue per
+sit-out count. The players that sit out are taken from the front of the
+lowest queue and move to the back of the next one, so nobody sits out twice
+before every other active player has sat out once. A round, an elimination
+and a revival each cost O(players changed) instead of sorting the field.
+
+The order in the queues is the plan for the whole tournament: it is shuffled
+once at the start, and the same order keeps rotating for every roster size.
+"""
+import bisect
+import random
+from collections import deque
+
+
+class SitOutRotation:
+    def __init__(self, store, player_ids=()):
+        self.store = store
+        # sit-out count -> queue of (player id, stamp); entries whose stamp is
+        # no longer the player's are left behind by moves and eliminations
+        self.queues = {}
+        # sit-out count -> number of players in that queue
+        self.sizes = {}
+        # player id -> (sit-out count, stamp) of the player's entry
+        self.entries = {}
+        self.next_stamp = 0
+        self.reset(player_ids)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, player_id):
+        return player_id in self.entries
+
+    def reset(self, player_ids):
+        """Start a new rotation of the given players in random order."""
+        self.queues.clear()
+        self.sizes.clear()
+        self.entries.clear()
+        player_ids = list(player_ids)
+        random.shuffle(player_ids)
+        for player_id in player_ids:
+            self.insert(player_id)
+
+    def count(self, player_id):
+        return -int(self.store.internal_times_sat_out[player_id])
+
+    def insert(self, player_id):
+        count = self.count(player_id)
+        stamp = self.next_stamp
+        self.next_stamp += 1
+        self.queues.setdefault(count, deque()).append((player_id, stamp))
+        self.sizes[count] = self.sizes.get(count, 0) + 1
+        self.entries[player_id] = (count, stamp)
+
+    def discard(self, player_id):
+        entry = self.entries.pop(player_id, None)
+        if entry is not None:
+            self.sizes[entry[0]] -= 1
+        return entry is not None
+
+    def add(self, player_id):
+        """Put a revived player back into the rotation."""
+        if player_id not in self.entries:
+            self.insert(player_id)
+
+    def restore(self, player_id, count, stamp):
+        """Put a removed player back where its entry was, e.g. when an elimination is undone."""
+        if player_id in self.entries:
+            return
+        queue = self.queues.setdefault(count, deque())
+        # the queues are in stamp order; the left-behind entry may still be there
+        index = bisect.bisect_left(queue, stamp, key=lambda entry: entry[1])
+        if index == len(queue) or queue[index] != (player_id, stamp):
+            queue.insert(index, (player_id, stamp))
+        self.sizes[count] = self.sizes.get(count, 0) + 1
+        self.entries[player_id] = (count, stamp)
+
+    def remove(self, player_id):
+        """Take an eliminated player out of the rotation."""
+        self.discard(player_id)
+
+    def sat_out(self, player_ids):
+        """Move players to the back of their new queue once their sit-out is stored."""
+        for player_id in player_ids:
+            if self.discard(player_id):
+                self.insert(player_id)
+
+    def compact(self):
+        """Drop the left-behind entries at the front of the queues and empty queues."""
+        for count in list(self.queues):
+            queue = self.queues[count]
+            if self.sizes[count] == 0:
+                del self.queues[count]
+                del self.sizes[count]
+                continue
+            while self.entries.get(queue[0][0]) != (count, queue[0][1]):
+                queue.popleft()
+
+    def order(self):
+        """Yield the player ids in the order in which they will sit out."""
+        self.compact()
+        for count in sorted(self.queues):
+            for player_id, stamp in self.queues[count]:
+                if self.entries.get(player_id) == (count, stamp):
+                    yield player_id
+
+    def next_sitters(self, count):
+        """The ids of the ``count`` players that sit out next."""
+        sitters = []
+        if count > 0:
+            for player_id in self.order():
+                sitters.append(player_id)
+                if len(sitters) == count:
+                    break
+        return sitters
+
+
+    def to_dict(self):
+        """The rotation order as [sit-out count, [player id, stamp] pairs] per queue, front first."""
+        self.compact()
+        return {
+            "next_stamp": self.next_stamp,
+            "queues": [
+                [count, [[player_id, stamp] for player_id, stamp in self.queues[count] if self.entries.get(player_id) == (count, stamp)]]
+                for count in sorted(self.queues)
+            ],
+        }
+
+    def load_dict(self, data):
+        """Restore the order saved by to_dict, without shuffling."""
+        self.queues.clear()
+        self.sizes.clear()
+        self.entries.clear()
+        for count, entries in data["queues"]:
+            self.queues[count] = deque((player_id, stamp) for player_id, stamp in entries)
+            self.sizes[count] = len(entries)
+            for player_id, stamp in entries:
+                self.entries[player_id] = (count, stamp)
+        self.next_stamp = data["next_stamp"]
@@ -0,0 +1,8 @@
+# Tournament stages, in their own module so they can be used without loading the engine
+GROUP_STAGE = "group"
+FINAL_PLAYERS = "final_players"
+KNOCKOUT = "knockout"
+FINISHED = "finished"
+
+# Supported numbers of players in the knockout stage, in teams of 2
+KNOCKOUT_SIZES = (4, 8, 16, 32, 64)
@@ -1,23 +1,39 @@
 class Stats:
-    def __init__(self):
-        self.losses = 0
-        self.wins = 0
-        self.times_sat_out = 0
-        eliminated_status = False
+    """Tournament stats of a player: group-play and knockout results together.
+
+    The counters live in the player's row of its PlayerStore.
+    """
+    __slots__ = ("player",)
+
+    def __init__(self, player):
+        self.player = player
+
+    @property
+    def losses(self):
+        player = self.player
+        return int(player.store.losses[player.row] + player.store.knockout_losses[player.row])
+
+    @property
+    def wins(self):
+        player = self.player
+        return int(player.store.wins[player.row] + player.store.knockout_wins[player.row])
+
+    @property
+    def times_sat_out(self):
+        return self.player.times_sat_out
+
+    @property
+    def eliminated_status(self):
+        return bool(self.player.store.eliminated[self.player.row])
 
     def add_loss(self):
-        self.losses += 1
+        self.player.store.knockout_losses[self.player.row] += 1
 
     def add_win(self):
-        self.wins += 1
-    
-    def sit_out(self):
-        self.times_sat_out += 1
+        self.player.store.knockout_wins[self.player.row] += 1
 
     def eliminate_player(self):
-        self.eliminated_status = True
+        self.player.store.eliminated[self.player.row] = True
     
     def reset(self):
-        self.losses = 0
-        self.wins = 0
-        self.times_sat_out = 0
+        self.player.store.reset_row(self.player.row)
@@ -0,0 +1,127 @@
+"""Sweep the tournament simulation over player counts and max losses.
+
+The grid is split into tasks of ``chunk_runs`` tournaments, which are
+simulated on a process pool and merged into one report per grid cell. Every
+task gets its own random stream, spawned from one NumPy SeedSequence in a
+fixed task order, so a sweep with the same seed gives the same table no
+matter how many worker processes ran it.
+"""
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from simulation import simulate
+from tournament import FINAL_PLAYER_COUNT
+
+SUMMARY_COLUMNS = [
+    "players", "max_losses", "runs", "rounds_mean", "rounds_std", "rounds_p50", "rounds_p90", "rounds_max",
+    "extra_game_rate", "sit_outs_mean", "sit_outs_max", "wins_std_mean", "wins_spread_mean", "wins_spread_max",
+]
+
+
+def sweep_tasks(players, max_losses, runs, chunk_runs):
+    """(players, max losses, runs) of every task, in a fixed order."""
+    tasks = []
+    for num_players in players:
+        for losses in max_losses:
+            for start in range(0, runs, chunk_runs):
+                tasks.append((num_players, losses, min(chunk_runs, runs - start)))
+    return tasks
+
+
+def run_task(task):
+    num_players, max_losses, runs, seed_sequence = task
+    return simulate(num_players, max_losses, runs, rng=np.random.default_rng(seed_sequence))
+
+
+def sweep(players, max_losses, runs, seed=None, chunk_runs=2000, workers=None):
+    """Simulate ``runs`` tournaments per grid cell and return the merged reports.
+
+    ``seed`` may be an int or a SeedSequence; ``workers`` defaults to the
+    number of CPUs, and 1 runs everything in this process.
+    """
+    for num_players in players:
+        if num_players <= FINAL_PLAYER_COUNT:
+            raise ValueError(f"At least {FINAL_PLAYER_COUNT + 1} players are needed for the group stage.")
+    seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    tasks = sweep_tasks(players, max_losses, runs, chunk_runs)
+    tasks = [task + (task_seed,) for task, task_seed in zip(tasks, seed_sequence.spawn(len(tasks)))]
+
+    reports = {}
+
+    def merge(task_reports):
+        # merged in task order, so the result does not depend on the scheduling
+        for report in task_reports:
+            key = (report.num_players, report.max_losses)
+            if key in reports:
+                reports[key].merge(report)
+            else:
+                reports[key] = report
+
+    if workers == 1:
+        merge(map(run_task, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            merge(executor.map(run_task, tasks))
+    return [reports[key] for key in sorted(reports)]
+
+
+def summary_rows(reports):
+    rows = []
+    for report in reports:
+        summary = report.summary()
+        rows.append({column: summary[column] for column in SUMMARY_COLUMNS})
+    return rows
+
+
+def format_table(rows):
+    lines = [
+        f"{'Players':>7} {'Losses':>6} {'Runs':>7} {'Rounds':>7} {'p90':>5} {'Max':>5} "
+        f"{'Extra game':>10} {'Sit-outs':>8} {'Max':>4} {'Win spread':>10}"
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['players']:>7} {row['max_losses']:>6} {row['runs']:>7} {row['rounds_mean']:>7.2f} "
+            f"{row['rounds_p90']:>5.0f} {row['rounds_max']:>5} {row['extra_game_rate']:>10.1%} "
+            f"{row['sit_outs_mean']:>8.2f} {row['sit_outs_max']:>4} {row['wins_spread_mean']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep the tournament simulation over player counts and max losses.")
+    parser.add_argument("--players", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--max-losses", type=int, nargs="+", default=[1, 2, 3, 4, 5, 6])
+    parser.add_argument("--runs", type=int, default=10000, help="tournaments per players and max losses")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-runs", type=int, default=2000, help="tournaments per task")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--csv", default=None, help="also write the table to a CSV file")
+    args = parser.parse_args()
+
+    seed_sequence = np.random.SeedSequence(args.seed)
+    try:
+        reports = sweep(args.players, args.max_losses, args.runs, seed_sequence, args.chunk_runs, args.workers)
+    except ValueError as error:
+        parser.error(str(error))
+    rows = summary_rows(reports)
+    print(format_table(rows))
+    # the seed to repeat this sweep with, also when none was given
+    print(f"Seed: {seed_sequence.entropy}", file=sys.stderr)
+    if args.csv:
+        write_csv(args.csv, rows)
+
+
+if __name__ == "__main__":
+    main()
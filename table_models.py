@@ -0,0 +1,228 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QAbstractTableModel, QModelIndex
+
+# Column definitions: (header, value of the column for a player)
+PLAYER_COLUMNS = [
+    ("Player Name", lambda player: player.name),
+    ("Losses", lambda player: player.stats.losses),
+    ("Wins", lambda player: player.stats.wins),
+    ("Times Sat Out", lambda player: player.stats.times_sat_out),
+]
+RATED_PLAYER_COLUMNS = PLAYER_COLUMNS + [("Rating", lambda player: round(player.tournament.ratings.rating(player.id)))]
+ELIMINATED_COLUMNS = [("Eliminated Players", lambda player: player.name)]
+UNUSED_COLUMNS = [("Players that Sit Out", lambda player: player.name)]
+WAITING_COLUMNS = [("Players Waiting for a Board", lambda player: player.name)]
+
+
+class PlayerTableModel(QAbstractTableModel):
+    """Table model over a list of players.
+
+    The model remembers what every row displayed, so refreshing a player only
+    emits ``dataChanged`` when one of its values actually changed, and
+    removing or adding players only touches the affected rows.
+    """
+
+    def __init__(self, columns, players=(), parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.players = []
+        self.values = []
+        self.rows = {}
+        self.set_players(players)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.players)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(self.values[index.row()][index.column()])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.columns[section][0]
+        return super().headerData(section, orientation, role)
+
+    def row_values(self, player):
+        return tuple(value(player) for header, value in self.columns)
+
+    def reindex(self, start=0):
+        for row in range(start, len(self.players)):
+            self.rows[self.players[row]] = row
+
+    def set_players(self, players):
+        """Replace every row of the model."""
+        self.beginResetModel()
+        self.players = list(players)
+        self.values = [self.row_values(player) for player in self.players]
+        self.rows = {}
+        self.reindex()
+        self.endResetModel()
+
+    def refresh_player(self, player):
+        """Emit dataChanged for the player's row if one of its values changed."""
+        row = self.rows.get(player)
+        if row is None:
+            return False
+        values = self.row_values(player)
+        if values == self.values[row]:
+            return False
+        self.values[row] = values
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.columns) - 1))
+        return True
+
+    def refresh_players(self, players):
+        return sum(self.refresh_player(player) for player in players)
+
+    def append_players(self, players):
+        players = [player for player in players if player not in self.rows]
+        if not players:
+            return
+        first = len(self.players)
+        self.beginInsertRows(QModelIndex(), first, first + len(players) - 1)
+        self.players.extend(players)
+        self.values.extend(self.row_values(player) for player in players)
+        self.reindex(first)
+        self.endInsertRows()
+
+    def append_player(self, player):
+        self.append_players([player])
+
+    def remove_player(self, player):
+        row = self.rows.pop(player, None)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.players[row]
+        del self.values[row]
+        self.reindex(row)
+        self.endRemoveRows()
+
+    def sync(self, players):
+        """Bring the model in line with ``players`` touching only changed rows.
+
+        Players missing from ``players`` are removed and new players are
+        appended. If the order of the remaining players changed, the model is
+        reset instead.
+        """
+        players = list(players)
+        wanted = set(players)
+        for player in [player for player in self.players if player not in wanted]:
+            self.remove_player(player)
+        self.append_players([player for player in players if player not in self.rows])
+        if self.players != players:
+            self.set_players(players)
+            return
+        self.refresh_players(players)
+
+
+class RosterModel(QAbstractListModel):
+    """List model over the player names entered on the start page.
+
+    Names are indexed by row, so duplicates are found and names are removed
+    without scanning the list.
+    """
+
+    def __init__(self, names=(), parent=None):
+        super().__init__(parent)
+        self.names = []
+        self.rows = {}
+        self.add_names(names)
+
+    def __contains__(self, name):
+        return name in self.rows
+
+    def __len__(self):
+        return len(self.names)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
+            return self.names[index.row()]
+        return None
+
+    def add_names(self, names):
+        """Append names in one batch, skipping names already in the roster."""
+        names = [name for name in dict.fromkeys(names) if name not in self.rows]
+        if not names:
+            return 0
+        first = len(self.names)
+        self.beginInsertRows(QModelIndex(), first, first + len(names) - 1)
+        self.names.extend(names)
+        for row in range(first, len(self.names)):
+            self.rows[self.names[row]] = row
+        self.endInsertRows()
+        return len(names)
+
+    def remove_name(self, name):
+        row = self.rows.pop(name, None)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.names[row]
+        for moved in range(row, len(self.names)):
+            self.rows[self.names[moved]] = moved
+        self.endRemoveRows()
+
+
+class PlayerChecklistModel(QAbstractListModel):
+    """Checkable list of players that can be narrowed by a search text.
+
+    The lower-cased names are built once, and a search that extends the
+    previous one only looks at the rows that are still shown.
+    """
+
+    def __init__(self, players, parent=None):
+        super().__init__(parent)
+        self.players = list(players)
+        self.keys = [player.name.casefold() for player in self.players]
+        self.visible = list(range(len(self.players)))
+        self.search = ""
+        self.checked = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        player = self.players[self.visible[index.row()]]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return player.name
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if player.id in self.checked else Qt.CheckState.Unchecked
+        return None
+
+    def flags(self, index):
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        player = self.players[self.visible[index.row()]]
+        if Qt.CheckState(value) == Qt.CheckState.Checked:
+            self.checked.add(player.id)
+        else:
+            self.checked.discard(player.id)
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def set_search(self, text):
+        """Show only the players whose name contains ``text``, ignoring case."""
+        text = text.strip().casefold()
+        candidates = self.visible if text.startswith(self.search) else range(len(self.players))
+        keys = self.keys
+        self.beginResetModel()
+        self.visible = [row for row in candidates if text in keys[row]]
+        self.search = text
+        self.endResetModel()
+
+    def checked_ids(self):
+        """Ids of the checked players, in list order."""
+        return [player.id for player in self.players if player.id in self.checked]
@@ -0,0 +1,135 @@
+import http.client
+import json
+import random
+
+import pytest
+
+from api_server import ApiServer, TournamentService
+from board_scheduler import BoardScheduler
+from player import Player
+from tournament import TournamentEngine
+
+
+def create_engine(num_players=16):
+    random.seed(num_players)
+    return TournamentEngine([Player(f"Player {number}") for number in range(num_players)], 3)
+
+
+@pytest.fixture
+def server():
+    engine = create_engine()
+    engine.generate_gruppeplay_matches()
+    service = TournamentService(engine)
+    server = ApiServer(service, host="127.0.0.1", port=0)
+    server.start()
+    yield server
+    server.stop()
+    service.close()
+
+
+def request(server, method, path, body=None):
+    """Send one request with a local client and return (status, JSON payload)."""
+    connection = http.client.HTTPConnection("127.0.0.1", server.port, timeout=5)
+    try:
+        connection.request(method, path, body=json.dumps(body) if body is not None else None)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def submit(server, match_id, body):
+    return request(server, "POST", f"/matches/{match_id}/result", body)
+
+
+def test_list_matches(server):
+    status, state = request(server, "GET", "/matches")
+    assert status == 200
+    assert len(state["matches"]) == 4
+    assert all(match["winner"] is None for match in state["matches"])
+
+
+def test_submit_a_winner(server):
+    match_id = request(server, "GET", "/matches")[1]["matches"][0]["id"]
+    status, response = submit(server, match_id, {"winner": 1})
+    assert (status, response["status"]) == (200, "accepted")
+    assert server.service.engine.match_results == {0: 1}
+    assert request(server, "GET", "/matches")[1]["matches"][0]["winner"] == 1
+
+
+def test_double_tap_is_idempotent(server):
+    match_id = request(server, "GET", "/matches")[1]["matches"][0]["id"]
+    submit(server, match_id, {"winner": 2})
+    status, response = submit(server, match_id, {"winner": 2})
+    assert (status, response["status"]) == (200, "unchanged")
+
+
+def test_changing_a_winner_needs_the_current_version(server):
+    match_id = request(server, "GET", "/matches")[1]["matches"][0]["id"]
+    submit(server, match_id, {"winner": 1})
+
+    status, response = submit(server, match_id, {"winner": 2})
+    assert status == 409 and response["winner"] == 1
+    status, response = submit(server, match_id, {"winner": 2, "version": 0})
+    assert status == 409
+
+    version = request(server, "GET", "/matches")[1]["version"]
+    status, response = submit(server, match_id, {"winner": 2, "version": version})
+    assert (status, response["status"]) == (200, "accepted")
+    assert server.service.engine.match_results == {0: 2}
+
+
+def test_submitted_round_is_final(server):
+    engine = server.service.engine
+    match_id = request(server, "GET", "/matches")[1]["matches"][0]["id"]
+    for match in engine.matches:
+        submit(server, match.match_id, {"winner": 1})
+    engine.handle_match_results()
+
+    status, response = submit(server, match_id, {"winner": 2, "version": server.service.version})
+    assert status == 409 and response["winner"] == 1
+
+
+def test_bad_requests(server):
+    assert submit(server, 9999, {"winner": 1})[0] == 404
+    assert submit(server, 0, {"winner": 3})[0] == 400
+    assert submit(server, 0, {"loser": 1})[0] == 400
+    assert request(server, "GET", "/matches/0/result")[0] == 405
+    assert request(server, "GET", "/nothing")[0] == 404
+
+
+def test_engine_errors_are_answered(server):
+    engine = server.service.engine
+    match_id = engine.matches[0].match_id
+
+    def refuse(row, result):
+        raise ValueError("Refused.")
+
+    engine.set_match_result = refuse
+    status, response = submit(server, match_id, {"winner": 1})
+    assert status == 409 and response["error"] == "Refused."
+
+    def fail(row, result):
+        raise RuntimeError("Broken.")
+
+    engine.set_match_result = fail
+    status, response = submit(server, match_id, {"winner": 1})
+    assert status == 500
+    # the server still answers
+    assert request(server, "GET", "/matches")[0] == 200
+
+
+def test_board_submission_only_applies_the_posted_board():
+    engine = create_engine(20)
+    scheduler = BoardScheduler(engine, 3)
+    scheduler.fill_boards()
+    service = TournamentService(engine)
+    # entered by the operator but not submitted yet
+    scheduler.set_result(0, 1)
+    match = scheduler.boards[1]
+
+    status, response = service.submit(match.match_id, 2)
+    assert (status, response["status"]) == (200, "accepted")
+    assert scheduler.results == {0: 1}
+    assert scheduler.boards[0] is not None
+    assert all(player.wins == 1 for player in engine.registry.players(match.team_2))
@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from bracket import Bracket, seeding_order
+from player import Player
+from stages import FINAL_PLAYERS, FINISHED, GROUP_STAGE, KNOCKOUT
+from tournament import TournamentEngine
+
+
+def teams(count):
+    return [(2 * index, 2 * index + 1) for index in range(count)]
+
+
+def test_seeding_order():
+    assert seeding_order(4) == [1, 4, 2, 3]
+    assert seeding_order(8) == [1, 8, 4, 5, 2, 7, 3, 6]
+
+
+def test_full_bracket_has_no_byes():
+    bracket = Bracket(teams(8))
+    assert bracket.rounds == 3
+    assert len(bracket.matches(1)) == 4
+    assert bracket.stage_name(1) == "Quarter-Finals"
+
+
+def test_byes_go_to_the_best_seeds():
+    bracket = Bracket(teams(6))
+    assert bracket.size == 8
+    # seeds 4 v 5 and 3 v 6 play; seeds 1 and 2 have no opponent and go through
+    assert [bracket.entrants(node) for node in bracket.matches(1)] == [(3, 4), (2, 5)]
+    assert bracket.decided[4] and bracket.slots[4] == 0
+    assert bracket.decided[6] and bracket.slots[6] == 1
+    assert bracket.matches(2) == []
+    assert bracket.alive_teams() == list(range(6))
+
+
+def test_advance_to_a_champion():
+    bracket = Bracket(teams(5))
+    round_number = 1
+    while bracket.champion() is None:
+        for node in bracket.matches(round_number):
+            winner, loser = bracket.advance(node, 1)
+            assert bracket.slots[node] == winner
+            assert bracket.exit_rounds[loser] == round_number
+        round_number += 1
+    assert bracket.alive_teams() == [bracket.champion()]
+
+
+def test_a_match_cannot_be_played_twice():
+    bracket = Bracket(teams(4))
+    node = bracket.matches(1)[0]
+    bracket.advance(node, 1)
+    with pytest.raises(ValueError):
+        bracket.advance(node, 2)
+
+
+def test_retract_undoes_advance():
+    bracket = Bracket(teams(6))
+    before = bracket.to_dict()
+    nodes = bracket.matches(1)
+    for node in nodes:
+        bracket.advance(node, 2)
+    for node in reversed(nodes):
+        bracket.retract(node)
+    assert bracket.to_dict() == before
+    assert bracket.exit_rounds == {}
+    assert bracket.matches(1) == nodes
+
+
+def test_saved_bracket_keeps_its_results():
+    bracket = Bracket(teams(7))
+    for node in bracket.matches(1):
+        bracket.advance(node, 1)
+    restored = Bracket.from_dict(bracket.to_dict())
+    assert restored.slots == bracket.slots
+    assert restored.exit_rounds == bracket.exit_rounds
+
+
+def test_knockout_must_be_smaller_than_the_roster():
+    with pytest.raises(ValueError):
+        TournamentEngine([Player(f"Player {number}") for number in range(11)], 2, knockout_size=16)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_group_stage_always_reaches_a_playable_knockout(seed):
+    rng = random.Random(seed)
+    random.seed(seed)
+    num_players = rng.randint(9, 40)
+    knockout_size = rng.choice([size for size in (4, 8, 16, 32) if size < num_players])
+    engine = TournamentEngine([Player(f"Player {number}") for number in range(num_players)], rng.randint(1, 3), knockout_size=knockout_size)
+    while engine.stage == GROUP_STAGE:
+        engine.generate_gruppeplay_matches()
+        for row in range(len(engine.matches)):
+            engine.set_match_result(row, rng.randint(1, 2))
+        engine.handle_match_results()
+
+    assert engine.stage == FINAL_PLAYERS
+    count = engine.extra_game_player_count()
+    if count:
+        engine.add_selected_players(engine.extra_game_candidates()[:count])
+    assert engine.missing_player_count() == 0 or engine.can_start_knockout_with_byes()
+    engine.seed_knockout_players()
+    engine.start_knockout()
+    while engine.stage == KNOCKOUT:
+        for row in range(len(engine.final_matches)):
+            engine.set_final_match_result(row, rng.randint(1, 2))
+        engine.handle_final_results()
+    assert engine.stage == FINISHED
+    assert len(engine.winners) == 2
@@ -0,0 +1,143 @@
+import random
+
+import pytest
+
+from player import Player
+from stages import FINAL_PLAYERS, GROUP_STAGE, KNOCKOUT
+from tournament import TournamentEngine
+
+
+def create_engine(num_players=14, max_losses=2, knockout_size=8):
+    random.seed(num_players)
+    return TournamentEngine([Player(f"Player {number}") for number in range(num_players)], max_losses, knockout_size=knockout_size)
+
+
+def state(engine):
+    data = engine.to_dict()
+    del data["history"]
+    return data
+
+
+def enter_round(engine):
+    engine.generate_gruppeplay_matches()
+    for row in range(len(engine.matches)):
+        engine.set_match_result(row, random.randint(1, 2))
+
+
+def start_knockout(engine):
+    while engine.stage == GROUP_STAGE:
+        enter_round(engine)
+        engine.handle_match_results()
+    assert engine.stage == FINAL_PLAYERS
+    count = engine.extra_game_player_count()
+    if count:
+        engine.add_selected_players(engine.extra_game_candidates()[:count])
+    engine.seed_knockout_players()
+    engine.start_knockout()
+
+
+def test_undo_and_redo_round_results():
+    engine = create_engine()
+    enter_round(engine)
+    engine.handle_match_results()
+    enter_round(engine)
+    before = state(engine)
+    engine.handle_match_results()
+    after = state(engine)
+
+    engine.undo()
+    assert state(engine) == before
+    engine.redo()
+    assert state(engine) == after
+
+
+def test_undo_restores_players_eliminated_by_results():
+    engine = create_engine(max_losses=1)
+    enter_round(engine)
+    before = state(engine)
+    engine.handle_match_results()
+    eliminated = list(engine.eliminated_players)
+    assert eliminated
+
+    changed, revived = engine.undo()
+    assert state(engine) == before
+    assert sorted(player.id for player in revived) == sorted(player.id for player in eliminated)
+    assert not engine.eliminated_players
+
+
+def test_undo_manual_elimination_keeps_the_players_order():
+    engine = create_engine()
+    enter_round(engine)
+    engine.handle_match_results()
+    before = state(engine)
+    engine.eliminate_player(engine.players[3])
+
+    engine.undo()
+    assert state(engine) == before
+    engine.redo()
+    assert engine.players[3].id != before["players"][3]
+    assert before["players"][3] in state(engine)["eliminated_players"]
+
+
+def test_undo_loss_edit():
+    engine = create_engine()
+    enter_round(engine)
+    engine.handle_match_results()
+    losers = [player for player in engine.players if player.losses > 0][:2]
+    before = state(engine)
+    engine.remove_losses(losers)
+
+    engine.undo()
+    assert state(engine) == before
+
+
+def test_undo_knockout_results():
+    engine = create_engine()
+    start_knockout(engine)
+    assert engine.stage == KNOCKOUT
+    for row in range(len(engine.final_matches)):
+        engine.set_final_match_result(row, 1)
+    before = state(engine)
+    engine.handle_final_results()
+    after = state(engine)
+
+    engine.undo()
+    assert state(engine) == before
+    engine.redo()
+    assert state(engine) == after
+
+
+def test_new_result_discards_the_redo():
+    engine = create_engine()
+    enter_round(engine)
+    engine.handle_match_results()
+    engine.undo()
+    assert engine.history.can_redo()
+
+    engine.set_match_result(0, 1)
+    assert not engine.history.can_redo()
+
+
+def test_starting_a_round_clears_the_history():
+    engine = create_engine()
+    enter_round(engine)
+    engine.handle_match_results()
+    assert engine.history.can_undo()
+
+    engine.generate_gruppeplay_matches()
+    assert not engine.history.can_undo()
+    with pytest.raises(ValueError):
+        engine.undo()
+
+
+def test_history_is_saved_with_the_tournament():
+    engine = create_engine()
+    enter_round(engine)
+    engine.handle_match_results()
+    enter_round(engine)
+    before = state(engine)
+    engine.handle_match_results()
+
+    restored = TournamentEngine.from_dict(engine.to_dict())
+    restored.undo()
+    assert state(restored) == before
@@ -0,0 +1,115 @@
+import os
+import random
+
+import pytest
+
+from board_scheduler import BoardScheduler
+from journal import Journal
+from player import Player
+from stages import GROUP_STAGE
+from tournament import TournamentEngine
+
+
+def create_engine(num_players=18, max_losses=2):
+    return TournamentEngine([Player(f"Player {number}") for number in range(num_players)], max_losses)
+
+
+def play_group_stage(engine, rng, steps):
+    """Play rounds with the occasional undo, redo, loss edit and manual elimination."""
+    for _ in range(steps):
+        if engine.stage != GROUP_STAGE:
+            return
+        choice = rng.random()
+        if not engine.matches:
+            engine.generate_gruppeplay_matches()
+        elif choice < 0.5:
+            for row in range(len(engine.matches)):
+                engine.set_match_result(row, rng.randint(1, 2))
+            engine.handle_match_results()
+        elif choice < 0.65:
+            players = [player for player in engine.players if player.losses > 0]
+            if players:
+                engine.remove_losses(players[:2])
+        elif choice < 0.8 and engine.history.can_undo():
+            engine.undo()
+        elif choice < 0.9 and engine.history.can_redo():
+            engine.redo()
+        else:
+            engine.eliminate_player(rng.choice(engine.players))
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_recover_matches_the_live_engine(tmp_path, seed):
+    rng = random.Random(seed)
+    random.seed(seed)
+    engine = create_engine()
+    journal = Journal(str(tmp_path), snapshot_interval=rng.randint(2, 9), sync=False)
+    journal.start(engine)
+    play_group_stage(engine, rng, rng.randint(5, 25))
+    journal.close()
+
+    recovered = Journal(str(tmp_path), sync=False).recover()
+    assert recovered.to_dict() == engine.to_dict()
+
+
+def test_recover_without_a_snapshot(tmp_path):
+    random.seed(1)
+    engine = create_engine()
+    journal = Journal(str(tmp_path), snapshot_interval=4, sync=False)
+    journal.start(engine)
+    play_group_stage(engine, random.Random(1), 20)
+    journal.close()
+    os.remove(os.path.join(str(tmp_path), "current.snapshot.json"))
+
+    recovered = Journal(str(tmp_path), sync=False).recover()
+    assert recovered.to_dict() == engine.to_dict()
+
+
+def test_recover_ignores_a_partly_written_last_line(tmp_path):
+    random.seed(2)
+    engine = create_engine()
+    journal = Journal(str(tmp_path), sync=False)
+    journal.start(engine)
+    play_group_stage(engine, random.Random(2), 10)
+    journal.close()
+    with open(os.path.join(str(tmp_path), "current.jsonl"), "ab") as file:
+        file.write(b'{"event":"match_res')
+
+    journal = Journal(str(tmp_path), sync=False)
+    recovered = journal.recover()
+    assert recovered.to_dict() == engine.to_dict()
+
+    # the journal continues after the last complete record
+    if not recovered.matches:
+        recovered.generate_gruppeplay_matches()
+    recovered.set_match_result(0, 1)
+    journal.close()
+    assert Journal(str(tmp_path), sync=False).recover().to_dict() == recovered.to_dict()
+
+
+def test_recover_board_play(tmp_path):
+    rng = random.Random(3)
+    random.seed(3)
+    engine = create_engine(22)
+    scheduler = BoardScheduler(engine, 3)
+    journal = Journal(str(tmp_path), snapshot_interval=5, sync=False)
+    journal.start(engine)
+    scheduler.fill_boards()
+    for _ in range(40):
+        boards = scheduler.busy_boards()
+        if engine.stage != GROUP_STAGE or not boards:
+            break
+        scheduler.set_result(rng.choice(boards), rng.randint(1, 2))
+        if rng.random() < 0.3:
+            scheduler.submit_results()
+    journal.close()
+
+    recovered = Journal(str(tmp_path), sync=False).recover()
+    assert recovered.to_dict() == engine.to_dict()
+    assert recovered.board_scheduler.to_dict() == scheduler.to_dict()
+
+
+def test_recover_an_empty_journal_fails(tmp_path):
+    open(os.path.join(str(tmp_path), "current.jsonl"), "wb").close()
+    with pytest.raises(ValueError):
+        Journal(str(tmp_path), sync=False).recover()
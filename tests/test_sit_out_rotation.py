@@ -0,0 +1,70 @@
+import random
+
+from player import Player
+from stages import GROUP_STAGE
+from tournament import TournamentEngine
+
+
+def create_engine(num_players=23, max_losses=3):
+    return TournamentEngine([Player(f"Player {number}") for number in range(num_players)], max_losses)
+
+
+def play_round(engine):
+    engine.generate_gruppeplay_matches()
+    for row in range(len(engine.matches)):
+        engine.set_match_result(row, random.randint(1, 2))
+    engine.handle_match_results()
+
+
+def test_nobody_sits_out_twice_before_everybody_sat_out_once():
+    random.seed(0)
+    engine = create_engine(50)
+    while engine.stage == GROUP_STAGE:
+        sit_outs = {player.id: player.times_sat_out for player in engine.players}
+        engine.generate_gruppeplay_matches()
+        assert len(engine.unused_players) == len(engine.players) % 4
+        # the players that sit out had the fewest sit-outs
+        for player in engine.unused_players:
+            assert sit_outs[player.id] == min(sit_outs.values())
+        counts = [player.times_sat_out for player in engine.players]
+        assert max(counts) - min(counts) <= 1
+        for row in range(len(engine.matches)):
+            engine.set_match_result(row, random.randint(1, 2))
+        engine.handle_match_results()
+
+
+def test_revived_players_join_the_rotation():
+    random.seed(1)
+    engine = create_engine(30, 1)
+    while engine.stage == GROUP_STAGE:
+        play_round(engine)
+    count = engine.extra_game_player_count()
+    revived = engine.extra_game_candidates()[:count]
+    engine.add_selected_players(revived)
+    assert len(engine.sit_out_rotation) == len(engine.players)
+    for player in revived:
+        assert player.id in engine.sit_out_rotation
+
+
+def test_sit_out_order_survives_saving():
+    for seed in range(20):
+        random.seed(seed)
+        engine = create_engine()
+        for _ in range(3):
+            play_round(engine)
+        restored = TournamentEngine.from_dict(engine.to_dict())
+        assert restored.sit_out_rotation.to_dict() == engine.sit_out_rotation.to_dict()
+
+        engine.generate_gruppeplay_matches()
+        restored.generate_gruppeplay_matches()
+        assert [player.id for player in restored.unused_players] == [player.id for player in engine.unused_players]
+
+
+def test_undoing_an_elimination_restores_the_rotation():
+    random.seed(2)
+    engine = create_engine()
+    play_round(engine)
+    before = engine.sit_out_rotation.to_dict()
+    engine.eliminate_player(engine.players[5])
+    engine.undo()
+    assert engine.sit_out_rotation.to_dict() == before
@@ -0,0 +1,487 @@
+import random
+
+from bracket import Bracket, top_players
+from history import ELIMINATION, KNOCKOUT_RESULTS, LOSS_EDIT, RESULTS, History
+from matchmaking import AVOID_REPEATS, BALANCED, RANDOM, PairingHistory, build_matches
+from ratings import Ratings, build_balanced_matches
+from registry import PlayerRegistry
+from sit_out_rotation import SitOutRotation
+from player import Player
+from stages import FINAL_PLAYERS, FINISHED, GROUP_STAGE, KNOCKOUT, KNOCKOUT_SIZES
+
+FINAL_PLAYER_COUNT = 8
+
+
+class Match:
+    """A match between two teams, stored as tuples of player ids."""
+
+    def __init__(self, match_id, team_1, team_2):
+        self.match_id = match_id
+        self.team_1 = tuple(team_1)
+        self.team_2 = tuple(team_2)
+
+    def teams(self, result):
+        """Return (winning team, losing team) for a result of 1 or 2."""
+        if result == 1:
+            return self.team_1, self.team_2
+        return self.team_2, self.team_1
+
+    def player_ids(self):
+        return self.team_1 + self.team_2
+
+
+class TournamentEngine:
+    """Tournament state and rules, independent of any user interface.
+
+    The engine owns the players, the rounds, the eliminations and the knockout
+    stage. User interfaces observe it through listeners that are called as
+    ``listener(event, *args)`` whenever the state changes.
+    """
+
+    def __init__(self, players, max_losses, matchmaking=RANDOM, knockout_size=FINAL_PLAYER_COUNT):
+        if knockout_size not in KNOCKOUT_SIZES:
+            raise ValueError(f"The knockout stage must have {', '.join(map(str, KNOCKOUT_SIZES))} players.")
+        if knockout_size >= len(players):
+            raise ValueError("The knockout stage must have fewer players than the tournament.")
+        self.registry = PlayerRegistry(players)
+        self.store = self.registry.store
+        self.players = list(players)
+        self.max_losses = max_losses
+        self.matchmaking = matchmaking
+        self.knockout_size = knockout_size
+        self.pairing_history = PairingHistory(len(self.registry))
+        self.ratings = Ratings(len(self.registry))
+        self.matches = []
+        self.unused_players = []
+        self.eliminated_players = []
+        self.last_eliminated_players = []
+        self.match_results = {}
+        self.final_matches = []
+        # bracket node of every final match
+        self.final_match_nodes = []
+        self.final_match_results = {}
+        self.bracket = None
+        self.winners = []
+        self.stage = GROUP_STAGE
+        self.round_number = 0
+        self.knockout_round = 0
+        self.next_match_id = 0
+        self.listeners = []
+        self.processing_results = False
+        self.board_scheduler = None
+        for player in self.players:
+            player.tournament = self
+        self.sit_out_rotation = SitOutRotation(self.store, [player.id for player in self.players])
+        self.history = History(self)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def notify(self, event, *args):
+        for listener in list(self.listeners):
+            listener(event, *args)
+
+    def new_match(self, team_1, team_2):
+        """Create a match between two teams of players or player ids."""
+        match = Match(self.next_match_id, [player_id(player) for player in team_1], [player_id(player) for player in team_2])
+        self.next_match_id += 1
+        return match
+
+    def team_names(self, team, separator=", "):
+        return separator.join(self.registry.names(team))
+
+    def generate_gruppeplay_matches(self):
+        """Generate 2v2 matches for the next round."""
+        # the players with the fewest sit-outs sit the round out, in the order of the rotation
+        excess_people = len(self.players) % 4
+        unused_ids = self.sit_out_rotation.next_sitters(excess_people)
+        unused_players = self.registry.players(unused_ids)
+        unused_ids = set(unused_ids)
+        available_players = [player for player in self.players if player.id not in unused_ids]
+
+        matches = self.pair_players(available_players)
+        self.start_round(matches, unused_players)
+        return self.matches
+
+    def pair_players(self, players):
+        """Seed the players (a multiple of 4) and pair them into 2v2 matches."""
+        # randomize seeds for the players
+        self.store.randomize_seeds([player.id for player in players])
+
+        if self.matchmaking == AVOID_REPEATS:
+            # keep repeated partners and opponents low
+            teams = build_matches([player.id for player in players], self.pairing_history)
+            return [self.new_match(team_1, team_2) for team_1, team_2 in teams]
+
+        if self.matchmaking == BALANCED:
+            # teams predicted to be as even as possible
+            teams = build_balanced_matches([player.id for player in players], self.ratings)
+            return [self.new_match(team_1, team_2) for team_1, team_2 in teams]
+
+        players = list(players)
+        random.shuffle(players)
+        # split the players into teams of 4
+        return [self.new_match(players[i:i + 2], players[i + 2:i + 4]) for i in range(0, len(players) - 3, 4)]
+
+    def start_round(self, matches, unused_players):
+        """Start a round with the given matches while the unused players sit out."""
+        self.history.clear()
+        # Clear previous match results and last eliminated players
+        self.match_results.clear()
+        self.last_eliminated_players.clear()
+        self.matches = list(matches)
+        self.unused_players = list(unused_players)
+        self.next_match_id = max([self.next_match_id] + [match.match_id + 1 for match in self.matches])
+
+        # increment the unused count for players who are unused
+        self.record_sit_outs([player.id for player in self.unused_players])
+
+        self.round_number += 1
+        self.notify("matches_generated")
+
+    def record_sit_outs(self, player_ids):
+        self.store.sit_out(player_ids)
+        self.sit_out_rotation.sat_out(player_ids)
+
+    def load_ratings(self, ratings):
+        """Start players from ratings of earlier events, given as {player id: (rating, matches)}."""
+        applied = self.ratings.carry_over(ratings)
+        self.notify("ratings_loaded", applied)
+
+    def set_match_result(self, row, result):
+        """Record the winning team (1 or 2) of a group-play match."""
+        self.history.discard_redo()
+        self.match_results[row] = result
+        self.notify("match_result_set", row, result)
+
+    def all_results_entered(self):
+        return all(row in self.match_results for row in range(len(self.matches)))
+
+    def handle_match_results(self):
+        """Apply the results of the current round and eliminate players."""
+        if not self.all_results_entered():
+            raise ValueError("Please select a winner for all matches.")
+        self.history.begin(RESULTS, [player_id for match in self.matches for player_id in match.player_ids()])
+
+        # Collect the whole round and apply it as one batch
+        winner_ids = []
+        loser_ids = []
+        for row, match in enumerate(self.matches):
+            result = self.match_results.get(row)
+            if result not in (1, 2):
+                continue
+            winners, losers = match.teams(result)
+            winner_ids.extend(winners)
+            loser_ids.extend(losers)
+            self.ratings.record_match(winners, losers)
+        eliminated_ids = self.store.apply_results(winner_ids, loser_ids, self.max_losses)
+        changed_players = self.registry.players(winner_ids + loser_ids)
+
+        # Track the players eliminated in this round
+        self.last_eliminated_players = self.registry.players(eliminated_ids)
+
+        self.processing_results = True
+        try:
+            for player in self.last_eliminated_players:
+                self.eliminate_player(player)
+        finally:
+            self.processing_results = False
+
+        self.pairing_history.record_round(self.matches)
+        self.matches = []
+        self.unused_players = []
+        self.match_results.clear()
+        self.notify("results_submitted", changed_players)
+
+        # Check if the tournament should end
+        self.check_tournament_end()
+        self.history.commit()
+
+    def eliminate_player(self, player):
+        """Move a player from the active players to the eliminated players."""
+        if not self.registry.is_active(player):
+            return
+        manual = not self.processing_results
+        if manual:
+            self.history.begin(ELIMINATION, [player.id], [player.id])
+        index = self.players.index(player)
+        del self.players[index]
+        self.history.eliminated(player.id, index)
+        self.eliminated_players.append(player)
+        self.registry.mark_eliminated(player)
+        self.sit_out_rotation.remove(player.id)
+        self.notify("player_eliminated", player)
+        if manual:
+            self.check_tournament_end()
+            self.history.commit()
+
+    def remove_losses(self, players):
+        """Remove one loss from each of the given players."""
+        player_ids = [player.id for player in players]
+        self.history.begin(LOSS_EDIT, player_ids, player_ids)
+        for player in players:
+            player.losses -= 1
+            self.notify("player_updated", player)
+        # committed first, so a journal snapshot on this event includes the edit
+        self.history.commit()
+        self.notify("losses_removed", list(players))
+
+    def undo(self):
+        """Undo the last round submission, manual elimination or loss edit."""
+        return self.history.undo()
+
+    def redo(self):
+        """Redo the last undone operation."""
+        self.history.redo()
+
+    def check_tournament_end(self):
+        """Check if the group stage is over and move on to the final players."""
+        if self.board_scheduler is not None and self.board_scheduler.busy_boards():
+            # matches still being played on the boards are finished first
+            return
+        if self.stage == GROUP_STAGE and len(self.players) <= self.knockout_size:
+            self.set_stage(FINAL_PLAYERS)
+
+    def set_stage(self, stage):
+        self.stage = stage
+        self.notify("stage_changed", stage)
+
+    def missing_player_count(self):
+        """Number of players needed to fill the final spots."""
+        return self.knockout_size - len(self.players)
+
+    def can_start_knockout_with_byes(self):
+        """Whether the remaining players can start the knockout with byes instead of an extra game."""
+        return self.missing_player_count() > 0 and len(self.players) >= 4 and len(self.players) % 2 == 0
+
+    def fewest_extra_players(self):
+        """Fewest players to add for an even field of at least 4 that can start with byes."""
+        return max(4 - len(self.players), len(self.players) % 2)
+
+    def extra_game_candidates(self):
+        """The eliminated players that can play the extra game for the missing spots.
+
+        These are the players eliminated last. When too few of them are left
+        to make the field even, every eliminated player is a candidate, the
+        latest first.
+        """
+        candidates = [player for player in self.last_eliminated_players if self.registry.is_eliminated(player)]
+        if len(candidates) < self.fewest_extra_players():
+            candidates = self.eliminated_players[::-1]
+        return candidates
+
+    def extra_game_player_count(self):
+        """Number of players the extra game adds back (0 when there is no extra game).
+
+        Every missing spot is filled when there are enough candidates;
+        otherwise only as many as an even field needs, and the best seeds get
+        byes for the remaining spots.
+        """
+        missing = self.missing_player_count()
+        if missing <= 0:
+            return 0
+        if len(self.extra_game_candidates()) >= missing:
+            return missing
+        return self.fewest_extra_players()
+
+    def add_selected_players(self, selected_players):
+        """Add the selected players back to the tournament."""
+        required = self.extra_game_player_count()
+        if len(selected_players) != required:
+            raise ValueError(f"Please select exactly {required} players.")
+        self.history.clear()
+        for player in selected_players:
+            self.players.append(player)
+            self.eliminated_players.remove(player)
+            self.registry.mark_active(player)
+            self.sit_out_rotation.add(player.id)
+        self.notify("players_revived", list(selected_players))
+
+    def seed_knockout_players(self):
+        """Seed the final players by their group-stage standing."""
+        self.set_seeded_players(top_players(self.players, self.knockout_size))
+
+    def set_seeded_players(self, players):
+        """Put the final players in their seeded order."""
+        self.history.clear()
+        self.players = list(players)
+        self.notify("players_seeded")
+
+    def start_knockout(self):
+        """Start the knockout stage: the seeded players form teams of 2 in seed order."""
+        self.history.clear()
+        player_ids = [player.id for player in self.players]
+        self.bracket = Bracket([player_ids[i:i + 2] for i in range(0, len(player_ids) - 1, 2)])
+        self.knockout_round = 1
+        self.final_match_results.clear()
+        self.final_matches = self.generate_final_matches()
+        self.set_stage(KNOCKOUT)
+
+    def generate_final_matches(self):
+        """Create the matches of the current knockout round."""
+        self.final_match_nodes = self.bracket.matches(self.knockout_round)
+        teams = self.bracket.teams
+        matches = []
+        for node in self.final_match_nodes:
+            team_1, team_2 = self.bracket.entrants(node)
+            matches.append(self.new_match(teams[team_1], teams[team_2]))
+        return matches
+
+    def knockout_stage_name(self):
+        if self.bracket is None:
+            return "Unknown Stage"
+        return self.bracket.stage_name(self.knockout_round)
+
+    def set_final_match_result(self, row, result):
+        """Record the winning team (1 or 2) of a knockout match."""
+        self.history.discard_redo()
+        self.final_match_results[row] = result
+        self.notify("final_result_set", row, result)
+
+    def handle_final_results(self):
+        """Handle the results of the final matches."""
+        if len(self.final_match_results) != len(self.final_matches):
+            raise ValueError("Please select a winner for all matches.")
+        self.history.begin(KNOCKOUT_RESULTS, [player_id for match in self.final_matches for player_id in match.player_ids()])
+
+        winner_ids = []
+        loser_ids = []
+        for row, match in enumerate(self.final_matches):
+            result = self.final_match_results.get(row)
+            if result not in (1, 2):
+                continue
+            winning_team, losing_team = match.teams(result)
+            winner_ids.extend(winning_team)
+            loser_ids.extend(losing_team)
+            self.ratings.record_match(winning_team, losing_team)
+            self.bracket.advance(self.final_match_nodes[row], result)
+        self.store.apply_knockout_results(winner_ids, loser_ids)
+        eliminated = self.registry.players(loser_ids)
+
+        # Update players and eliminated lists
+        teams = self.bracket.teams
+        self.players = self.registry.players(player_id for team in self.bracket.alive_teams() for player_id in teams[team])
+        self.eliminated_players.extend(eliminated)
+        for player in eliminated:
+            self.registry.mark_eliminated(player)
+        self.final_match_results.clear()
+        self.notify("final_results_submitted")
+
+        if self.bracket.champion() is not None:
+            self.end_tournament()
+        else:
+            self.knockout_round += 1
+            self.final_matches = self.generate_final_matches()
+            self.notify("knockout_advanced")
+        self.history.commit()
+
+    def end_tournament(self):
+        """Record the winners and move every player back into the players list."""
+        self.history.clear()
+        self.winners = list(self.players) if len(self.players) == 2 else []
+        self.players.extend(self.eliminated_players)
+        self.eliminated_players.clear()
+        self.final_matches = []
+        self.final_match_nodes = []
+        self.set_stage(FINISHED)
+
+    def to_dict(self):
+        """Return the complete tournament state as JSON-compatible data."""
+        def ids(players):
+            return [player.id for player in players]
+
+        def matches(match_list):
+            return [[match.match_id, list(match.team_1), list(match.team_2)] for match in match_list]
+
+        return {
+            "max_losses": self.max_losses,
+            "matchmaking": self.matchmaking,
+            "knockout_size": self.knockout_size,
+            "stage": self.stage,
+            "round_number": self.round_number,
+            "knockout_round": self.knockout_round,
+            "next_match_id": self.next_match_id,
+            "registered": [[player.id, player.name] for player in self.registry.by_id.values()],
+            "registry_eliminated": sorted(self.registry.eliminated),
+            "players": ids(self.players),
+            "eliminated_players": ids(self.eliminated_players),
+            "last_eliminated_players": ids(self.last_eliminated_players),
+            "unused_players": ids(self.unused_players),
+            "winners": ids(self.winners),
+            "matches": matches(self.matches),
+            "match_results": sorted(self.match_results.items()),
+            "final_matches": matches(self.final_matches),
+            "final_match_results": sorted(self.final_match_results.items()),
+            "bracket": self.bracket.to_dict() if self.bracket is not None else None,
+            "store": self.store.to_dict(self.registry.next_id),
+            "pairing_history": self.pairing_history.to_dict(),
+            "ratings": self.ratings.to_dict(self.registry.next_id),
+            "sit_out_rotation": self.sit_out_rotation.to_dict(),
+            "history": self.history.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a tournament from the data returned by to_dict."""
+        players = [Player(name, player_id=player_id) for player_id, name in data["registered"]]
+        engine = cls(players, data["max_losses"], data["matchmaking"], data.get("knockout_size", FINAL_PLAYER_COUNT))
+        registry = engine.registry
+        engine.store.load_dict(data["store"])
+        engine.pairing_history.load_dict(data["pairing_history"])
+        if "ratings" in data:
+            engine.ratings.load_dict(data["ratings"])
+        for player_id in data["registry_eliminated"]:
+            registry.mark_eliminated(registry.get(player_id))
+        engine.stage = data["stage"]
+        engine.round_number = data["round_number"]
+        engine.knockout_round = data["knockout_round"]
+        engine.next_match_id = data["next_match_id"]
+        engine.players = registry.players(data["players"])
+        engine.eliminated_players = registry.players(data["eliminated_players"])
+        engine.last_eliminated_players = registry.players(data["last_eliminated_players"])
+        engine.unused_players = registry.players(data["unused_players"])
+        engine.winners = registry.players(data["winners"])
+        engine.matches = [Match(*match) for match in data["matches"]]
+        engine.match_results = dict(data["match_results"])
+        engine.final_matches = [Match(*match) for match in data["final_matches"]]
+        engine.final_match_results = dict(data["final_match_results"])
+        if data.get("bracket") is not None:
+            engine.bracket = Bracket.from_dict(data["bracket"])
+            if engine.stage == KNOCKOUT:
+                engine.final_match_nodes = engine.bracket.matches(engine.knockout_round)
+        if "sit_out_rotation" in data:
+            engine.sit_out_rotation.load_dict(data["sit_out_rotation"])
+        else:
+            engine.sit_out_rotation.reset(player.id for player in engine.players if registry.is_active(player))
+        if "history" in data:
+            engine.history.load_dict(data["history"])
+        return engine
+
+    def all_player_names(self):
+        return [player.name for player in self.players] + [player.name for player in self.eliminated_players]
+
+    def clear(self):
+        """Delete all player data."""
+        self.players.clear()
+        self.eliminated_players.clear()
+        self.last_eliminated_players.clear()
+        self.matches.clear()
+        self.unused_players.clear()
+        self.match_results.clear()
+        self.final_matches.clear()
+        self.final_match_nodes = []
+        self.final_match_results.clear()
+        self.bracket = None
+        self.winners.clear()
+        self.registry.clear()
+        self.sit_out_rotation.reset(())
+        self.history.clear()
+
+
+def player_id(player):
+    """Return the id of a player, or the value itself if it already is an id."""
+    return player if isinstance(player, int) else player.id